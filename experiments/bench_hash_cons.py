@@ -0,0 +1,60 @@
+"""experiments/bench_hash_cons.py
+
+Benchmark: graph growth, memory and step time with and without hash-consing.
+Motif: Phase (experiments)
+Ports: [benchmark script, reproducibility]
+Invariants: [experiment traceability, result logging]
+
+Runs the CLI engine configuration for --steps steps with hash_cons off and
+on (each also with prune_seen) and reports final node, edge and proposition
+counts, unique propositions, the memory allocated while stepping (a separate
+tracemalloc pass, so timings are not inflated) and the wall time per step.
+
+Usage:
+    python experiments/bench_hash_cons.py [--steps 2000] [--seed 0]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from sophon.core.types import NodeType
+from sophon.engine.sweep import RunConfig, build_engine
+
+def run(config: RunConfig):
+    """Return (engine, seconds) after config.steps steps."""
+    engine = build_engine(config)
+    t0 = time.perf_counter()
+    for _ in range(config.steps):
+        engine.step()
+    return engine, time.perf_counter() - t0
+
+def traced_bytes(config: RunConfig) -> int:
+    """Bytes still allocated after the run, counted from just before the first step."""
+    engine = build_engine(config)
+    tracemalloc.start()
+    for _ in range(config.steps):
+        engine.step()
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark hash-consing of graph objects')
+    parser.add_argument('--steps', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    print(f"{'hash_cons':>9} {'prune':>6} {'nodes':>8} {'edges':>8} {'props':>7} {'unique':>7} "
+          f"{'MiB':>7} {'ms/step':>8}")
+    for prune in (False, True):
+        for hash_cons in (False, True):
+            config = RunConfig(seed=args.seed, steps=args.steps, summary_level="none",
+                               prune_seen=prune, hash_cons=hash_cons)
+            engine, seconds = run(config)
+            graph = engine.graph
+            print(f"{str(hash_cons):>9} {str(prune):>6} {len(graph.nodes):>8} {len(graph.edges):>8} "
+                  f"{graph.count(NodeType.PROPOSITION)[0]:>7} {engine.unique_props_total:>7} "
+                  f"{traced_bytes(config) / 2**20:>7.2f} {1e3 * seconds / args.steps:>8.3f}")
+
+if __name__ == "__main__":
+    main()
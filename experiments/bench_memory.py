@@ -0,0 +1,89 @@
+"""experiments/bench_memory.py
+
+Benchmark: memory of node/edge records, legacy dataclasses vs compact representation.
+Motif: Phase (experiments)
+Ports: [benchmark script, reproducibility]
+Invariants: [experiment traceability, result logging]
+
+Runs the Book I/II engine to get a realistic mix of nodes and edges, then
+rebuilds those records three ways and measures each with tracemalloc:
+  legacy  - the original (non-slotted) dataclasses with a dict per attr
+  slots   - the current slotted HNode/HEdge with dict attrs (HyperGraph default)
+  compact - slotted HNode/HEdge with AttrMap attrs (HyperGraph(compact_attrs=True))
+
+Usage:
+    python experiments/bench_memory.py [--steps 5000]
+"""
+
+import argparse
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+from sophon.core.hypergraph import HyperGraph
+from sophon.core.types import AttrMap, EdgeType, HEdge, HNode, NodeType
+from sophon.engine.sophon import Engine
+from sophon.ops.registry import Registry
+from sophon.ops.euclid.book_I import REGISTRY as BOOK_I_REGISTRY
+from sophon.ops.euclid.book_II import REGISTRY as BOOK_II_REGISTRY
+
+@dataclass
+class LegacyHNode:
+    id: int
+    type: NodeType
+    attr: Dict[str, Any]
+
+@dataclass
+class LegacyHEdge:
+    id: int
+    type: EdgeType
+    nodes: Tuple[int, ...]
+    attr: Dict[str, Any]
+
+def run_engine(steps: int, seed: int) -> HyperGraph:
+    registry = Registry()
+    for op in BOOK_I_REGISTRY.ops() + BOOK_II_REGISTRY.ops():
+        registry.add(op)
+    engine = Engine(HyperGraph(), registry, E=15.0, epsilon=0.3, top_n_explore=15, recent_window=10, seed=seed)
+    engine.seed_graph(num_points=5, num_lines=3)
+    for _ in range(steps):
+        engine.step()
+    return engine.graph
+
+def fresh(value: Any) -> Any:
+    """Return an un-shared copy of str values, as if just parsed from storage."""
+    return "".join(list(value)) if isinstance(value, str) else value
+
+def measure(graph: HyperGraph, make_node: Callable, make_edge: Callable, attr: Callable) -> int:
+    node_src = [(n.id, n.type, list(n.attr.items())) for n in graph.nodes.values()]
+    edge_src = [(e.id, e.type, e.nodes, list(e.attr.items())) for e in graph.edges.values()]
+    tracemalloc.start()
+    kept: List[Any] = [make_node(i, t, attr({k: fresh(v) for k, v in a})) for i, t, a in node_src]
+    kept += [make_edge(i, t, ns, attr({k: fresh(v) for k, v in a})) for i, t, ns, a in edge_src]
+    # Temporary dicts and strings dropped by the constructor are freed again;
+    # what remains traced is the records themselves
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark node/edge record memory')
+    parser.add_argument('--steps', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    graph = run_engine(args.steps, args.seed)
+    n = len(graph.nodes) + len(graph.edges)
+    variants = [
+        ("legacy", LegacyHNode, LegacyHEdge, lambda a: a),
+        ("slots", HNode, HEdge, lambda a: a),
+        ("compact", HNode, HEdge, AttrMap),
+    ]
+    print(f"{len(graph.nodes)} nodes, {len(graph.edges)} edges after {args.steps} steps")
+    base = None
+    for label, make_node, make_edge, attr in variants:
+        size = measure(graph, make_node, make_edge, attr)
+        base = base or size
+        print(f"{label:>8}: {size / n:7.1f} B/record  total {size / 2**20:8.2f} MiB  ({size / base:5.1%} of legacy)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""experiments/bench_novelty.py
+
+Benchmark: memory, speed and false-positive rate of the novelty trackers.
+Motif: Phase (experiments)
+Ports: [benchmark script, reproducibility]
+Invariants: [experiment traceability, result logging]
+
+Inserts n distinct (op_name, inputs) keys shaped like the engine's seen
+applications into each tracker, then queries n keys that were never added.
+Memory is traced with tracemalloc (so the set tracker is charged for the
+key tuples it keeps) and timings come from a separate untraced pass; the false-positive column is the measured fraction of fresh
+keys reported as seen.
+
+Usage:
+    python experiments/bench_novelty.py [--n 100000 1000000] [--bloom-bytes 1048576]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from sophon.engine.novelty import make_tracker
+
+def key(i: int):
+    return (f"I.{i % 48}", (10_000 + i, 20_000 + i * 7, 30_000 + i % 977))
+
+def run(kind: str, n: int, options: dict):
+    """Return (bytes/key, us/add, us/lookup, false-positive rate)."""
+    tracemalloc.start()
+    tracker = make_tracker(kind, **options)
+    for i in range(n):
+        tracker.add(key(i))
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # time on a fresh tracker: tracemalloc slows every allocation
+    tracker = make_tracker(kind, **options)
+    t0 = time.perf_counter()
+    for i in range(n):
+        tracker.add(key(i))
+    add_s = (time.perf_counter() - t0) / n
+    t0 = time.perf_counter()
+    false_positives = sum(key(i) in tracker for i in range(n, 2 * n))
+    lookup_s = (time.perf_counter() - t0) / n
+    return size / n, add_s * 1e6, lookup_s * 1e6, false_positives / n
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark novelty trackers')
+    parser.add_argument('--n', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--error-rate', type=float, default=1e-3)
+    parser.add_argument('--bloom-bytes', type=int, default=1 << 20)
+    args = parser.parse_args()
+    configs = [
+        ("set", {}),
+        ("exact", {}),
+        ("bloom", {"error_rate": args.error_rate, "max_bytes": None}),
+        ("bloom", {"error_rate": args.error_rate, "max_bytes": args.bloom_bytes}),
+    ]
+    print(f"{'n':>9} {'tracker':>14} {'B/key':>8} {'us/add':>8} {'us/lookup':>10} {'false pos':>10}")
+    for n in args.n:
+        for kind, options in configs:
+            label = kind if options.get("max_bytes") is None else f"bloom<={args.bloom_bytes >> 10}K"
+            per_key, add_us, lookup_us, fp = run(kind, n, options)
+            print(f"{n:>9} {label:>14} {per_key:>8.1f} {add_us:>8.2f} {lookup_us:>10.2f} {fp:>10.5f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""experiments/bench_outcomes.py
+
+Benchmark: steps and wall time to reach a unique_props_total target, with and without learned outcome statistics.
+Motif: Phase (experiments)
+Ports: [benchmark script, reproducibility]
+Invariants: [experiment traceability, result logging]
+
+Runs the CLI engine configuration for several seeds with outcome_model None
+(constant prediction, random uncertainty), "ucb" and "thompson", and reports
+the mean steps and seconds needed to reach --target unique propositions
+(runs that miss it within --max-steps count as --max-steps), plus the share
+of applications whose invariants held.
+
+Usage:
+    python experiments/bench_outcomes.py [--target 300] [--seeds 8] [--max-steps 3000] [--c 0.5]
+"""
+
+import argparse
+import time
+
+from sophon.engine.sweep import RunConfig, build_engine
+
+def run(model, seed: int, target: int, max_steps: int, c: float):
+    """Return (steps, seconds, reached, engine) for one seeded run."""
+    engine = build_engine(RunConfig(seed=seed, summary_level="none", outcome_model=model, outcome_c=c))
+    t0 = time.perf_counter()
+    while engine.unique_props_total < target and engine.step_count < max_steps:
+        engine.step()
+    return engine.step_count, time.perf_counter() - t0, engine.unique_props_total >= target, engine
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark learned outcome statistics')
+    parser.add_argument('--target', type=int, default=300)
+    parser.add_argument('--seeds', type=int, default=8)
+    parser.add_argument('--max-steps', type=int, default=3000)
+    parser.add_argument('--c', type=float, default=0.5)
+    args = parser.parse_args()
+    print(f"{'model':>9} {'steps':>8} {'seconds':>8} {'reached':>8} {'success':>8}")
+    for model in (None, "ucb", "thompson"):
+        steps = seconds = reached = 0.0
+        ok = visits = 0.0
+        for seed in range(args.seeds):
+            n, s, hit, engine = run(model, seed, args.target, args.max_steps, args.c)
+            steps, seconds, reached = steps + n, seconds + s, reached + hit
+            if engine.outcomes is not None:
+                ok += sum(engine.outcomes.successes)
+                visits += sum(engine.outcomes.visits)
+        success = f"{ok / visits:.3f}" if visits else "-"
+        print(f"{str(model):>9} {steps / args.seeds:>8.1f} {seconds / args.seeds:>8.3f} "
+              f"{int(reached):>5}/{args.seeds:<2} {success:>8}")
+
+if __name__ == "__main__":
+    main()
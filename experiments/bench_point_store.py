@@ -0,0 +1,72 @@
+"""experiments/bench_point_store.py
+
+Benchmark: dict-backed vs columnar (PointStore) POINT coordinates.
+Motif: Phase (experiments)
+Ports: [benchmark script, reproducibility]
+Invariants: [experiment traceability, result logging]
+
+Reports coordinate memory per point (tracemalloc) and the time of one bulk
+radius query over every point, for both backends.
+
+Usage:
+    python experiments/bench_point_store.py [--points 1000000]
+"""
+
+import argparse
+import math
+import random
+import time
+import tracemalloc
+
+from sophon.core.coords import PointStore
+from sophon.core.hypergraph import HyperGraph
+from sophon.core.types import NodeType
+
+def build(n: int, columnar: bool, seed: int) -> HyperGraph:
+    rng = random.Random(seed)
+    graph = HyperGraph(coords=PointStore(capacity=n + 1) if columnar else None)
+    for _ in range(n):
+        graph.add_node(NodeType.POINT, {'x': rng.uniform(-5, 5), 'y': rng.uniform(-5, 5)})
+    return graph
+
+def measure_memory(n: int, columnar: bool, seed: int) -> float:
+    """Bytes per point spent on attrs, over the cost of a node with an empty attr dict."""
+    tracemalloc.start()
+    graph = build(n, columnar, seed)
+    total, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Subtract what both backends share: HNode objects and the id-keyed indexes
+    baseline = HyperGraph()
+    tracemalloc.start()
+    for _ in range(n):
+        baseline.add_node(NodeType.CONCEPT, None)
+    shared, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del graph
+    return (total - shared) / n
+
+def query_dict(graph: HyperGraph, x: float, y: float, r: float) -> int:
+    points, _ = graph.by_type(NodeType.POINT)
+    return sum(1 for p in points if math.hypot(p.attr['x'] - x, p.attr['y'] - y) <= r)
+
+def query_columnar(graph: HyperGraph, x: float, y: float, r: float) -> int:
+    return len(graph.coords.within(x, y, r))
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark columnar POINT coordinates')
+    parser.add_argument('--points', type=int, default=1000000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    n = args.points
+    for columnar in (False, True):
+        label = 'columnar' if columnar else 'dict'
+        per_point = measure_memory(n, columnar, args.seed)
+        graph = build(n, columnar, args.seed)
+        query = query_columnar if columnar else query_dict
+        t0 = time.perf_counter()
+        hits = query(graph, 0.0, 0.0, 1.0)
+        elapsed = time.perf_counter() - t0
+        print(f"{label:>9}: {per_point:8.1f} B/point (attr overhead)  radius query {elapsed * 1e3:9.2f} ms  hits={hits}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""experiments/bench_primitives.py
+
+Benchmark: array geometry kernels in sophon.ops.primitives vs per-point Python loops.
+Motif: Phase (experiments)
+Ports: [benchmark script, reproducibility]
+Invariants: [experiment traceability, result logging]
+
+For each size N, draws N random segments (and circles of radius |AB| about
+their endpoints) and times the same computation as a Python loop over
+tuples and as one kernel call: distances, midpoints, equilateral apexes
+(Book I.1), line-line, line-circle and circle-circle intersections and
+triangle areas. Also reports the cost of a single-point kernel call, the
+per-op case where the scalar helpers stay cheaper.
+
+Usage:
+    python experiments/bench_primitives.py [--sizes 1000,100000,1000000]
+"""
+
+import argparse
+import math
+import random
+import time
+
+import numpy as np
+
+from sophon.ops import primitives as P
+
+def loop_line_intersection(a1, a2, b1, b2):
+    dax, day = a2[0] - a1[0], a2[1] - a1[1]
+    dbx, dby = b2[0] - b1[0], b2[1] - b1[1]
+    denom = dax * dby - day * dbx
+    if denom == 0.0:
+        return (math.nan, math.nan)
+    t = ((b1[0] - a1[0]) * dby - (b1[1] - a1[1]) * dbx) / denom
+    return (a1[0] + t * dax, a1[1] + t * day)
+
+def loop_line_circle(a1, a2, c, r):
+    dx, dy = a2[0] - a1[0], a2[1] - a1[1]
+    fx, fy = a1[0] - c[0], a1[1] - c[1]
+    a = dx * dx + dy * dy
+    b = 2.0 * (fx * dx + fy * dy)
+    disc = b * b - 4.0 * a * (fx * fx + fy * fy - r * r)
+    if disc < 0.0:
+        return None
+    root = math.sqrt(disc)
+    return [(a1[0] + t * dx, a1[1] + t * dy) for t in ((-b - root) / (2 * a), (-b + root) / (2 * a))]
+
+def loop_circles(c1, r1, c2, r2):
+    dx, dy = c2[0] - c1[0], c2[1] - c1[1]
+    d = math.hypot(dx, dy)
+    a = (d * d + r1 * r1 - r2 * r2) / (2 * d)
+    h = math.sqrt(max(r1 * r1 - a * a, 0.0))
+    mx, my = c1[0] + a * dx / d, c1[1] + a * dy / d
+    return [(mx - h * dy / d, my + h * dx / d), (mx + h * dy / d, my - h * dx / d)]
+
+def loop_apex(p, q):
+    dx, dy = q[0] - p[0], q[1] - p[1]
+    return (p[0] + dx * P.COS_60 - dy * P.SIN_60, p[1] + dx * P.SIN_60 + dy * P.COS_60)
+
+def loop_area(tri):
+    return 0.5 * sum(tri[i][0] * tri[(i + 1) % 3][1] - tri[(i + 1) % 3][0] * tri[i][1] for i in range(3))
+
+def timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the array geometry kernels')
+    parser.add_argument('--sizes', type=str, default='1000,100000,1000000')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    for n in (int(float(v)) for v in args.sizes.split(',')):
+        rng = random.Random(args.seed)
+        pa = [(rng.uniform(-5, 5), rng.uniform(-5, 5)) for _ in range(n)]
+        pb = [(rng.uniform(-5, 5), rng.uniform(-5, 5)) for _ in range(n)]
+        pc = pb[1:] + pb[:1]
+        a, b, c = np.array(pa), np.array(pb), np.array(pc)
+        r = P.distances(a, b)
+        rl = r.tolist()
+        tris_list = [(p, q, loop_apex(p, q)) for p, q in zip(pa, pb)]
+        tris = np.array(tris_list)
+        rows = [
+            ("distances", lambda: [P.distance(p, q) for p, q in zip(pa, pb)], lambda: P.distances(a, b)),
+            ("midpoints", lambda: [P.midpoint(p, q) for p, q in zip(pa, pb)], lambda: P.midpoints(a, b)),
+            ("equilateral apex", lambda: [loop_apex(p, q) for p, q in zip(pa, pb)],
+             lambda: P.equilateral_apexes(a, b)),
+            ("line-line", lambda: [loop_line_intersection(p, q, q, s) for p, q, s in zip(pa, pb, pc)],
+             lambda: P.line_intersections(a, b, b, c)),
+            ("line-circle", lambda: [loop_line_circle(p, q, s, x) for p, q, s, x in zip(pa, pb, pc, rl)],
+             lambda: P.line_circle_intersections(a, b, c, r)),
+            ("circle-circle", lambda: [loop_circles(p, x, q, x) for p, q, x in zip(pa, pb, rl)],
+             lambda: P.circle_intersections(a, r, b, r)),
+            ("triangle area", lambda: [loop_area(t) for t in tris_list], lambda: P.polygon_areas(tris)),
+        ]
+        print(f"N={n}")
+        print(f"  {'kernel':<18} {'loop ms':>10} {'numpy ms':>10} {'speedup':>8}")
+        for name, loop, kernel in rows:
+            kernel()  # warm up
+            tl, tk = timed(loop), timed(kernel)
+            print(f"  {name:<18} {1e3 * tl:>10.2f} {1e3 * tk:>10.2f} {tl / tk:>7.1f}x")
+    one_a, one_b = np.array(pa[0]), np.array(pb[0])
+    reps = 20000
+    t_kernel = timed(lambda: [P.equilateral_apexes(one_a, one_b) for _ in range(reps)])
+    t_scalar = timed(lambda: [loop_apex(pa[0], pb[0]) for _ in range(reps)])
+    print(f"single apex: kernel {1e6 * t_kernel / reps:.2f} us, scalar {1e6 * t_scalar / reps:.2f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""experiments/bench_scoring.py
+
+Benchmark: scalar vs batch candidate scoring in Engine.step().
+Motif: Phase (experiments)
+Ports: [benchmark script, reproducibility]
+Invariants: [experiment traceability, result logging]
+
+Times Engine.rank_candidates() (scoring plus best-first ordering) on a fixed
+list of candidates, with the per-candidate loop and with the NumPy batch stage.
+
+Usage:
+    python experiments/bench_scoring.py [--candidates 10000] [--repeats 20]
+"""
+
+import argparse
+import time
+
+from sophon.core.hypergraph import HyperGraph
+from sophon.engine.sophon import Engine
+from sophon.ops.registry import Registry
+from sophon.ops.euclid.book_I import REGISTRY as BOOK_I_REGISTRY
+from sophon.ops.euclid.book_II import REGISTRY as BOOK_II_REGISTRY
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark candidate scoring')
+    parser.add_argument('--candidates', type=int, default=10000)
+    parser.add_argument('--repeats', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    registry = Registry()
+    for op in BOOK_I_REGISTRY.ops() + BOOK_II_REGISTRY.ops():
+        registry.add(op)
+    ops = registry.ops()
+    candidates = [(ops[i % len(ops)], (i, i + 1)) for i in range(args.candidates)]
+    for batch in (False, True):
+        engine = Engine(HyperGraph(), registry, batch_scoring=batch, seed=args.seed)
+        t0 = time.perf_counter()
+        for _ in range(args.repeats):
+            engine.rank_candidates(candidates)
+        elapsed = (time.perf_counter() - t0) / args.repeats
+        label = 'batch' if batch else 'scalar'
+        print(f"{label:>7}: {elapsed * 1e3:8.2f} ms per step at {args.candidates} candidates")
+
+if __name__ == "__main__":
+    main()
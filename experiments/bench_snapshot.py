@@ -0,0 +1,81 @@
+"""experiments/bench_snapshot.py
+
+Benchmark: opening a memory-mapped snapshot vs reloading a JSONL graph.
+Motif: Phase (experiments)
+Ports: [benchmark script, reproducibility]
+Invariants: [experiment traceability, result logging]
+
+Builds a synthetic engine-shaped graph, writes it both as a snapshot and as
+JSONL, then reports the time to open each, the cost of random node lookups
+and a LINE type scan on the snapshot, and file sizes.
+
+Usage:
+    python experiments/bench_snapshot.py [--elements 1000000] [--lookups 10000]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sophon.core.hypergraph import HyperGraph
+from sophon.core.snapshot import open_snapshot, write_snapshot
+from sophon.core.storage import load_graph, open_store
+from sophon.core.types import EdgeType, NodeType
+
+def build(elements: int, seed: int) -> HyperGraph:
+    rng = random.Random(seed)
+    graph = HyperGraph()
+    points = []
+    while graph.version < elements:
+        pid = graph.add_node(NodeType.POINT, {'x': rng.uniform(-5, 5), 'y': rng.uniform(-5, 5), 'name': 'C'})
+        points.append(pid)
+        if len(points) > 1:
+            other = points[rng.randrange(len(points) - 1)]
+            lid = graph.add_node(NodeType.LINE, {'p1': other, 'p2': pid})
+            graph.add_edge(EdgeType.CONSTRUCTION, (other, pid, lid))
+    return graph
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark snapshot open vs JSONL reload')
+    parser.add_argument('--elements', type=int, default=1000000)
+    parser.add_argument('--lookups', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    graph = build(args.elements, args.seed)
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        snap_path = os.path.join(tmp, 'graph.snap')
+        jsonl_path = os.path.join(tmp, 'graph.jsonl')
+        t0 = time.perf_counter()
+        write_snapshot(graph, snap_path)
+        write_s = time.perf_counter() - t0
+        with open_store(jsonl_path) as store:
+            store.sync(graph)
+
+        t0 = time.perf_counter()
+        snap = open_snapshot(snap_path)
+        open_s = time.perf_counter() - t0
+        ids = [rng.randrange(1, graph._next_node_id) for _ in range(args.lookups)]
+        t0 = time.perf_counter()
+        for nid in ids:
+            snap.nodes[nid].attr
+        lookup_s = (time.perf_counter() - t0) / len(ids)
+        t0 = time.perf_counter()
+        lines = sum(1 for _ in snap.by_type(NodeType.LINE)[0])
+        scan_s = time.perf_counter() - t0
+        snap.close()
+
+        t0 = time.perf_counter()
+        load_graph(jsonl_path)
+        jsonl_s = time.perf_counter() - t0
+        print(f"elements:              {graph.version}")
+        print(f"snapshot write:        {write_s:.2f} s ({os.path.getsize(snap_path) / 1e6:.1f} MB)")
+        print(f"snapshot open:         {open_s * 1e3:.3f} ms")
+        print(f"random node lookup:    {lookup_s * 1e6:.2f} us (first touch)")
+        print(f"LINE scan ({lines} rows): {scan_s:.2f} s")
+        print(f"JSONL reload:          {jsonl_s:.2f} s ({os.path.getsize(jsonl_path) / 1e6:.1f} MB)")
+
+if __name__ == "__main__":
+    main()
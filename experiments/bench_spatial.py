@@ -0,0 +1,121 @@
+"""experiments/bench_spatial.py
+
+Benchmark: SpatialHash point merging and proximity queries at 10^5-10^6 points.
+Motif: Phase (experiments)
+Ports: [benchmark script, reproducibility]
+Invariants: [experiment traceability, result logging]
+
+For each size N, inserts N uniform points in the engine's [-5, 5]^2 seeding
+square (a --dup share of them within 1e-12 of an earlier point) and reports:
+
+- index build time and memory per point (a separate tracemalloc pass);
+- add_node cost with point_tolerance (merging the duplicates) vs a plain graph;
+- per-query time of find (tolerance lookup), within (radius holding ~20
+  points) and nearest (k = 1 and 10), against a NumPy brute-force scan of
+  the same coordinates when numpy is installed.
+
+Usage:
+    python experiments/bench_spatial.py [--points 100000,1000000] [--queries 2000] [--dup 0.1]
+"""
+
+import argparse
+import math
+import random
+import time
+import tracemalloc
+
+from sophon.core.hypergraph import HyperGraph
+from sophon.core.spatial import SpatialHash
+from sophon.core.types import NodeType
+
+try:
+    import numpy as np
+except ImportError:  # optional; only the brute-force baseline needs it
+    np = None
+
+def make_points(n: int, dup: float, seed: int):
+    rng = random.Random(seed)
+    points = []
+    for _ in range(n):
+        if points and rng.random() < dup:
+            x, y = rng.choice(points)
+            points.append((x + 1e-12, y))
+        else:
+            points.append((rng.uniform(-5, 5), rng.uniform(-5, 5)))
+    return points
+
+def build_index(points):
+    index = SpatialHash()
+    insert = index.insert
+    for i, (x, y) in enumerate(points, 1):
+        insert(i, x, y)
+    return index
+
+def per_call_us(fn, queries) -> float:
+    t0 = time.perf_counter()
+    for q in queries:
+        fn(*q)
+    return 1e6 * (time.perf_counter() - t0) / len(queries)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the POINT spatial hash')
+    parser.add_argument('--points', type=str, default='100000,1000000')
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--dup', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    for n in (int(float(v)) for v in args.points.split(',')):
+        points = make_points(n, args.dup, args.seed)
+        rng = random.Random(args.seed + 1)
+        queries = [(rng.uniform(-5, 5), rng.uniform(-5, 5)) for _ in range(args.queries)]
+        radius = math.sqrt(20 * 100.0 / (math.pi * n))  # ~20 points per disc
+
+        t0 = time.perf_counter()
+        index = build_index(points)
+        build_s = time.perf_counter() - t0
+        del index
+        tracemalloc.start()
+        index = build_index(points)
+        index_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        timings = {}
+        for tolerance in (None, 1e-9):
+            graph = HyperGraph(point_tolerance=tolerance)
+            add = graph.add_node
+            t0 = time.perf_counter()
+            for x, y in points:
+                add(NodeType.POINT, {'x': x, 'y': y})
+            timings[tolerance] = (1e6 * (time.perf_counter() - t0) / n, graph.count(NodeType.POINT)[0])
+
+        print(f"N={n}: cell {index.cell:g}, build {build_s:.2f} s, index {index_bytes / n:.1f} B/point")
+        print(f"  add_node plain {timings[None][0]:.2f} us ({timings[None][1]} points), "
+              f"tolerance 1e-9 {timings[1e-9][0]:.2f} us ({timings[1e-9][1]} points)")
+        rows = [
+            ("find", per_call_us(lambda x, y: index.find(x, y, 1e-9), queries)),
+            (f"within r={radius:.3f}", per_call_us(lambda x, y: index.within(x, y, radius), queries)),
+            ("nearest k=1", per_call_us(lambda x, y: index.nearest(x, y, 1), queries)),
+            ("nearest k=10", per_call_us(lambda x, y: index.nearest(x, y, 10), queries)),
+        ]
+        brute = {}
+        if np is not None:
+            xy = np.array(points)
+            few = queries[:max(1, len(queries) // 20)]
+
+            def scan_within(x, y, r=radius):
+                return np.flatnonzero((xy[:, 0] - x) ** 2 + (xy[:, 1] - y) ** 2 <= r * r)
+
+            def scan_nearest(x, y, k=10):
+                d2 = (xy[:, 0] - x) ** 2 + (xy[:, 1] - y) ** 2
+                return np.argpartition(d2, k)[:k]
+
+            brute = {"within": per_call_us(scan_within, few), "nearest k=10": per_call_us(scan_nearest, few),
+                     "nearest k=1": per_call_us(lambda x, y: int(np.argmin((xy[:, 0] - x) ** 2 + (xy[:, 1] - y) ** 2)), few)}
+            brute["find"] = brute["nearest k=1"]
+        print(f"  {'query':<18} {'grid us':>9} {'numpy scan us':>14}")
+        for name, us in rows:
+            base = brute.get(name.split(" r=")[0])
+            print(f"  {name:<18} {us:>9.2f} {base if base is None else round(base, 1)!s:>14}")
+
+if __name__ == "__main__":
+    main()
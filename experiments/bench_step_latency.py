@@ -0,0 +1,96 @@
+"""experiments/bench_step_latency.py
+
+Benchmark: Engine.step() latency as the hypergraph grows.
+Motif: Phase (experiments)
+Ports: [benchmark script, reproducibility]
+Invariants: [experiment traceability, result logging]
+
+The graph is padded with nodes of types the Book I/II ops never look at
+(PROPOSITION/CONCEPT), so per-step cost should stay flat as the padding grows
+now that by_type() reads from per-type indexes instead of scanning everything.
+
+A second table runs the engine itself for a growing number of steps and
+reports the latency of the last window, with incremental candidate matching
+on and off, to show how step cost follows the graph the engine builds.
+
+Usage:
+    python experiments/bench_step_latency.py [--sizes 1000 10000 100000] [--steps 50]
+                                             [--growth 500 1000 2000] [--window 100]
+"""
+
+import argparse
+import time
+
+from sophon.core.hypergraph import HyperGraph
+from sophon.core.types import NodeType, EdgeType
+from sophon.engine.sophon import Engine
+from sophon.ops.registry import Registry
+from sophon.ops.euclid.book_I import REGISTRY as BOOK_I_REGISTRY
+from sophon.ops.euclid.book_II import REGISTRY as BOOK_II_REGISTRY
+
+def build_engine(padding: int, seed: int, incremental: bool = True) -> Engine:
+    graph = HyperGraph()
+    registry = Registry()
+    for op in BOOK_I_REGISTRY.ops() + BOOK_II_REGISTRY.ops():
+        registry.add(op)
+    engine = Engine(graph, registry, E=15.0, epsilon=0.3, top_n_explore=15, recent_window=10,
+                    incremental=incremental, seed=seed)
+    engine.seed_graph(num_points=5, num_lines=3)
+    for i in range(padding):
+        nid = graph.add_node(NodeType.CONCEPT if i % 2 else NodeType.PROPOSITION, {'text': 'padding'})
+        if i % 4 == 0:
+            graph.add_edge(EdgeType.TEMPORAL, (nid,))
+    return engine
+
+def bench(padding: int, steps: int, seed: int) -> float:
+    engine = build_engine(padding, seed)
+    t0 = time.perf_counter()
+    for _ in range(steps):
+        engine.step()
+    return (time.perf_counter() - t0) / steps
+
+def bench_by_type(padding: int, seed: int, repeats: int = 1000) -> float:
+    graph = build_engine(padding, seed).graph
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        for line in graph.by_type(NodeType.LINE)[0]:
+            pass
+    return (time.perf_counter() - t0) / repeats
+
+def bench_growth(checkpoints, window: int, seed: int, incremental: bool):
+    """Yield (steps, graph nodes, ms/step over the last `window` steps) at each checkpoint."""
+    engine = build_engine(0, seed, incremental)
+    done = 0
+    for target in checkpoints:
+        while done < target - window:
+            engine.step()
+            done += 1
+        t0 = time.perf_counter()
+        while done < target:
+            engine.step()
+            done += 1
+        yield target, len(engine.graph.nodes), (time.perf_counter() - t0) / window
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark step latency against graph size')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--steps', type=int, default=50)
+    parser.add_argument('--growth', type=int, nargs='+', default=[500, 1000, 2000])
+    parser.add_argument('--window', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    print(f"{'padding nodes':>14} {'ms/step':>10} {'us/by_type(LINE)':>17}")
+    for size in args.sizes:
+        step_s = bench(size, args.steps, args.seed)
+        lookup_s = bench_by_type(size, args.seed)
+        print(f"{size:>14} {step_s * 1e3:>10.3f} {lookup_s * 1e6:>17.3f}")
+    print()
+    print(f"{'steps':>8} {'nodes':>8} {'incremental ms':>15} {'full precond ms':>16}")
+    checkpoints = sorted(args.growth)
+    rows = zip(bench_growth(checkpoints, args.window, args.seed, True),
+               bench_growth(checkpoints, args.window, args.seed, False))
+    for (steps, nodes, inc_s), (_, _, full_s) in rows:
+        print(f"{steps:>8} {nodes:>8} {inc_s * 1e3:>15.3f} {full_s * 1e3:>16.3f}")
+
+if __name__ == "__main__":
+    main()
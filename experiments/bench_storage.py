@@ -0,0 +1,77 @@
+"""experiments/bench_storage.py
+
+Benchmark: save (per-step sync) and streaming reload of large graphs, JSONL vs SQLite.
+Motif: Phase (experiments)
+Ports: [benchmark script, reproducibility]
+Invariants: [experiment traceability, result logging]
+
+Builds a synthetic graph shaped like an engine run (points, lines referencing
+them, construction edges), syncs it to each store in step-sized increments,
+then reloads it. Reports per-element save/load cost and projected totals for
+10^7 elements.
+
+Usage:
+    python experiments/bench_storage.py [--elements 1000000] [--per-step 16]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sophon.core.hypergraph import HyperGraph
+from sophon.core.storage import load_graph, open_store
+from sophon.core.types import EdgeType, NodeType
+
+def build(elements: int, seed: int) -> HyperGraph:
+    rng = random.Random(seed)
+    graph = HyperGraph()
+    points = []
+    while graph.version < elements:
+        pid = graph.add_node(NodeType.POINT, {'x': rng.uniform(-5, 5), 'y': rng.uniform(-5, 5), 'name': 'C'})
+        points.append(pid)
+        if len(points) > 1:
+            other = points[rng.randrange(len(points) - 1)]
+            lid = graph.add_node(NodeType.LINE, {'p1': other, 'p2': pid})
+            graph.add_edge(EdgeType.CONSTRUCTION, (other, pid, lid))
+    return graph
+
+def bench(graph: HyperGraph, path: str, per_step: int):
+    """Return (save s, load s) for one store file."""
+    store = open_store(path)
+    t0 = time.perf_counter()
+    # Replay the journal as if the graph grew per_step elements per engine step
+    journal = graph._journal
+    view = HyperGraph()
+    view.nodes, view.edges = graph.nodes, graph.edges
+    for start in range(0, len(journal), per_step):
+        view._journal.extend(journal[start:start + per_step])
+        store.sync(view)
+    store.close()
+    save_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    loaded = load_graph(path)
+    load_s = time.perf_counter() - t0
+    assert loaded.version == graph.version
+    return save_s, load_s
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark graph save/load')
+    parser.add_argument('--elements', type=int, default=1000000)
+    parser.add_argument('--per-step', type=int, default=16)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    graph = build(args.elements, args.seed)
+    n = graph.version
+    print(f"{'store':>8} {'us/elem save':>13} {'us/elem load':>13} {'MB':>8} {'1e7 load s':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ('graph.jsonl', 'graph.db'):
+            path = os.path.join(tmp, name)
+            save_s, load_s = bench(graph, path, args.per_step)
+            size = os.path.getsize(path) / 1e6
+            print(f"{name.split('.')[1]:>8} {save_s / n * 1e6:>13.2f} {load_s / n * 1e6:>13.2f} "
+                  f"{size:>8.1f} {load_s / n * 1e7:>11.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""experiments/bench_symmetry.py
+
+Benchmark: candidate-space waste with and without canonical-key pruning of already applied inputs.
+Motif: Phase (experiments)
+Ports: [benchmark script, reproducibility]
+Invariants: [experiment traceability, result logging]
+
+Runs the CLI engine configuration for several seeds with prune_seen off and
+on and reports, per step, the candidates offered for scoring, the share of
+them that repeat an application already kept (pruned ones never reach
+scoring), distinct applications kept per step, and the wall time per step.
+
+Usage:
+    python experiments/bench_symmetry.py [--steps 400] [--seeds 5]
+"""
+
+import argparse
+import time
+
+from sophon.engine.sweep import RunConfig, build_engine
+
+def run(prune: bool, seed: int, steps: int):
+    """Return (candidates, repeats, pruned, distinct kept, seconds) for one seeded run."""
+    engine = build_engine(RunConfig(seed=seed, summary_level="full", prune_seen=prune))
+    candidates = repeats = pruned = 0
+    seconds = 0.0
+    step = engine.step
+    for _ in range(steps):
+        before = len(engine.seen_applications)
+        t0 = time.perf_counter()
+        step()
+        seconds += time.perf_counter() - t0
+        summary = engine.get_last_summary()
+        candidates += summary["candidates"]
+        pruned += summary["pruned"]
+        # chosen applications that were already kept before this step
+        repeats += len(summary["chosen_ops"]) - (len(engine.seen_applications) - before)
+    return candidates, repeats, pruned, len(engine.seen_applications), seconds
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark canonical-key candidate pruning')
+    parser.add_argument('--steps', type=int, default=400)
+    parser.add_argument('--seeds', type=int, default=5)
+    args = parser.parse_args()
+    print(f"{'prune_seen':>10} {'cands/step':>11} {'pruned/step':>12} {'repeat picks':>13} "
+          f"{'distinct kept':>14} {'ms/step':>8}")
+    for prune in (False, True):
+        totals = [0.0] * 5
+        for seed in range(args.seeds):
+            totals = [t + v for t, v in zip(totals, run(prune, seed, args.steps))]
+        candidates, repeats, pruned, distinct, seconds = (t / args.seeds for t in totals)
+        print(f"{str(prune):>10} {candidates / args.steps:>11.1f} {pruned / args.steps:>12.1f} "
+              f"{repeats:>13.1f} {distinct:>14.1f} {1e3 * seconds / args.steps:>8.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,12 @@ Invariants: [affective learning, energy↔structure conversion, closure optimiza
 
 import math
 
-from typing import Tuple, Sequence
+from typing import Any, Tuple, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency; only the *_batch methods need it
+    np = None
 
 class Valuator:
     """Equation of Emotion affective controller."""
@@ -43,9 +48,19 @@ class Valuator:
         l1, l2, l3, l4 = self.lam
         return l1 * V + l2 * A + l3 * U + l4 * C
 
+    def eoe_batch(self, EP: Any, P: Any) -> Tuple[Any, Any, Any]:
+        """Vectorised eoe() over NumPy arrays (P may be a scalar)."""
+        ER = np.asarray(P, dtype=np.float64) - np.asarray(EP, dtype=np.float64)
+        return ER, np.tanh(2.0 * ER), np.abs(ER)
+
+    def priority_batch(self, V: Any, A: Any, U: Any, C: Any) -> Any:
+        """Vectorised priority() over NumPy arrays (any argument may be a scalar)."""
+        l1, l2, l3, l4 = self.lam
+        return l1 * V + l2 * A + l3 * U + l4 * C
+
     def consolidate(self, E: float, m: float, rewards: Sequence[float]) -> Tuple[float, float]:
-        """Convert energy to mass based on rewards (E → m)."""
-        total_reward: float = sum(rewards)
+        """Convert energy to mass based on rewards (E → m). rewards may be a NumPy array."""
+        total_reward: float = float(np.sum(rewards)) if np is not None and isinstance(rewards, np.ndarray) else sum(rewards)
         dE: float = -self.alpha * total_reward
         dM: float = -dE / self.c2
         return max(E + dE, 0.0), m + dM
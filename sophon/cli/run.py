@@ -9,14 +9,13 @@ Invariants: [usability, headless operation]
 import argparse
 import logging
 import os
-from typing import Optional, Any, List, Tuple, Dict, cast
-from sophon.core.hypergraph import HyperGraph
-from sophon.ops.registry import Registry
-from sophon.engine.sophon import Engine
+from typing import Optional
+from sophon.core.storage import open_store
+from sophon.engine.metrics import LogSink, MetricsReporter, open_sink
+from sophon.engine.sweep import RunConfig, build_engine
 
-# Import all available book registries
-from sophon.ops.euclid.book_I import REGISTRY as BOOK_I_REGISTRY
-from sophon.ops.euclid.book_II import REGISTRY as BOOK_II_REGISTRY
+PROGRESS_FIELDS = ("step", "nodes", "edges", "energy", "mass", "candidates", "chosen", "top_op",
+                   "top_score", "reward_n", "reward_sum", "fallback_used")
 
 def configure_logging(args: argparse.Namespace) -> None:
     level: int
@@ -45,74 +44,77 @@ def main():
     parser.add_argument('--log-level', type=str, choices=['DEBUG','INFO','WARNING','ERROR','CRITICAL'], help='Override log level')
     parser.add_argument('--min-energy-floor', type=float, default=1.0, help='Minimum selection budget floor')
     parser.add_argument('--no-greedy-fallback', action='store_true', help='Disable greedy fallback when no ops are chosen')
+    parser.add_argument('--save', type=str, default=None, help='Append the graph to this file as it grows (.jsonl, or .db/.sqlite for SQLite)')
+    parser.add_argument('--checkpoint', type=str, default='sophon_checkpoint', help='Checkpoint directory')
+    parser.add_argument('--checkpoint-every', type=int, default=0, help='Checkpoint every N steps (0 = never)')
+    parser.add_argument('--resume', type=str, default=None, help='Resume from this checkpoint directory; --steps is the total step count')
+    parser.add_argument('--novelty', type=str, choices=['set', 'exact', 'bloom'], default='set', help='Seen-application tracker: exact sets, 64-bit fingerprints, or a Bloom filter')
+    parser.add_argument('--novelty-bytes', type=int, default=None, help='Memory budget for the Bloom novelty tracker (ignored by set/exact)')
+    parser.add_argument('--profile', action='store_true', help='Time each step phase and op; print a report at the end')
+    parser.add_argument('--metrics', type=str, action='append', default=[], help='Metrics sink: a .jsonl/.csv/.npz path or tcp://host:port, unix:///path (repeatable)')
+    parser.add_argument('--metrics-every', type=int, default=1, help='Emit a metrics row every N steps')
+    parser.add_argument('--summary-level', type=str, choices=['basic', 'full'], default='basic', help="'full' adds chosen ops and top-k scores to every row")
+    parser.add_argument('--outcome-model', type=str, choices=['ucb', 'thompson'], default=None, help='Score with learned per-op outcome statistics')
+    parser.add_argument('--prune-seen', action='store_true', help='Skip candidates whose application was already kept')
+    parser.add_argument('--hash-cons', action='store_true', help='Intern identical points, lines, figures and propositions instead of adding copies')
+    parser.add_argument('--point-tolerance', type=float, default=None, help='Merge a new point into an existing one within this distance')
     args = parser.parse_args()
     configure_logging(args)
     logger = logging.getLogger("sophon.cli")
 
-    if args.seed is not None:
-        import random
-        random.seed(args.seed)
-
-    # Setup
-    graph = HyperGraph()
-    registry = Registry()
-
-    # Load ops from multiple books
-    for op in BOOK_I_REGISTRY.ops():
-        registry.add(op)
-    for op in BOOK_II_REGISTRY.ops():
-        registry.add(op)
-
-    # Initialize engine with enhanced exploration
-    verbosity = 1 if args.debug else 0
-    engine = Engine(
-        graph,
-        registry,
+    # Setup (the engine's RNG is seeded from --seed when given)
+    engine = build_engine(RunConfig(
+        seed=args.seed,
+        steps=args.steps,
         E=15.0,  # More energy for multiple operations
-        m=0.0,
-        verbosity=verbosity,
+        epsilon=0.3,  # 30% exploration rate
         min_energy_floor=args.min_energy_floor,
         force_greedy_if_empty=(not args.no_greedy_fallback),
-        epsilon=0.3,  # 30% exploration rate
         top_n_explore=15,  # Explore from top 15 candidates
-        recent_window=10  # Larger diversity tracking window
-    )
-    engine.seed_graph(num_points=5, num_lines=3)
+        recent_window=10,  # Larger diversity tracking window
+        num_points=5,
+        num_lines=3,
+        novelty=args.novelty,
+        novelty_bytes=args.novelty_bytes,
+        profile=args.profile,
+        summary_level=args.summary_level,
+        outcome_model=args.outcome_model,
+        prune_seen=args.prune_seen,
+        hash_cons=args.hash_cons,
+        point_tolerance=args.point_tolerance,
+    ))
+    engine.verbosity = 1 if args.debug else 0
+    if args.resume:
+        engine.resume(args.resume)
+        logger.info(f"Resumed from {args.resume} at step {engine.step_count}")
+    graph = engine.graph
+    registry = engine.registry
 
     logger.info(f"Starting SOPHON with {len(registry.ops())} ops")
+    # On resume, cut the save file back to the checkpointed graph: the interrupted run may
+    # have written past its last checkpoint (or died with records still buffered)
+    store = open_store(args.save, since=graph.version if args.resume else 0, truncate=bool(args.resume)) if args.save else None
+    progress = MetricsReporter([LogSink(logger, PROGRESS_FIELDS)], every=args.report_every)
+    metrics = MetricsReporter([open_sink(spec) for spec in args.metrics], every=args.metrics_every)
 
     # Run
-    for step in range(args.steps):
+    for step in range(engine.step_count, args.steps):
         engine.step()
-        if (step + 1) % args.report_every == 0:
-            logger.info(f"Step {step + 1}:")
-            logger.info(f"  Nodes: {len(graph.nodes)}")
-            logger.info(f"  Edges: {len(graph.edges)}")
-            logger.info(f"  Energy: {engine.E:.2f}")
-            logger.info(f"  Mass: {engine.m:.2f}")
-            summary: Dict[str, Any] = engine.get_last_summary() or {}
-            candidates = int(summary.get("candidates", 0))
-            chosen = int(summary.get("chosen", 0))
-            top_op = summary.get("top_op")
-            top_score = summary.get("top_score")
-            rewards = cast(List[float], summary.get("rewards", []))
-            topk = cast(List[Tuple[str, float]], summary.get("topk", []))
-            chosen_ops = cast(List[Tuple[str, Tuple[Any, ...]]], summary.get("chosen_ops", []))
-            budget = float(summary.get("budget_spent", 0.0))
-            available = float(summary.get("available_budget", 0.0))
-            fallback_used = bool(summary.get("fallback_used", False))
-            avg_r = (sum(rewards) / len(rewards)) if rewards else 0.0
-            max_r = max(rewards) if rewards else 0.0
-            logger.info(f"  Candidates: {candidates} | Chosen: {chosen} | Top: {top_op or '-'}{f' {top_score:.3f}' if top_score is not None else ''}")
-            if topk:
-                logger.info("  TopK: " + ", ".join(f"{name}:{score:.3f}" for name, score in topk))
-            if chosen_ops:
-                shown = ", ".join(f"{name}{inputs}" for name, inputs in chosen_ops[:2])
-                more = f" (+{len(chosen_ops)-2} more)" if len(chosen_ops) > 2 else ""
-                logger.info(f"  Applied: {shown}{more} | Budget: {budget:.2f}/{available:.2f} | Fallback: {fallback_used}")
-            logger.info(f"  Rewards: n={len(rewards)} avg={avg_r:.3f} max={max_r:.3f}")
+        if store is not None:
+            store.sync(graph)
+        if args.checkpoint_every and (step + 1) % args.checkpoint_every == 0:
+            engine.checkpoint(args.checkpoint)
+        progress.report(engine)
+        metrics.report(engine)
 
+    metrics.close()
+    if store is not None:
+        store.sync(graph)
+        store.close()
+        logger.info(f"Saved graph to {args.save}")
     logger.info("Run complete.")
+    if engine.profiler is not None:
+        print(engine.profiler.report())
 
 if __name__ == '__main__':
     main()
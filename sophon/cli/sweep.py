@@ -0,0 +1,69 @@
+"""sophon.cli.sweep
+
+Provides the CLI entry point for multi-seed SOPHON parameter sweeps.
+Motif: Module (cli/sweep)
+Ports: [interface: CLI sweep runner]
+Invariants: [usability, headless operation, reproducibility]
+
+Runs the grid seeds × energies × epsilons, one engine per worker process,
+and writes one columnar results file (.json or .npz). With --root-seed, the
+per-run seeds are derived from one root seed (sophon.engine.rng.spawn_seeds)
+instead of being listed.
+
+    python -m sophon.cli.sweep --seeds 0 1 2 3 --energy 10 15 --epsilon 0.1 0.3 \\
+        --steps 1000 --out results.json
+"""
+
+import argparse
+import itertools
+import logging
+import os
+from typing import Dict, List
+
+from sophon.cli.run import configure_logging
+from sophon.engine.rng import spawn_seeds
+from sophon.engine.sweep import RunConfig, sweep, write_columns
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a multi-seed SOPHON sweep')
+    parser.add_argument('--seeds', type=int, nargs='+', default=None, help='Explicit seeds')
+    parser.add_argument('--num-seeds', type=int, default=4, help='Use seeds 0..N-1 when --seeds is not given')
+    parser.add_argument('--root-seed', type=int, default=None, help='Derive --num-seeds seeds from this root seed')
+    parser.add_argument('--steps', type=int, default=1000)
+    parser.add_argument('--energy', type=float, nargs='+', default=[15.0], help='Initial energy values')
+    parser.add_argument('--epsilon', type=float, nargs='+', default=[0.3], help='Exploration rates')
+    parser.add_argument('--min-energy-floor', type=float, default=1.0, help='Minimum selection budget floor')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: all cores)')
+    parser.add_argument('--chunk', type=int, default=100, help='Steps per streamed chunk')
+    parser.add_argument('--out', type=str, default='sweep_results.json', help='Columnar results file (.json or .npz)')
+    parser.add_argument('--verbose', action='store_true', help='Enable INFO-level output')
+    parser.add_argument('--quiet', action='store_true', help='Only show errors')
+    parser.add_argument('--log-level', type=str, choices=['DEBUG','INFO','WARNING','ERROR','CRITICAL'], help='Override log level')
+    args = parser.parse_args()
+    configure_logging(args)
+    logger = logging.getLogger("sophon.cli")
+
+    if args.seeds is not None:
+        seeds = args.seeds
+    elif args.root_seed is not None:
+        seeds = spawn_seeds(args.root_seed, args.num_seeds)
+    else:
+        seeds = list(range(args.num_seeds))
+    configs = [
+        RunConfig(seed=seed, steps=args.steps, E=energy, epsilon=epsilon, min_energy_floor=args.min_energy_floor)
+        for seed, energy, epsilon in itertools.product(seeds, args.energy, args.epsilon)
+    ]
+    workers = args.workers or os.cpu_count() or 1
+    logger.info(f"Sweeping {len(configs)} runs x {args.steps} steps on {min(workers, len(configs))} workers")
+
+    progress: Dict[int, int] = {}
+    def on_rows(run_index: int, rows: List[dict]) -> None:
+        progress[run_index] = rows[-1]["step"]
+        logger.debug(f"run {run_index}: step {progress[run_index]}/{args.steps}")
+
+    columns = sweep(configs, workers=workers, chunk=args.chunk, on_rows=on_rows)
+    write_columns(columns, args.out)
+    logger.info(f"Wrote {len(columns.get('run', []))} rows to {args.out}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+"""sophon.core.coords
+
+Columnar coordinate storage for POINT nodes in SOPHON.
+Motif: Module (core/coords)
+Ports: [interface: PointStore, PointAttr]
+Invariants: [attr compatibility, contiguous float64 storage]
+
+Point coordinates live in one growable (capacity, 2) float64 array indexed by
+node id. Each POINT node's attr is a PointAttr that routes 'x'/'y' to the
+array and every other key to a compact AttrMap, so existing ops keep using
+node.attr['x'] while bulk queries run as array operations. Requires numpy.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, MutableMapping, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+from .types import AttrMap
+
+_AXES = {'x': 0, 'y': 1}
+
+class PointStore:
+    """Growable contiguous float64 coordinate columns, indexed by node id (NaN = unset)."""
+
+    def __init__(self, capacity: int = 1024) -> None:
+        if np is None:
+            raise ImportError("PointStore requires numpy")
+        self._xy = np.full((max(capacity, 1), 2), np.nan, dtype=np.float64)
+        self._ids = np.zeros(max(capacity, 1), dtype=np.int64)
+        self._n = 0
+        self._hi = 0  # one past the largest registered id
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _ensure(self, node_id: int) -> None:
+        cap = self._xy.shape[0]
+        if node_id < cap:
+            return
+        while cap <= node_id:
+            cap *= 2
+        grown = np.full((cap, 2), np.nan, dtype=np.float64)
+        grown[:self._xy.shape[0]] = self._xy
+        self._xy = grown
+
+    def register(self, node_id: int) -> None:
+        """Reserve a row for node_id (coordinates start unset)."""
+        self._ensure(node_id)
+        if self._n == self._ids.shape[0]:
+            self._ids = np.concatenate([self._ids, np.zeros_like(self._ids)])
+        self._ids[self._n] = node_id
+        self._n += 1
+        self._hi = max(self._hi, node_id + 1)
+
+    def get(self, node_id: int, axis: int) -> float:
+        return float(self._xy[node_id, axis])
+
+    def set(self, node_id: int, axis: int, value: float) -> None:
+        self._xy[node_id, axis] = value
+
+    def has(self, node_id: int, axis: int) -> bool:
+        return node_id < self._xy.shape[0] and not np.isnan(self._xy[node_id, axis])
+
+    def ids(self) -> "np.ndarray":
+        """Return the ids of all registered points as an int64 array."""
+        return self._ids[:self._n]
+
+    def xy(self, ids: Optional[Iterable[int]] = None) -> "np.ndarray":
+        """Return an (N, 2) array of coordinates for ids (default: all registered points)."""
+        if ids is None:
+            return self._xy[self.ids()]
+        if not isinstance(ids, np.ndarray):
+            ids = list(ids)
+        return self._xy[np.asarray(ids, dtype=np.int64)]
+
+    def distances(self, x: float, y: float, ids: Optional[Iterable[int]] = None) -> "np.ndarray":
+        """Return distances from (x, y) to each point in ids (default: all points)."""
+        pts = self.xy(ids)
+        return np.hypot(pts[:, 0] - x, pts[:, 1] - y)
+
+    def within(self, x: float, y: float, radius: float) -> "np.ndarray":
+        """Return ids of all points within radius of (x, y)."""
+        # Rows are node ids and unset rows are NaN (never <= r), so scan the
+        # contiguous prefix directly instead of gathering by id.
+        xy = self._xy[:self._hi]
+        d2 = (xy[:, 0] - x) ** 2 + (xy[:, 1] - y) ** 2
+        return np.flatnonzero(d2 <= radius * radius)
+
+    def nbytes(self) -> int:
+        """Bytes held by the coordinate columns."""
+        return int(self._xy.nbytes + self._ids.nbytes)
+
+class PointAttr(MutableMapping):
+    """Attr mapping for a POINT node: 'x'/'y' are backed by a PointStore row."""
+    __slots__ = ('_store', '_id', '_extra')
+
+    def __init__(self, store: PointStore, node_id: int, attr: Optional[Dict[str, Any]] = None) -> None:
+        self._store = store
+        self._id = node_id
+        self._extra: Optional[AttrMap] = None
+        store.register(node_id)
+        for key, value in (attr or {}).items():
+            self[key] = value
+
+    def __getitem__(self, key: str) -> Any:
+        axis = _AXES.get(key)
+        if axis is None:
+            if self._extra is None:
+                raise KeyError(key)
+            return self._extra[key]
+        if not self._store.has(self._id, axis):
+            raise KeyError(key)
+        return self._store.get(self._id, axis)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        axis = _AXES.get(key)
+        if axis is None:
+            if self._extra is None:
+                self._extra = AttrMap()
+            self._extra[key] = value
+        else:
+            self._store.set(self._id, axis, value)
+
+    def __delitem__(self, key: str) -> None:
+        axis = _AXES.get(key)
+        if axis is None:
+            if self._extra is None:
+                raise KeyError(key)
+            del self._extra[key]
+        elif self._store.has(self._id, axis):
+            self._store.set(self._id, axis, np.nan)
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        axis = _AXES.get(key) if isinstance(key, str) else None
+        if axis is None:
+            return self._extra is not None and key in self._extra
+        return self._store.has(self._id, axis)
+
+    def __iter__(self) -> Iterator[str]:
+        for key, axis in _AXES.items():
+            if self._store.has(self._id, axis):
+                yield key
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+    def coords(self) -> Tuple[float, float]:
+        """Return (x, y) straight from the store."""
+        return self._store.get(self._id, 0), self._store.get(self._id, 1)
@@ -2,41 +2,481 @@
 
 Implements the core hypergraph data structures and operations for SOPHON.
 Motif: Module (core/hypergraph)
-Ports: [interface: HyperGraph, HNode, HEdge]
+Ports: [interface: HyperGraph, GraphFork, HNode, HEdge]
 Invariants: [type safety, compositionality]
+
+Graphs are append-only, which makes copy-on-write forks cheap: a GraphFork
+reads through to its parent for every id allocated before the fork and keeps
+its own additions in local overlay dicts. fork(), commit() and discard() all
+cost O(changes in the fork), never O(graph).
+
+With hash_cons=True a graph interns structurally identical objects:
+add_node returns the id of an existing node with the same intern_key (e.g.
+the line between the same two points, or a proposition with the same text
+and support), and add_edge returns an existing edge of the same type over
+the same node set with equal attrs. Repeated constructions then cost no
+memory and feed no new nodes to candidate matching.
+
+With point_tolerance set, POINT coordinates are also indexed in a
+SpatialHash (see sophon.core.spatial): add_node resolves a point within the
+tolerance of an existing one to that node, whether or not hash_cons is on,
+and points_within/nearest_points answer proximity queries for ops.
 """
 
-from typing import Any, Dict, Optional, Set, Tuple
-from .types import HNode, HEdge, NodeType, EdgeType
+from array import array
+from itertools import chain, takewhile
+from typing import (Any, Dict, FrozenSet, Hashable, Iterable, Iterator, List, Mapping, MutableMapping, Optional,
+                    Sequence, Set, Tuple)
+from .types import AttrMap, HNode, HEdge, NodeType, EdgeType
+from .coords import PointAttr, PointStore
+from .spatial import SpatialHash
+
+def _unordered(ids: Any) -> Optional[Tuple[Any, ...]]:
+    # sorted tuples: a fraction of a frozenset's size, and the keys are many
+    return tuple(sorted(ids)) if isinstance(ids, (list, tuple)) else None
+
+def intern_key(type: NodeType, attr: Optional[Mapping[str, Any]]) -> Optional[Hashable]:
+    """
+    Structural identity of a node for hash-consing, or None if the node is
+    never merged with another:
+
+        POINT        exact (x, y)
+        LINE         unordered endpoint pair {p1, p2}
+        CIRCLE       (center, radius)
+        POLYGON      (kind, sides, unordered based_on)
+        PROPOSITION  (text, unordered support)
+
+    Names, provenance and status do not take part; the first node added under
+    a key keeps its attrs. Nodes missing the keyed attrs are never merged.
+    """
+    if not attr:
+        return None
+    if type == NodeType.POINT:
+        x, y = attr.get('x'), attr.get('y')
+        return None if x is None or y is None else (type, x, y)
+    if type == NodeType.LINE:
+        p1, p2 = attr.get('p1'), attr.get('p2')
+        if p1 is None or p2 is None:
+            return None
+        return (type, p1, p2) if p1 <= p2 else (type, p2, p1)
+    if type == NodeType.CIRCLE:
+        center = attr.get('center')
+        return None if center is None else (type, center, attr.get('radius'))
+    if type == NodeType.POLYGON:
+        based_on = _unordered(attr.get('based_on'))
+        return None if based_on is None else (type, attr.get('type'), attr.get('sides'), based_on)
+    if type == NodeType.PROPOSITION:
+        support = _unordered(attr.get('support'))
+        return None if support is None else (type, attr.get('text'), support)
+    return None
 
 class HyperGraph:
-    def __init__(self):
+    def __init__(self, coords: Optional[PointStore] = None, compact_attrs: bool = False,
+                 hash_cons: bool = False, point_tolerance: Optional[float] = None):
+        """
+        coords: optional columnar PointStore; when given, POINT coordinates are
+            kept in its float64 arrays and node.attr['x'/'y'] read through to it.
+        compact_attrs: store node/edge attrs as AttrMap (shared key tables,
+            interned strings) instead of per-object dicts.
+        hash_cons: intern structurally identical nodes and edges (see
+            intern_key); add_node/add_edge then return the existing id.
+        point_tolerance: merge a new POINT into an existing one at most this
+            far away (0.0 = exactly coincident), using a spatial index.
+        """
         self.nodes: Dict[int, HNode] = {}
         self.edges: Dict[int, HEdge] = {}
         self._next_node_id = 1
         self._next_edge_id = 1
+        self.coords = coords
+        self.compact_attrs = compact_attrs
+        # Per-type partitions of nodes/edges, kept in insertion order
+        self._nodes_by_type: Dict[NodeType, Dict[int, HNode]] = {t: {} for t in NodeType}
+        self._edges_by_type: Dict[EdgeType, Dict[int, HEdge]] = {t: {} for t in EdgeType}
+        # node id -> ids of edges containing it; (edge type, node set) -> edge ids
+        self._incidence: Dict[int, Dict[int, None]] = {}
+        self._edge_lookup: Dict[Tuple[EdgeType, FrozenSet[int]], List[int]] = {}
+        # Append-only change journal: +id for an added node, -id for an added edge.
+        # The graph version is the journal length.
+        self._journal = array('q')
+        # intern_key -> first node id with that key; None while not hash-consing
+        self.hash_cons = hash_cons
+        self._interned: Optional[Dict[Hashable, int]] = {} if hash_cons else None
+        # POINT coordinate index; None until point_tolerance or a query needs it
+        self.point_tolerance = point_tolerance
+        self.points: Optional[SpatialHash] = SpatialHash() if point_tolerance is not None else None
 
     def add_node(self, type: NodeType, attr: Optional[Dict[str, Any]] = None) -> int:
+        if self.point_tolerance is not None and type == NodeType.POINT and attr:
+            x, y = attr.get('x'), attr.get('y')
+            if x is not None and y is not None:
+                existing = self._find_point(x, y, self.point_tolerance)
+                if existing is not None:
+                    return existing
+        elif self.hash_cons:
+            key = intern_key(type, attr)
+            if key is not None:
+                existing = self._interned_id(key)
+                if existing is not None:
+                    return existing
         node_id = self._next_node_id
-        self.nodes[node_id] = HNode(id=node_id, type=type, attr=attr or {})
-        self._next_node_id += 1
+        self._insert_node(node_id, type, attr)
         return node_id
 
     def add_edge(self, type: EdgeType, nodes: Tuple[int, ...], attr: Optional[Dict[str, Any]] = None) -> int:
+        if self.hash_cons:
+            wanted = attr or {}
+            for eid in self._lookup_ids((type, frozenset(nodes))):
+                if dict(self.edges[eid].attr) == wanted:
+                    return eid
         edge_id = self._next_edge_id
-        self.edges[edge_id] = HEdge(id=edge_id, type=type, nodes=nodes, attr=attr or {})
-        self._next_edge_id += 1
+        self._insert_edge(edge_id, type, nodes, attr)
         return edge_id
 
+    def _insert_node(self, node_id: int, type: NodeType, attr: Optional[Dict[str, Any]]) -> None:
+        """Add a node under a given id (loaders use this to keep stored ids); ids must ascend."""
+        if self._interned is not None:
+            key = intern_key(type, attr)
+            if key is not None:
+                self._interned.setdefault(key, node_id)
+        if self.points is not None and type == NodeType.POINT and attr:
+            x, y = attr.get('x'), attr.get('y')
+            if x is not None and y is not None:
+                self.points.insert(node_id, x, y)
+        if type == NodeType.POINT and self.coords is not None:
+            attr = PointAttr(self.coords, node_id, attr)
+        elif self.compact_attrs:
+            attr = AttrMap(attr)
+        node = HNode(id=node_id, type=type, attr=attr if attr is not None else {})
+        self.nodes[node_id] = node
+        self._nodes_by_type[type][node_id] = node
+        self._journal.append(node_id)
+        self._next_node_id = node_id + 1
+
+    def _insert_edge(self, edge_id: int, type: EdgeType, nodes: Tuple[int, ...], attr: Optional[Dict[str, Any]]) -> None:
+        """Add an edge under a given id (see _insert_node); ids must ascend."""
+        if self.compact_attrs:
+            attr = AttrMap(attr)
+        edge = HEdge(id=edge_id, type=type, nodes=nodes, attr=attr if attr is not None else {})
+        self.edges[edge_id] = edge
+        self._edges_by_type[type][edge_id] = edge
+        for nid in nodes:
+            self._incidence.setdefault(nid, {})[edge_id] = None
+        self._edge_lookup.setdefault((type, frozenset(nodes)), []).append(edge_id)
+        self._journal.append(-edge_id)
+        self._next_edge_id = edge_id + 1
+
+    @property
+    def version(self) -> int:
+        """Monotonically increasing version; bumped by every add_node/add_edge."""
+        return len(self._journal)
+
+    def _journal_since(self, version: int) -> Sequence[int]:
+        """Journal entries after `version`, in order."""
+        return self._journal[version:]
+
+    def changes_since(self, version: int) -> Tuple[List[int], List[int]]:
+        """Return (new_node_ids, new_edge_ids) added after `version`, in O(delta)."""
+        new_nodes: List[int] = []
+        new_edges: List[int] = []
+        for entry in self._journal_since(version):
+            if entry > 0:
+                new_nodes.append(entry)
+            else:
+                new_edges.append(-entry)
+        return new_nodes, new_edges
+
+    def _incident_ids(self, node_id: int) -> Iterable[int]:
+        return self._incidence.get(node_id, ())
+
+    def _lookup_ids(self, key: Tuple[EdgeType, FrozenSet[int]]) -> Iterable[int]:
+        return self._edge_lookup.get(key, ())
+
+    def _interned_id(self, key: Hashable) -> Optional[int]:
+        """Lowest node id with this intern_key, building the table on first use if needed."""
+        if self._interned is None:
+            # e.g. the parent of a hash-consing fork; kept in sync from here on
+            table: Dict[Hashable, int] = {}
+            for node in self.nodes.values():
+                k = intern_key(node.type, node.attr)
+                if k is not None:
+                    table.setdefault(k, node.id)
+            self._interned = table
+        return self._interned.get(key)
+
+    def _point_index(self) -> SpatialHash:
+        """The POINT index, built from the graph on first use if needed."""
+        if self.points is None:
+            index = SpatialHash()
+            for node in self._nodes_by_type[NodeType.POINT].values():
+                x, y = node.attr.get('x'), node.attr.get('y')
+                if x is not None and y is not None:
+                    index.insert(node.id, x, y)
+            self.points = index  # kept in sync by _insert_node from here on
+        return self.points
+
+    def _find_point(self, x: float, y: float, tol: float) -> Optional[int]:
+        return self._point_index().find(x, y, tol)
+
+    def points_within(self, x: float, y: float, r: float) -> List[int]:
+        """Ids of POINT nodes within distance r of (x, y), ascending."""
+        return self._point_index().within(x, y, r)
+
+    def nearest_points(self, x: float, y: float, k: int = 1) -> List[Tuple[float, int]]:
+        """The k POINT nodes closest to (x, y) as (distance, id), closest first."""
+        return self._point_index().nearest(x, y, k)
+
     def neighbors(self, node_id: int) -> Set[int]:
         nbrs: Set[int] = set()
-        for edge in self.edges.values():
-            if node_id in edge.nodes:
-                nbrs.update(edge.nodes)
+        for edge_id in self._incident_ids(node_id):
+            nbrs.update(self.edges[edge_id].nodes)
         nbrs.discard(node_id)
         return nbrs
 
+    def incident_edges(self, node_id: int) -> List[HEdge]:
+        """Return the edges containing node_id, in insertion order."""
+        return [self.edges[eid] for eid in self._incident_ids(node_id)]
+
+    def degree(self, node_id: int) -> int:
+        """Return the number of edges containing node_id in O(1)."""
+        return len(self._incidence.get(node_id, ()))
+
+    def find_edges(self, type: EdgeType, nodes: Tuple[int, ...]) -> List[HEdge]:
+        """Return edges of the given type spanning exactly this node set (order-insensitive)."""
+        return [self.edges[eid] for eid in self._lookup_ids((type, frozenset(nodes)))]
+
+    def has_edge(self, type: EdgeType, nodes: Tuple[int, ...]) -> bool:
+        """Return True if an edge of the given type spans exactly this node set."""
+        return (type, frozenset(nodes)) in self._edge_lookup
+
     def by_type(self, node_type: Optional[NodeType] = None, edge_type: Optional[EdgeType] = None):
-        nodes = [n for n in self.nodes.values() if node_type is None or n.type == node_type]
-        edges = [e for e in self.edges.values() if edge_type is None or e.type == edge_type]
+        """
+        Return (nodes, edges) matching the given types.
+        Both are read-only live views over the internal indexes (no copying);
+        a type of None selects every node/edge. Take a list() of a view before
+        mutating the graph while iterating it.
+        """
+        nodes = self.nodes.values() if node_type is None else self._nodes_by_type[node_type].values()
+        edges = self.edges.values() if edge_type is None else self._edges_by_type[edge_type].values()
         return nodes, edges
+
+    def count(self, node_type: Optional[NodeType] = None, edge_type: Optional[EdgeType] = None) -> Tuple[int, int]:
+        """Return (node_count, edge_count) for the given types in O(1)."""
+        n = len(self.nodes) if node_type is None else len(self._nodes_by_type[node_type])
+        e = len(self.edges) if edge_type is None else len(self._edges_by_type[edge_type])
+        return n, e
+
+    def fork(self, hash_cons: Optional[bool] = None, point_tolerance: Optional[float] = None) -> "GraphFork":
+        """Return a copy-on-write fork of this graph in O(1); see GraphFork."""
+        return GraphFork(self, hash_cons, point_tolerance)
+
+# Attr keys whose values are node ids (or lists of node ids); remapped on commit
+NODE_REF_KEYS = frozenset({'p1', 'p2', 'center', 'on', 'inscribed_in', 'based_on', 'support'})
+
+class _Overlay(MutableMapping):
+    """
+    Id-keyed mapping layered over a parent mapping. Parent entries with ids
+    below `cutoff` (those present at fork time) show through; writes go to
+    the local dict. Relies on parent dicts being in ascending id order.
+    """
+    __slots__ = ('_base', '_cutoff', '_base_len', 'local')
+
+    def __init__(self, base: MutableMapping, cutoff: int) -> None:
+        self._base = base
+        self._cutoff = cutoff
+        self._base_len = len(base)
+        self.local: Dict[int, Any] = {}
+
+    def __getitem__(self, key: int) -> Any:
+        value = self.local.get(key)
+        if value is not None:
+            return value
+        if key < self._cutoff:
+            return self._base[key]
+        raise KeyError(key)
+
+    def get(self, key: int, default: Any = None) -> Any:
+        value = self.local.get(key)
+        if value is not None:
+            return value
+        return self._base.get(key, default) if key < self._cutoff else default
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.local or (isinstance(key, int) and key < self._cutoff and key in self._base)
+
+    def __setitem__(self, key: int, value: Any) -> None:
+        self.local[key] = value
+
+    def __delitem__(self, key: int) -> None:
+        raise TypeError("graph forks are append-only")
+
+    def __iter__(self) -> Iterator[int]:
+        cutoff = self._cutoff
+        return chain(takewhile(lambda k: k < cutoff, self._base), self.local)
+
+    def __len__(self) -> int:
+        return self._base_len + len(self.local)
+
+class GraphFork(HyperGraph):
+    """
+    Copy-on-write view of a parent graph. Reads see the parent as it was at
+    fork time plus this fork's own additions; additions never touch the
+    parent until commit(). Ids continue from the parent's counters, so if the
+    parent is unchanged at commit time every id is kept; otherwise (e.g. a
+    sibling fork committed first) new ids are allocated and node references
+    in edges and in NODE_REF_KEYS attrs are remapped. Parent attrs must not be
+    mutated in place while a fork is live.
+
+    A fork hash-conses and merges points like its parent unless hash_cons or
+    point_tolerance say otherwise, matching against the parent's nodes from
+    before the fork and its own. Its own points get a local index.
+    """
+
+    def __init__(self, parent: HyperGraph, hash_cons: Optional[bool] = None,
+                 point_tolerance: Optional[float] = None) -> None:
+        self.parent = parent
+        self.hash_cons = parent.hash_cons if hash_cons is None else hash_cons
+        self._interned = {} if self.hash_cons else None
+        self.point_tolerance = parent.point_tolerance if point_tolerance is None else point_tolerance
+        self.points = SpatialHash() if self.point_tolerance is not None else None
+        self.coords = None  # fork points stay plain attrs until commit
+        self.compact_attrs = parent.compact_attrs
+        self._node_cutoff = parent._next_node_id
+        self._edge_cutoff = parent._next_edge_id
+        self._next_node_id = parent._next_node_id
+        self._next_edge_id = parent._next_edge_id
+        self._base_version = parent.version
+        self.nodes = _Overlay(parent.nodes, self._node_cutoff)
+        self.edges = _Overlay(parent.edges, self._edge_cutoff)
+        self._nodes_by_type = {t: _Overlay(d, self._node_cutoff) for t, d in parent._nodes_by_type.items()}
+        self._edges_by_type = {t: _Overlay(d, self._edge_cutoff) for t, d in parent._edges_by_type.items()}
+        # Local-only incidence/lookup; parent entries are read through and cut off
+        self._incidence = {}
+        self._edge_lookup = {}
+        self._journal = array('q')
+        self._closed = False
+
+    def add_node(self, type: NodeType, attr: Optional[Dict[str, Any]] = None) -> int:
+        self._check_open()
+        return super().add_node(type, attr)
+
+    def add_edge(self, type: EdgeType, nodes: Tuple[int, ...], attr: Optional[Dict[str, Any]] = None) -> int:
+        self._check_open()
+        return super().add_edge(type, nodes, attr)
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("graph fork was already committed or discarded")
+
+    @property
+    def version(self) -> int:
+        return self._base_version + len(self._journal)
+
+    def _journal_since(self, version: int) -> Sequence[int]:
+        if version >= self._base_version:
+            return self._journal[version - self._base_version:]
+        # Parent entries up to the fork point, then this fork's own
+        base = array('q', self.parent._journal_since(version))[:self._base_version - version]
+        return base + self._journal
+
+    def _incident_ids(self, node_id: int) -> Iterable[int]:
+        cutoff = self._edge_cutoff
+        base = takewhile(lambda e: e < cutoff, self.parent._incident_ids(node_id)) if node_id < self._node_cutoff else ()
+        return chain(base, self._incidence.get(node_id, ()))
+
+    def _lookup_ids(self, key: Tuple[EdgeType, FrozenSet[int]]) -> Iterable[int]:
+        cutoff = self._edge_cutoff
+        return chain(takewhile(lambda e: e < cutoff, self.parent._lookup_ids(key)), self._edge_lookup.get(key, ()))
+
+    def _interned_id(self, key: Hashable) -> Optional[int]:
+        found = self.parent._interned_id(key)
+        if found is not None and found < self._node_cutoff:
+            return found
+        return self._interned.get(key) if self._interned is not None else None
+
+    def _find_point(self, x: float, y: float, tol: float) -> Optional[int]:
+        cutoff = self._node_cutoff
+        ids = [nid for nid in self.parent.points_within(x, y, tol) if nid < cutoff]
+        local = self._point_index().find(x, y, tol)
+        if local is not None:
+            ids.append(local)
+        if not ids:
+            return None
+        # closest first, then the lowest (oldest) id
+        return min(ids, key=lambda nid: (_distance2(self.nodes[nid].attr, x, y), nid))
+
+    def points_within(self, x: float, y: float, r: float) -> List[int]:
+        cutoff = self._node_cutoff
+        base = [nid for nid in self.parent.points_within(x, y, r) if nid < cutoff]
+        return base + self._point_index().within(x, y, r)
+
+    def nearest_points(self, x: float, y: float, k: int = 1) -> List[Tuple[float, int]]:
+        # parent points added after the fork may crowd out older ones, so ask for more until k remain
+        cutoff = self._node_cutoff
+        want = k
+        while True:
+            found = self.parent.nearest_points(x, y, want)
+            base = [item for item in found if item[1] < cutoff]
+            if len(base) >= k or len(found) < want:
+                break
+            want *= 2
+        return sorted(base + self._point_index().nearest(x, y, k))[:k]
+
+    def _point_index(self) -> SpatialHash:
+        if self.points is None:
+            self.points = SpatialHash()
+            for nid in self.nodes.local:
+                node = self.nodes.local[nid]
+                if node.type == NodeType.POINT:
+                    x, y = node.attr.get('x'), node.attr.get('y')
+                    if x is not None and y is not None:
+                        self.points.insert(nid, x, y)
+        return self.points
+
+    def degree(self, node_id: int) -> int:
+        return sum(1 for _ in self._incident_ids(node_id))
+
+    def has_edge(self, type: EdgeType, nodes: Tuple[int, ...]) -> bool:
+        return next(iter(self._lookup_ids((type, frozenset(nodes)))), None) is not None
+
+    def commit(self) -> Dict[int, int]:
+        """
+        Replay this fork's additions into the parent, in order, in O(changes).
+        Returns the node id map {fork id: parent id} for the added nodes.
+        """
+        self._check_open()
+        self._closed = True
+        parent = self.parent
+        remap = parent._next_node_id != self._node_cutoff
+        node_map: Dict[int, int] = {}
+        for entry in self._journal:
+            if entry > 0:
+                node = self.nodes.local[entry]
+                attr = _remap_attr(node.attr, node_map) if remap else dict(node.attr)
+                node_map[entry] = parent.add_node(node.type, attr)
+            else:
+                edge = self.edges.local[-entry]
+                nodes = tuple(node_map.get(n, n) for n in edge.nodes) if remap else edge.nodes
+                parent.add_edge(edge.type, nodes, _remap_attr(edge.attr, node_map) if remap else dict(edge.attr))
+        return node_map
+
+    def discard(self) -> None:
+        """Drop this fork's additions; the parent is untouched."""
+        self._check_open()
+        self._closed = True
+        self.nodes.local.clear()
+        self.edges.local.clear()
+        self._journal = array('q')
+
+def _distance2(attr: Mapping[str, Any], x: float, y: float) -> float:
+    dx, dy = attr['x'] - x, attr['y'] - y
+    return dx * dx + dy * dy
+
+def _remap_attr(attr: MutableMapping, node_map: Dict[int, int]) -> Dict[str, Any]:
+    out = dict(attr)
+    for key in NODE_REF_KEYS.intersection(out):
+        value = out[key]
+        if isinstance(value, int):
+            out[key] = node_map.get(value, value)
+        elif isinstance(value, (list, tuple)):
+            out[key] = type(value)(node_map.get(v, v) for v in value)
+    return out
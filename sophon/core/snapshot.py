@@ -0,0 +1,486 @@
+"""sophon.core.snapshot
+
+Memory-mapped binary snapshots of SOPHON hypergraphs.
+Motif: Module (core/snapshot)
+Ports: [interface: write_snapshot, open_snapshot, SnapshotGraph]
+Invariants: [id preservation, zero-copy reads, read-only sharing]
+
+A snapshot is one file of fixed-width columnar sections (little-endian):
+node ids/types/attr offsets, POINT coordinates as a float64 (x, y) column,
+edge ids/types/member lists, per-type row indexes for nodes and edges, a
+CSR incidence index, the change journal, a string table holding every
+attr key and string value once, a binary attr blob that refers to it, and
+(for graphs that hash-cons) the intern table: a 64-bit digest of every
+node's intern_key, sorted, with the row it came from.
+
+open_snapshot() maps the file read-only and casts sections to memoryviews
+without parsing anything, so opening costs O(1) regardless of graph size.
+Nodes and edges are decoded on first access; type scans walk the per-type
+row index. Forks that hash-cons look keys up by bisecting the digest
+section and decode only the matching rows (a snapshot written without the
+table, e.g. from a graph that did not hash-cons, is decoded in full on the
+first lookup instead); forks that merge points build their grid from the
+(x, y) column without decoding nodes. Processes mapping the same file
+share its pages. A SnapshotGraph is read-only; fork() it (see GraphFork)
+to keep growing the graph on top of the mapped data.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from .hypergraph import HyperGraph, intern_key
+from .spatial import SpatialHash
+from .types import EdgeType, HEdge, HNode, NodeType
+
+MAGIC = b"SOPHSNP1"
+FORMAT_VERSION = 2  # 2 added the intern sections; version 1 files still open
+
+_SECTIONS = (
+    ("node_ids", "q"), ("node_types", "b"), ("node_attr_off", "q"), ("node_xy", "d"),
+    ("edge_ids", "q"), ("edge_types", "b"), ("edge_nodes_off", "q"), ("edge_nodes", "q"),
+    ("edge_attr_off", "q"), ("node_type_off", "q"), ("node_type_rows", "q"),
+    ("edge_type_off", "q"), ("edge_type_rows", "q"), ("inc_off", "q"), ("inc_rows", "q"),
+    ("journal", "q"), ("str_off", "q"), ("str_blob", "B"), ("attr_blob", "B"),
+    ("intern_hash", "q"), ("intern_rows", "q"),
+)
+_V1_SECTIONS = len(_SECTIONS) - 2
+# magic, then: format version, nodes, edges, next node id, next edge id, strings, flags
+_HEADER = struct.Struct("<8s7Q")
+_HEADER_V1 = struct.Struct("<8s6Q")  # no flags
+_PREFIX = struct.Struct("<8sQ")
+_HAS_INTERN = 1  # flag: the intern sections hold every node's intern_key digest
+_SECTION = struct.Struct("<QQ")  # offset, byte length
+
+# Attr value tags in the attr blob
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _JSON = range(7)
+_COUNT = struct.Struct("<I")
+_ENTRY = struct.Struct("<IB")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+_U32 = struct.Struct("<I")
+
+_NODE_TYPE_BY_VALUE = {t.value: t for t in NodeType}
+_NODE_TYPE_TAG = {t: b"t%d;" % t.value for t in NodeType}
+_EDGE_TYPE_BY_VALUE = {t.value: t for t in EdgeType}
+
+def _is_coord(attr: Mapping[str, Any]) -> bool:
+    return type(attr.get('x')) is float and type(attr.get('y')) is float
+
+def _key_bytes(key: Tuple[Any, ...], out: bytearray) -> bytearray:
+    # Equal keys must encode equally: 1, 1.0 and True are one dict key, so numbers go by value
+    for value in key:
+        tag = _NODE_TYPE_TAG.get(value) if type(value) is NodeType else None
+        if tag is not None:
+            out += tag
+            continue
+        kind = type(value)
+        if kind is float and not value.is_integer():
+            out += b"f" + _F64.pack(value)
+        elif kind is float or kind is int or kind is bool:
+            out += b"i%d;" % value
+        elif kind is tuple:
+            out += b"("
+            _key_bytes(value, out)
+            out += b")"
+        elif kind is str:
+            raw = value.encode("utf-8")
+            out += b"s%d;" % len(raw) + raw
+        else:
+            out += b"r" + repr(value).encode("utf-8") + b";"
+    return out
+
+def key_digest(key: Tuple[Any, ...]) -> int:
+    """Signed 64-bit digest of an intern_key, stable across processes (unlike hash())."""
+    digest = hashlib.blake2b(_key_bytes(key, bytearray()), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+def write_snapshot(graph: HyperGraph, path: str, intern_table: Optional[bool] = None) -> None:
+    """
+    Write graph to path as a snapshot (atomically, via a temporary file).
+    intern_table: write the intern table (a digest per node, about 5 us each);
+        defaults to graph.hash_cons.
+    """
+    if intern_table is None:
+        intern_table = graph.hash_cons
+    strings: Dict[str, int] = {}
+    str_off = array('q', [0])
+    str_blob = bytearray()
+    attr_blob = bytearray()
+
+    def intern(s: str) -> int:
+        idx = strings.get(s)
+        if idx is None:
+            idx = strings[s] = len(strings)
+            str_blob.extend(s.encode("utf-8"))
+            str_off.append(len(str_blob))
+        return idx
+
+    def put_attr(attr: Mapping[str, Any], skip: Tuple[str, ...] = ()) -> None:
+        items = [(k, v) for k, v in attr.items() if k not in skip]
+        attr_blob.extend(_COUNT.pack(len(items)))
+        for key, value in items:
+            kind = type(value)
+            if value is None:
+                attr_blob.extend(_ENTRY.pack(intern(key), _NONE))
+            elif kind is bool:
+                attr_blob.extend(_ENTRY.pack(intern(key), _TRUE if value else _FALSE))
+            elif kind is int and -(1 << 63) <= value < (1 << 63):
+                attr_blob.extend(_ENTRY.pack(intern(key), _INT) + _I64.pack(value))
+            elif kind is float:
+                attr_blob.extend(_ENTRY.pack(intern(key), _FLOAT) + _F64.pack(value))
+            elif kind is str:
+                attr_blob.extend(_ENTRY.pack(intern(key), _STR) + _U32.pack(intern(value)))
+            else:
+                attr_blob.extend(_ENTRY.pack(intern(key), _JSON) + _U32.pack(intern(json.dumps(value))))
+
+    node_ids, node_types, node_attr_off, node_xy = array('q'), array('b'), array('q', [0]), array('d')
+    node_row: Dict[int, int] = {}
+    rows_by_type: List[List[int]] = [[] for _ in NodeType]
+    intern_hash, intern_rows = array('q'), array('q')
+    nan = float("nan")
+    for row, node in enumerate(graph.nodes.values()):
+        node_row[node.id] = row
+        key = intern_key(node.type, node.attr) if intern_table else None
+        if key is not None:
+            intern_hash.append(key_digest(key))
+            intern_rows.append(row)
+        node_ids.append(node.id)
+        node_types.append(node.type.value)
+        rows_by_type[node.type.value - 1].append(row)
+        if _is_coord(node.attr):
+            node_xy.extend((node.attr['x'], node.attr['y']))
+            put_attr(node.attr, ('x', 'y'))
+        else:
+            node_xy.extend((nan, nan))
+            put_attr(node.attr)
+        node_attr_off.append(len(attr_blob))
+
+    edge_ids, edge_types, edge_nodes_off, edge_nodes = array('q'), array('b'), array('q', [0]), array('q')
+    edge_attr_off = array('q', [len(attr_blob)])
+    edge_rows_by_type: List[List[int]] = [[] for _ in EdgeType]
+    incidence: Dict[int, List[int]] = {}
+    for row, edge in enumerate(graph.edges.values()):
+        edge_ids.append(edge.id)
+        edge_types.append(edge.type.value)
+        edge_rows_by_type[edge.type.value - 1].append(row)
+        edge_nodes.extend(edge.nodes)
+        edge_nodes_off.append(len(edge_nodes))
+        for nid in dict.fromkeys(edge.nodes):
+            if nid in node_row:
+                incidence.setdefault(node_row[nid], []).append(row)
+        put_attr(edge.attr)
+        edge_attr_off.append(len(attr_blob))
+
+    def csr(groups: List[List[int]]) -> Tuple[array, array]:
+        off, flat = array('q', [0]), array('q')
+        for group in groups:
+            flat.extend(group)
+            off.append(len(flat))
+        return off, flat
+
+    node_type_off, node_type_rows = csr(rows_by_type)
+    edge_type_off, edge_type_rows = csr(edge_rows_by_type)
+    inc_off, inc_rows = csr([incidence.get(row, []) for row in range(len(node_ids))])
+    journal = array('q', graph._journal_since(0))
+    order = sorted(range(len(intern_hash)), key=intern_hash.__getitem__)  # stable: rows ascend within a digest
+    intern_hash = array('q', [intern_hash[i] for i in order])
+    intern_rows = array('q', [intern_rows[i] for i in order])
+
+    sections = {
+        "node_ids": node_ids, "node_types": node_types, "node_attr_off": node_attr_off, "node_xy": node_xy,
+        "edge_ids": edge_ids, "edge_types": edge_types, "edge_nodes_off": edge_nodes_off,
+        "edge_nodes": edge_nodes, "edge_attr_off": edge_attr_off, "node_type_off": node_type_off,
+        "node_type_rows": node_type_rows, "edge_type_off": edge_type_off, "edge_type_rows": edge_type_rows,
+        "inc_off": inc_off, "inc_rows": inc_rows, "journal": journal, "str_off": str_off,
+        "str_blob": str_blob, "attr_blob": attr_blob, "intern_hash": intern_hash, "intern_rows": intern_rows,
+    }
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(node_ids), len(edge_ids),
+                              graph._next_node_id, graph._next_edge_id, len(strings),
+                              _HAS_INTERN if intern_table else 0))
+        table_at = fh.tell()
+        fh.write(b"\0" * (_SECTION.size * len(_SECTIONS)))
+        table = []
+        for name, _ in _SECTIONS:
+            fh.write(b"\0" * (-fh.tell() % 8))  # 8-byte align every section
+            data = sections[name]
+            raw = data.tobytes() if isinstance(data, array) else bytes(data)
+            table.append((fh.tell(), len(raw)))
+            fh.write(raw)
+        fh.seek(table_at)
+        for offset, length in table:
+            fh.write(_SECTION.pack(offset, length))
+    os.replace(tmp, path)
+
+class _RowMap(Mapping):
+    """Lazy id -> record mapping over snapshot rows (optionally one type's rows only)."""
+
+    def __init__(self, ids: memoryview, decode: Any, rows: Optional[memoryview] = None) -> None:
+        self._ids = ids
+        self._decode = decode
+        self._rows = rows  # None: every row, in id order
+
+    def _row(self, key: Any) -> int:
+        ids = self._ids
+        if not isinstance(key, int):
+            return -1
+        # Ids are usually dense from 1, so try the direct slot before bisecting
+        row = key - 1
+        if not (0 <= row < len(ids) and ids[row] == key):
+            row = bisect_left(ids, key)
+            if row == len(ids) or ids[row] != key:
+                return -1
+        if self._rows is not None:
+            rows = self._rows
+            i = bisect_left(rows, row)
+            if i == len(rows) or rows[i] != row:
+                return -1
+        return row
+
+    def __getitem__(self, key: int) -> Any:
+        row = self._row(key)
+        if row < 0:
+            raise KeyError(key)
+        return self._decode(row)
+
+    def get(self, key: int, default: Any = None) -> Any:
+        row = self._row(key)
+        return default if row < 0 else self._decode(row)
+
+    def __contains__(self, key: object) -> bool:
+        return self._row(key) >= 0
+
+    def __iter__(self) -> Iterator[int]:
+        ids = self._ids
+        if self._rows is None:
+            return iter(ids)
+        return (ids[row] for row in self._rows)
+
+    def __len__(self) -> int:
+        return len(self._ids) if self._rows is None else len(self._rows)
+
+    def values(self) -> "_RowValues":
+        return _RowValues(self)
+
+class _RowValues:
+    """Read-only values view of a _RowMap that decodes rows directly (no id lookups)."""
+    __slots__ = ('_map',)
+
+    def __init__(self, row_map: _RowMap) -> None:
+        self._map = row_map
+
+    def __iter__(self) -> Iterator[Any]:
+        decode = self._map._decode
+        rows = self._map._rows
+        return (decode(row) for row in (range(len(self._map._ids)) if rows is None else rows))
+
+    def __len__(self) -> int:
+        return len(self._map)
+
+class SnapshotGraph(HyperGraph):
+    """Read-only HyperGraph served lazily from a memory-mapped snapshot file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = memoryview(self._mm)
+        magic, fmt = _PREFIX.unpack_from(buf, 0)
+        if magic != MAGIC or fmt not in (1, FORMAT_VERSION):
+            buf.release()
+            self._mm.close()
+            raise ValueError(f"{path} is not a SOPHON snapshot (format {FORMAT_VERSION})")
+        if fmt > 1:
+            header, sections = _HEADER, _SECTIONS
+            _, _, n_nodes, n_edges, next_node, next_edge, n_strings, flags = header.unpack_from(buf, 0)
+        else:
+            header, sections = _HEADER_V1, _SECTIONS[:_V1_SECTIONS]
+            _, _, n_nodes, n_edges, next_node, next_edge, n_strings = header.unpack_from(buf, 0)
+            flags = 0
+        self._views: List[memoryview] = [buf]
+        self._s: Dict[str, memoryview] = {}
+        for i, (name, code) in enumerate(sections):
+            offset, length = _SECTION.unpack_from(buf, header.size + i * _SECTION.size)
+            view = buf[offset:offset + length]
+            self._s[name] = view.cast(code) if code != "B" else view
+            self._views.append(view)
+        self._has_intern = bool(flags & _HAS_INTERN)
+        self._derived: List[memoryview] = []  # views sliced from sections; released first
+        self._strings: List[Optional[str]] = [None] * n_strings
+        self._node_cache: Dict[int, HNode] = {}
+        self._edge_cache: Dict[int, HEdge] = {}
+        self._next_node_id = next_node
+        self._next_edge_id = next_edge
+        self.coords = None
+        self.compact_attrs = False
+        self.hash_cons = False  # read-only; forks may intern on top of it
+        self._interned = None
+        self.point_tolerance = None
+        self.points = None
+        s = self._s
+        self.nodes = _RowMap(s["node_ids"], self._node_at)
+        self.edges = _RowMap(s["edge_ids"], self._edge_at)
+        self._nodes_by_type = {t: _RowMap(s["node_ids"], self._node_at, self._type_rows("node", t.value))
+                               for t in NodeType}
+        self._edges_by_type = {t: _RowMap(s["edge_ids"], self._edge_at, self._type_rows("edge", t.value))
+                               for t in EdgeType}
+        self._journal = s["journal"]
+
+    def _type_rows(self, kind: str, value: int) -> memoryview:
+        off = self._s[f"{kind}_type_off"]
+        rows = self._s[f"{kind}_type_rows"][off[value - 1]:off[value]]
+        self._derived.append(rows)
+        return rows
+
+    def _string(self, idx: int) -> str:
+        s = self._strings[idx]
+        if s is None:
+            off = self._s["str_off"]
+            s = self._strings[idx] = str(self._s["str_blob"][off[idx]:off[idx + 1]], "utf-8")
+        return s
+
+    def _attr(self, pos: int, attr: Dict[str, Any]) -> Dict[str, Any]:
+        blob = self._s["attr_blob"]
+        (count,), pos = _COUNT.unpack_from(blob, pos), pos + _COUNT.size
+        for _ in range(count):
+            key_idx, tag = _ENTRY.unpack_from(blob, pos)
+            pos += _ENTRY.size
+            if tag == _INT:
+                value = _I64.unpack_from(blob, pos)[0]
+                pos += 8
+            elif tag == _FLOAT:
+                value = _F64.unpack_from(blob, pos)[0]
+                pos += 8
+            elif tag == _STR or tag == _JSON:
+                value = self._string(_U32.unpack_from(blob, pos)[0])
+                pos += 4
+                if tag == _JSON:
+                    value = json.loads(value)
+            else:
+                value = None if tag == _NONE else tag == _TRUE
+            attr[self._string(key_idx)] = value
+        return attr
+
+    def _node_at(self, row: int) -> HNode:
+        node = self._node_cache.get(row)
+        if node is None:
+            s = self._s
+            attr: Dict[str, Any] = {}
+            x = s["node_xy"][2 * row]
+            if x == x:  # not NaN: coordinates live in the xy column
+                attr['x'] = x
+                attr['y'] = s["node_xy"][2 * row + 1]
+            node = HNode(id=s["node_ids"][row], type=_NODE_TYPE_BY_VALUE[s["node_types"][row]],
+                         attr=self._attr(s["node_attr_off"][row], attr))
+            self._node_cache[row] = node
+        return node
+
+    def _edge_at(self, row: int) -> HEdge:
+        edge = self._edge_cache.get(row)
+        if edge is None:
+            s = self._s
+            off = s["edge_nodes_off"]
+            edge = HEdge(id=s["edge_ids"][row], type=_EDGE_TYPE_BY_VALUE[s["edge_types"][row]],
+                         nodes=tuple(s["edge_nodes"][off[row]:off[row + 1]]),
+                         attr=self._attr(s["edge_attr_off"][row], {}))
+            self._edge_cache[row] = edge
+        return edge
+
+    def _interned_id(self, key: Any) -> Optional[int]:
+        """Lowest node id with this intern_key: bisect the digest section, decode only its matches."""
+        if not self._has_intern:  # written without the table: build it by decoding every node
+            return super()._interned_id(key)
+        digests, rows = self._s["intern_hash"], self._s["intern_rows"]
+        digest = key_digest(key)
+        i = bisect_left(digests, digest)
+        while i < len(digests) and digests[i] == digest:
+            node = self._node_at(rows[i])  # rows ascend within a digest: the first match is the oldest
+            if intern_key(node.type, node.attr) == key:
+                return node.id
+            i += 1
+        return None
+
+    def _point_index(self) -> SpatialHash:
+        """The POINT index, bulk-built from the (x, y) column; only points without float coords are decoded."""
+        if self.points is None:
+            s = self._s
+            node_ids, xy = s["node_ids"], s["node_xy"].tolist()
+            ids: List[int] = []
+            xs: List[float] = []
+            ys: List[float] = []
+            for row in self._nodes_by_type[NodeType.POINT]._rows:
+                x, y = xy[2 * row], xy[2 * row + 1]
+                if x != x:  # NaN: coordinates are not floats, so they live in the attrs
+                    attr = self._node_at(row).attr
+                    x, y = attr.get('x'), attr.get('y')
+                    if x is None or y is None:
+                        continue
+                ids.append(node_ids[row])
+                xs.append(x)
+                ys.append(y)
+            index = SpatialHash()
+            index.extend(ids, xs, ys)
+            self.points = index
+        return self.points
+
+    def xy(self) -> memoryview:
+        """The (x, y) float64 column as a flat memoryview, two entries per node row (NaN = no coords)."""
+        return self._s["node_xy"]
+
+    def add_node(self, type: NodeType, attr: Optional[Dict[str, Any]] = None) -> int:
+        raise TypeError("snapshot graphs are read-only; fork() to modify")
+
+    def add_edge(self, type: EdgeType, nodes: Tuple[int, ...], attr: Optional[Dict[str, Any]] = None) -> int:
+        raise TypeError("snapshot graphs are read-only; fork() to modify")
+
+    def _incident_ids(self, node_id: int) -> Iterable[int]:
+        row = self.nodes._row(node_id)
+        if row < 0:
+            return ()
+        s = self._s
+        ids = s["edge_ids"]
+        return [ids[r] for r in s["inc_rows"][s["inc_off"][row]:s["inc_off"][row + 1]]]
+
+    def _lookup_ids(self, key: Tuple[EdgeType, FrozenSet[int]]) -> Iterable[int]:
+        type, members = key
+        if not members:
+            return [e.id for e in self._edges_by_type[type].values() if not e.nodes]
+        edges = self.edges
+        return [eid for eid in self._incident_ids(min(members))
+                if edges[eid].type == type and frozenset(edges[eid].nodes) == members]
+
+    def degree(self, node_id: int) -> int:
+        row = self.nodes._row(node_id)
+        off = self._s["inc_off"]
+        return 0 if row < 0 else off[row + 1] - off[row]
+
+    def has_edge(self, type: EdgeType, nodes: Tuple[int, ...]) -> bool:
+        return bool(self._lookup_ids((type, frozenset(nodes))))
+
+    def close(self) -> None:
+        """Release the mapping (decoded nodes/edges stay valid)."""
+        self._journal = array('q')
+        for view in self._derived:
+            view.release()
+        for view in self._s.values():
+            view.release()
+        for view in reversed(self._views):
+            view.release()
+        self._mm.close()
+
+    def __enter__(self) -> "SnapshotGraph":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+def open_snapshot(path: str) -> SnapshotGraph:
+    """Map a snapshot file read-only; O(1) in the graph size."""
+    return SnapshotGraph(path)
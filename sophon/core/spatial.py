@@ -0,0 +1,218 @@
+"""sophon.core.spatial
+
+Uniform-grid spatial hash over POINT coordinates in SOPHON.
+Motif: Module (core/spatial)
+Ports: [interface: SpatialHash]
+Invariants: [exact query results, O(1) expected insert, bounded cell load]
+
+Points are bucketed by floor(x / cell), floor(y / cell). Each occupied cell
+holds one flat array('d') of (x, y, id) triples, so a point costs 24 bytes
+plus its share of the cell. Queries visit only the cells their search box
+overlaps, or every occupied cell when that is fewer:
+
+    find(x, y, tol)      closest point within tol (coincident-point lookup)
+    within(x, y, r)      every point within r
+    nearest(x, y, k)     the k closest points, by expanding rings of cells
+
+When the mean load of occupied cells passes max_load the cell size is halved
+and the points rehashed (amortised O(1) per insert), so clustered
+constructions keep short cells without choosing a cell size up front.
+Results are exact: the grid only prunes candidates, distances are always
+checked. Ties in distance go to the lower id.
+"""
+
+import heapq
+import math
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+Cell = Tuple[int, int]
+
+class SpatialHash:
+    """Uniform-grid index of (id, x, y) points with tolerance, radius and k-nearest queries."""
+
+    def __init__(self, cell: float = 1.0, max_load: float = 8.0, min_cell: float = 1e-9) -> None:
+        """cell: initial cell side; halved (down to min_cell) while occupied cells average over max_load points."""
+        if cell <= 0.0:
+            raise ValueError("cell size must be positive")
+        self.cell = float(cell)
+        self.max_load = max_load
+        self.min_cell = min_cell
+        self._cells: Dict[Cell, array] = {}
+        self._n = 0
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _key(self, x: float, y: float) -> Cell:
+        cell = self.cell
+        return math.floor(x / cell), math.floor(y / cell)
+
+    def insert(self, node_id: int, x: float, y: float) -> None:
+        """Add a point (ids must fit a float64 exactly, i.e. below 2**53)."""
+        key = (math.floor(x / self.cell), math.floor(y / self.cell))
+        bucket = self._cells.get(key)
+        if bucket is None:
+            bucket = self._cells[key] = array('d')
+        bucket.extend((x, y, node_id))
+        self._n += 1
+        if self._n > self.max_load * len(self._cells) and self.cell * 0.5 >= self.min_cell:
+            self._rehash(self.cell * 0.5)
+
+    def extend(self, ids: Sequence[int], xs: Sequence[float], ys: Sequence[float]) -> None:
+        """
+        Add many points at once: the cell size is chosen up front from their
+        count and extent (about max_load / 2 per cell if spread evenly), so a
+        bulk load rehashes at most once instead of on every halving.
+        """
+        n = len(ids)
+        if not n:
+            return
+        width = max(max(xs) - min(xs), max(ys) - min(ys))
+        cell = self.cell
+        if width > 0.0:
+            target = width / math.sqrt(max(1.0, 2.0 * (self._n + n) / self.max_load))
+            while cell > target and cell * 0.5 >= self.min_cell:
+                cell *= 0.5
+        if cell != self.cell:
+            self._rehash(cell)
+        cells = self._cells
+        floor = math.floor
+        for node_id, x, y in zip(ids, xs, ys):
+            key = (floor(x / cell), floor(y / cell))
+            bucket = cells.get(key)
+            if bucket is None:
+                bucket = cells[key] = array('d')
+            bucket.extend((x, y, node_id))
+        self._n += n
+        while self._n > self.max_load * len(self._cells) and self.cell * 0.5 >= self.min_cell:
+            self._rehash(self.cell * 0.5)  # clustered points: keep halving as insert would
+
+    def _rehash(self, cell: float) -> None:
+        old = self._cells
+        self.cell = cell
+        self._cells = {}
+        cells = self._cells
+        floor = math.floor
+        for bucket in old.values():
+            for i in range(0, len(bucket), 3):
+                x, y = bucket[i], bucket[i + 1]
+                key = (floor(x / cell), floor(y / cell))
+                target = cells.get(key)
+                if target is None:
+                    target = cells[key] = array('d')
+                target.extend((x, y, bucket[i + 2]))
+
+    def _buckets(self, x: float, y: float, r: float) -> Iterator[array]:
+        """Buckets of the cells overlapping the box of half-side r around (x, y)."""
+        x0, y0 = self._key(x - r, y - r)
+        x1, y1 = self._key(x + r, y + r)
+        cells = self._cells
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(cells):
+            # a wide box: filter the occupied cells instead of probing empty ones
+            for (cx, cy), bucket in cells.items():
+                if x0 <= cx <= x1 and y0 <= cy <= y1:
+                    yield bucket
+            return
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is not None:
+                    yield bucket
+
+    def find(self, x: float, y: float, tol: float = 0.0) -> Optional[int]:
+        """Id of the closest point within tol of (x, y) (lowest id on ties), or None."""
+        best_id: Optional[int] = None
+        best = tol * tol
+        cell = self.cell
+        key = (math.floor((x - tol) / cell), math.floor((y - tol) / cell))
+        if key == (math.floor((x + tol) / cell), math.floor((y + tol) / cell)):
+            bucket = self._cells.get(key)  # the usual case: tol is far below the cell size
+            buckets: Iterable[array] = () if bucket is None else (bucket,)
+        else:
+            buckets = self._buckets(x, y, tol)
+        for bucket in buckets:
+            for i in range(0, len(bucket), 3):
+                dx = bucket[i] - x
+                dy = bucket[i + 1] - y
+                d2 = dx * dx + dy * dy
+                if d2 <= best:
+                    nid = int(bucket[i + 2])
+                    if d2 < best or best_id is None or nid < best_id:
+                        best, best_id = d2, nid
+        return best_id
+
+    def within(self, x: float, y: float, r: float) -> List[int]:
+        """Ids of all points within distance r of (x, y), in ascending order."""
+        r2 = r * r
+        out = []
+        for bucket in self._buckets(x, y, r):
+            for i in range(0, len(bucket), 3):
+                dx = bucket[i] - x
+                dy = bucket[i + 1] - y
+                if dx * dx + dy * dy <= r2:
+                    out.append(int(bucket[i + 2]))
+        out.sort()
+        return out
+
+    def nearest(self, x: float, y: float, k: int = 1) -> List[Tuple[float, int]]:
+        """
+        The k points closest to (x, y) as (distance, id), closest first.
+        Rings of cells around the query cell are searched outwards until the
+        k-th best distance is inside the searched square; once the rings
+        would cover more cells than are occupied, the rest is a full scan.
+        """
+        if k <= 0 or not self._n:
+            return []
+        cells = self._cells
+        cell = self.cell
+        cx, cy = self._key(x, y)
+        # distance from (x, y) to the nearest edge of its own cell
+        margin = min(x - cx * cell, (cx + 1) * cell - x, y - cy * cell, (cy + 1) * cell - y)
+        heap: List[Tuple[float, int]] = []  # (-d2, -id): the worst kept point on top
+
+        def scan(bucket: array) -> None:
+            for i in range(0, len(bucket), 3):
+                dx = bucket[i] - x
+                dy = bucket[i + 1] - y
+                item = (-(dx * dx + dy * dy), -int(bucket[i + 2]))
+                if len(heap) < k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+
+        ring = 0
+        while True:
+            if (2 * ring + 1) ** 2 > len(cells):
+                heap.clear()
+                for bucket in cells.values():
+                    scan(bucket)
+                break
+            if ring == 0:
+                bucket = cells.get((cx, cy))
+                if bucket is not None:
+                    scan(bucket)
+            else:
+                for key in _ring(cx, cy, ring):
+                    bucket = cells.get(key)
+                    if bucket is not None:
+                        scan(bucket)
+            # every point outside the searched square is farther than this
+            reach = margin + ring * cell
+            if len(heap) == k and -heap[0][0] < reach * reach:
+                break
+            ring += 1
+        return sorted((math.sqrt(-d2), -nid) for d2, nid in heap)
+
+    def nbytes(self) -> int:
+        """Bytes held by the coordinate buckets (excluding dict and key overhead)."""
+        return sum(bucket.buffer_info()[1] * bucket.itemsize for bucket in self._cells.values())
+
+def _ring(cx: int, cy: int, r: int) -> Iterator[Cell]:
+    """Cells at Chebyshev distance exactly r from (cx, cy)."""
+    for dx in range(-r, r + 1):
+        yield cx + dx, cy - r
+        yield cx + dx, cy + r
+    for dy in range(-r + 1, r):
+        yield cx - r, cy + dy
+        yield cx + r, cy + dy
@@ -6,9 +6,10 @@ Ports: [interface: NodeType, EdgeType, constants]
 Invariants: [type safety, extensibility]
 """
 
+import sys
 from enum import Enum, auto
 from dataclasses import dataclass
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Iterator, MutableMapping, Optional, Tuple, Union
 
 class NodeType(Enum):
     POINT = auto()
@@ -35,15 +36,96 @@ class EdgeType(Enum):
     VALUATION = auto()
     PART_OF = auto()
 
+class _KeyTable:
+    """Shared, immutable key layout for AttrMap; tables form a transition tree from the root."""
+    __slots__ = ('keys', 'index', '_next')
+
+    def __init__(self, keys: Tuple[str, ...]) -> None:
+        self.keys = keys
+        self.index: Dict[str, int] = {k: i for i, k in enumerate(keys)}
+        self._next: Dict[str, "_KeyTable"] = {}
+
+    def extend(self, key: str) -> "_KeyTable":
+        table = self._next.get(key)
+        if table is None:
+            table = self._next[key] = _KeyTable(self.keys + (sys.intern(key),))
+        return table
+
+_ROOT_TABLE = _KeyTable(())
+
+class AttrMap(MutableMapping):
+    """
+    Compact attr mapping. Keys live in a _KeyTable shared by every map built with
+    the same keys in the same order (e.g. all LINE nodes share ('p1', 'p2')), and
+    values in a tuple; str values are interned. Mutation is supported but copies
+    the value tuple, so it suits write-once attrs.
+    """
+    __slots__ = ('_table', '_vals')
+
+    def __init__(self, attr: Optional[MutableMapping] = None) -> None:
+        table = _ROOT_TABLE
+        vals = []
+        for key, value in (attr or {}).items():
+            table = table.extend(key)
+            vals.append(sys.intern(value) if type(value) is str else value)
+        self._table = table
+        self._vals = tuple(vals)
+
+    def __getitem__(self, key: str) -> Any:
+        i = self._table.index.get(key)
+        if i is None:
+            raise KeyError(key)
+        return self._vals[i]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        i = self._table.index.get(key)
+        return default if i is None else self._vals[i]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._table.index
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if type(value) is str:
+            value = sys.intern(value)
+        i = self._table.index.get(key)
+        if i is None:
+            self._table = self._table.extend(key)
+            self._vals = self._vals + (value,)
+        else:
+            self._vals = self._vals[:i] + (value,) + self._vals[i + 1:]
+
+    def __delitem__(self, key: str) -> None:
+        i = self._table.index.get(key)
+        if i is None:
+            raise KeyError(key)
+        table = _ROOT_TABLE
+        for k in self._table.keys[:i] + self._table.keys[i + 1:]:
+            table = table.extend(k)
+        self._table = table
+        self._vals = self._vals[:i] + self._vals[i + 1:]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table.keys)
+
+    def __len__(self) -> int:
+        return len(self._vals)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+Attr = Union[Dict[str, Any], MutableMapping]
+
 @dataclass
 class HNode:
+    __slots__ = ('id', 'type', 'attr')
     id: int
     type: NodeType
-    attr: Dict[str, Any]
+    attr: Attr
 
 @dataclass
 class HEdge:
+    __slots__ = ('id', 'type', 'nodes', 'attr')
     id: int
     type: EdgeType
     nodes: Tuple[int, ...]
-    attr: Dict[str, Any]
+    attr: Attr
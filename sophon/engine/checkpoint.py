@@ -0,0 +1,104 @@
+"""sophon.engine.checkpoint
+
+Engine checkpoint and resume for SOPHON.
+Motif: Module (engine/checkpoint)
+Ports: [interface: save_checkpoint, load_checkpoint]
+Invariants: [bit-identical continuation, crash safety]
+
+A checkpoint is a directory holding the graph as a memory-mapped snapshot
+(graph-<step>.snap, see sophon.core.snapshot) and the engine's learning
+state as state.json: energy/mass, step count, op history, the novelty
+trackers of seen applications and propositions, and the RNG state. The
+snapshot is written first and state.json is replaced atomically afterwards,
+so a crash mid-checkpoint leaves the previous checkpoint intact; older
+snapshots are removed once the new state is in place.
+
+Resuming maps the snapshot and continues on a fork of it, so it costs
+O(state.json) rather than O(graph), and the resumed engine takes exactly
+the steps the original would have taken. With hash_cons the snapshot also
+carries the intern table, so lookups after resume decode only matching
+nodes; with point_tolerance the first merge builds the point grid from the
+snapshot's coordinate column, O(points) but without decoding nodes.
+"""
+
+import json
+import os
+from collections import deque
+from typing import Any, Dict
+
+from sophon.core.snapshot import open_snapshot, write_snapshot
+from sophon.engine.novelty import tracker_from_state
+
+FORMAT = 2
+STATE_FILE = "state.json"
+
+def _rng_state(engine: Any) -> Any:
+    version, internal, gauss_next = engine.rng.getstate()
+    return [version, list(internal), gauss_next]
+
+def save_checkpoint(engine: Any, path: str) -> str:
+    """Write engine's graph and state under directory path; return the state file path."""
+    os.makedirs(path, exist_ok=True)
+    graph_file = f"graph-{engine.step_count:012d}.snap"
+    write_snapshot(engine.graph, os.path.join(path, graph_file))
+    state: Dict[str, Any] = {
+        "format": FORMAT,
+        "graph": graph_file,
+        "graph_version": engine.graph.version,
+        "step_count": engine.step_count,
+        "E": engine.E,
+        "m": engine.m,
+        "op_counts": engine.op_counts,
+        "recent_ops": list(engine.recent_ops),
+        "recent_window": engine.recent_ops.maxlen,
+        "seen_applications": engine.seen_applications.state(),
+        "seen_props": engine.seen_props.state(),
+        "unique_props_total": engine.unique_props_total,
+        "rng_state": _rng_state(engine),
+    }
+    extra = engine.checkpoint_state()
+    if extra:
+        state["extra"] = extra
+    state_path = os.path.join(path, STATE_FILE)
+    tmp = state_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(state, fh)
+    os.replace(tmp, state_path)
+    for name in os.listdir(path):
+        if name.startswith("graph-") and name.endswith(".snap") and name != graph_file:
+            try:
+                os.remove(os.path.join(path, name))
+            except OSError:  # e.g. still mapped on platforms that forbid it
+                pass
+    return state_path
+
+def load_checkpoint(engine: Any, path: str) -> None:
+    """
+    Restore engine's graph and state from a checkpoint directory written by save_checkpoint.
+    Opening is O(1) in the graph size. Costs deferred to the resumed run: with
+    hash_cons, a snapshot saved without the intern table (by an engine that
+    did not hash-cons) decodes every node on the first add_node; with
+    point_tolerance, the first point added builds the grid from the
+    coordinate column (about 2 us per point).
+    """
+    with open(os.path.join(path, STATE_FILE), "r", encoding="utf-8") as fh:
+        state = json.load(fh)
+    if state.get("format") != FORMAT:
+        raise ValueError(f"unsupported checkpoint format: {state.get('format')}")
+    snapshot = open_snapshot(os.path.join(path, state["graph"]))
+    if snapshot.version != state["graph_version"]:
+        raise ValueError("checkpoint graph does not match its state file")
+    engine.graph = snapshot.fork(hash_cons=engine.graph.hash_cons,
+                                 point_tolerance=engine.graph.point_tolerance)
+    engine.step_count = state["step_count"]
+    engine.E = state["E"]
+    engine.m = state["m"]
+    engine.op_counts = dict(state["op_counts"])
+    engine.recent_ops = deque(state["recent_ops"], maxlen=state["recent_window"])
+    engine.seen_applications = tracker_from_state(state["seen_applications"])
+    engine.seen_props = tracker_from_state(state["seen_props"])
+    engine.unique_props_total = state["unique_props_total"]
+    version, internal, gauss_next = state["rng_state"]
+    engine.rng.setstate((version, tuple(internal), gauss_next))
+    engine.restore_state(state.get("extra", {}))
+    engine._last_summary = {}
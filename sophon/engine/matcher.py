@@ -0,0 +1,96 @@
+"""sophon.engine.matcher
+
+Incremental candidate matching for SOPHON ops.
+Motif: Module (engine/matcher)
+Ports: [interface: CandidateIndex]
+Invariants: [equivalence with precond, O(delta) maintenance]
+
+A small Rete-style match network over typed node patterns. Every op that
+declares `pattern` gets one alpha memory per node type in the pattern: the
+ids of nodes of that type that pass `op.accepts`. Memories are filled once
+from the type index and then maintained from the graph's change journal, so
+per-step work follows the nodes added since the last refresh, not the total
+graph size. Input tuples are joined lazily from the memories by `op.combine`.
+
+Node attrs are treated as write-once (ops only add nodes); call `recheck`
+for nodes whose attrs were changed in place, and `retire` to stop offering
+nodes to a single-position op.
+"""
+
+from bisect import insort
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sophon.core.hypergraph import HyperGraph
+from sophon.core.types import NodeType
+from sophon.ops.registry import Op
+
+class CandidateIndex:
+    """Per-op alpha memories over a HyperGraph, kept in sync with its change journal."""
+
+    def __init__(self, graph: HyperGraph) -> None:
+        self.graph = graph
+        self._version = graph.version
+        self._ops: Dict[str, Op] = {}
+        self._memories: Dict[str, Dict[NodeType, List[int]]] = {}
+        self._subscribers: Dict[NodeType, List[Op]] = {}
+
+    def supports(self, op: Op) -> bool:
+        return op.pattern is not None
+
+    def register(self, op: Op) -> None:
+        """Build op's alpha memories with one scan of its pattern types."""
+        if op.name in self._ops:
+            return
+        self.refresh()
+        self._ops[op.name] = op
+        memories: Dict[NodeType, List[int]] = {}
+        for t in dict.fromkeys(op.pattern or ()):
+            memories[t] = [n.id for n in self.graph.by_type(t)[0] if op.accepts(self.graph, n)]
+            self._subscribers.setdefault(t, []).append(op)
+        self._memories[op.name] = memories
+
+    def refresh(self) -> None:
+        """Feed nodes added since the last refresh through the alpha tests."""
+        if self._version == self.graph.version:
+            return
+        new_nodes, _ = self.graph.changes_since(self._version)
+        self._version = self.graph.version
+        for nid in new_nodes:
+            node = self.graph.nodes[nid]
+            for op in self._subscribers.get(node.type, ()):
+                if op.accepts(self.graph, node):
+                    self._memories[op.name][node.type].append(nid)
+
+    def recheck(self, node_id: int) -> None:
+        """Re-run the alpha tests for a node whose attrs changed in place."""
+        node = self.graph.nodes[node_id]
+        for op in self._subscribers.get(node.type, ()):
+            memory = self._memories[op.name][node.type]
+            ok = op.accepts(self.graph, node)
+            if ok and node_id not in memory:
+                insort(memory, node_id)  # memories stay in ascending id order
+            elif not ok and node_id in memory:
+                memory.remove(node_id)
+
+    def retire(self, op: Op, node_ids: Iterable[int]) -> None:
+        """
+        Drop node_ids from the memory of op's single-position pattern, for
+        inputs that should not be offered again (already applied). Not to be
+        called while a stream from inputs(op) is being consumed.
+        """
+        pattern = op.pattern or ()
+        if len(pattern) != 1 or op.name not in self._memories:
+            return
+        gone = set(node_ids)
+        memory = self._memories[op.name][pattern[0]]
+        memory[:] = [nid for nid in memory if nid not in gone]
+
+    def memory(self, op: Op, node_type: NodeType) -> List[int]:
+        """Return the accepted node ids of node_type for op (live list, do not mutate)."""
+        self.register(op)
+        return self._memories[op.name][node_type]
+
+    def inputs(self, op: Op, rng: Optional[Any] = None) -> Iterable[Tuple[int, ...]]:
+        """Lazily yield op's valid input tuples from its up-to-date memories."""
+        self.register(op)
+        self.refresh()
+        return op.combine(self.graph, self._memories[op.name], rng)
@@ -0,0 +1,324 @@
+"""sophon.engine.metrics
+
+Buffered metrics sinks and interval reporting for SOPHON runs.
+Motif: Module (engine/metrics)
+Ports: [interface: JSONLSink, CSVSink, ColumnarSink, SocketSink, LogSink, MetricsReporter, open_sink]
+Invariants: [buffered I/O, non-blocking export, bounded buffers]
+
+A MetricsReporter turns the engine's step summary into one flat row every
+`every` steps and hands it to its sinks. Sinks buffer rows and write them a
+batch at a time:
+
+- JSONLSink: one compact JSON object per line (dashboards can tail it).
+- CSVSink: header from the first row (or given fields), then rows.
+- ColumnarSink: {column: [values]} kept in memory and written on close
+  (.npz with numpy, else JSON), like sophon.engine.sweep.write_columns.
+- SocketSink: JSON lines to tcp://host:port or unix:///path. Neither
+  connecting nor sending blocks the run: the connect is started without
+  waiting and polled on later writes, unsent bytes queue up to max_pending,
+  and batches beyond that are dropped and counted.
+- LogSink: one key=value line per row through logging.
+
+open_sink(spec) picks a sink from a path or URL.
+"""
+
+import csv
+import errno
+import json
+import logging
+import os
+import select
+import socket
+import time
+from typing import Any, Dict, List, Optional, Sequence, TextIO, Tuple
+
+from sophon.engine.sweep import SUMMARY_FIELDS, summary_row, write_columns
+
+_encode = json.JSONEncoder(separators=(",", ":"), check_circular=False, default=str).encode
+
+class MetricsSink:
+    """Buffers rows and writes them batch_size at a time; subclasses implement _write."""
+
+    def __init__(self, batch_size: int = 256) -> None:
+        self.batch_size = batch_size
+        self._buffer: List[Dict[str, Any]] = []
+
+    def emit(self, row: Dict[str, Any]) -> None:
+        self._buffer.append(row)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered rows."""
+        if self._buffer:
+            self._write(self._buffer)
+            self._buffer = []
+
+    def _write(self, rows: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "MetricsSink":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+class JSONLSink(MetricsSink):
+    """Appends one JSON object per row to a text file."""
+
+    def __init__(self, path: str, batch_size: int = 256) -> None:
+        super().__init__(batch_size)
+        self.path = path
+        self._fh: TextIO = open(path, "a", encoding="utf-8")
+
+    def _write(self, rows: List[Dict[str, Any]]) -> None:
+        self._fh.write("".join(_encode(row) + "\n" for row in rows))
+        self._fh.flush()
+
+    def close(self) -> None:
+        super().close()
+        self._fh.close()
+
+class CSVSink(MetricsSink):
+    """CSV rows with a fixed header (fields, or the keys of the first row); extra keys are ignored."""
+
+    def __init__(self, path: str, fields: Optional[Sequence[str]] = None, batch_size: int = 256) -> None:
+        super().__init__(batch_size)
+        self.path = path
+        self.fields = list(fields) if fields is not None else None
+        self._fh: TextIO = open(path, "w", encoding="utf-8", newline="")
+        self._writer: Optional[csv.DictWriter] = None
+
+    def _write(self, rows: List[Dict[str, Any]]) -> None:
+        if self._writer is None:
+            self._writer = csv.DictWriter(self._fh, self.fields or list(rows[0]), extrasaction="ignore")
+            self._writer.writeheader()
+        self._writer.writerows(rows)
+        self._fh.flush()
+
+    def close(self) -> None:
+        super().close()
+        self._fh.close()
+
+class ColumnarSink(MetricsSink):
+    """Collects the scalar fields of rows as columns and writes them once, on close (.npz or JSON)."""
+
+    def __init__(self, path: str) -> None:
+        super().__init__(batch_size=1 << 30)
+        self.path = path
+        self.columns: Dict[str, List[Any]] = {}
+        self._rows = 0
+
+    def _write(self, rows: List[Dict[str, Any]]) -> None:
+        columns = self.columns
+        for row in rows:
+            for key, value in row.items():
+                if key not in columns and not isinstance(value, (list, tuple, dict)):
+                    columns[key] = [None] * self._rows
+            for key, values in columns.items():
+                values.append(row.get(key))
+            self._rows += 1
+
+    def close(self) -> None:
+        super().close()
+        write_columns(self.columns, self.path)
+
+class SocketSink(MetricsSink):
+    """
+    JSON lines over a TCP or Unix stream socket, sent without blocking.
+    Connecting is non-blocking too: rows queue while the connect is in
+    flight, which is given up after connect_timeout_s. If the peer cannot be
+    reached or goes away, rows are dropped (counted in `dropped`) and
+    reconnecting is retried at most every retry_s seconds. Only the first
+    connect resolves a TCP host name, which may block on DNS; numeric
+    addresses never do.
+    """
+
+    def __init__(self, address: str, batch_size: int = 64, max_pending: int = 1 << 20,
+                 retry_s: float = 5.0, connect_timeout_s: float = 1.0) -> None:
+        super().__init__(batch_size)
+        self.address = address
+        self.max_pending = max_pending
+        self.retry_s = retry_s
+        self.connect_timeout_s = connect_timeout_s
+        self._retry_at = 0.0
+        self._connect_deadline = 0.0
+        self.dropped = 0
+        self._sock: Optional[socket.socket] = None
+        self._connected = False
+        self._target: Optional[Tuple[int, Any]] = None  # (family, sockaddr), resolved once
+        self._pending = bytearray()
+        self._warned = False
+
+    def _resolve(self) -> Tuple[int, Any]:
+        if self._target is None:
+            if self.address.startswith("unix://"):
+                self._target = (socket.AF_UNIX, self.address[len("unix://"):])
+            else:
+                host, _, port = self.address[len("tcp://"):].rpartition(":")
+                family, _, _, _, sockaddr = socket.getaddrinfo(host or "localhost", int(port),
+                                                               type=socket.SOCK_STREAM)[0]
+                self._target = (family, sockaddr)
+        return self._target
+
+    def _connect(self) -> None:
+        """Start a non-blocking connect; _poll_connect completes it on later writes."""
+        sock = None
+        try:
+            family, sockaddr = self._resolve()
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            err = sock.connect_ex(sockaddr)
+            in_flight = (errno.EINPROGRESS,) if family == socket.AF_UNIX else (errno.EINPROGRESS, errno.EWOULDBLOCK)
+            if err and err not in in_flight:
+                raise OSError(err, os.strerror(err))
+        except OSError as exc:
+            if sock is not None:
+                sock.close()
+            self._fail(exc)
+            return
+        self._sock = sock
+        self._connected = not err
+        self._connect_deadline = time.monotonic() + self.connect_timeout_s
+
+    def _poll_connect(self, timeout: float = 0.0) -> bool:
+        """True once the connect in flight has succeeded; gives it up on error or after connect_timeout_s."""
+        _, writable, _ = select.select([], [self._sock], [], timeout)
+        if writable:
+            err = self._sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+            if not err:
+                self._connected = True
+                return True
+            self._fail(OSError(err, os.strerror(err)))
+        elif time.monotonic() >= self._connect_deadline:
+            self._fail(TimeoutError(f"connect timed out after {self.connect_timeout_s} s"))
+        return False
+
+    def _fail(self, exc: OSError) -> None:
+        """Drop the socket and the queued rows; retry after retry_s."""
+        if not self._warned:
+            logging.getLogger(__name__).warning("metrics socket %s unavailable: %s", self.address, exc)
+            self._warned = True
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        self._connected = False
+        self._retry_at = time.monotonic() + self.retry_s
+        self._drop_pending()  # a new connection must not start mid-line
+
+    def _write(self, rows: List[Dict[str, Any]]) -> None:
+        data = "".join(_encode(row) + "\n" for row in rows).encode()
+        if len(self._pending) + len(data) > self.max_pending:
+            self.dropped += len(rows)
+        else:
+            self._pending += data
+        self._send()
+
+    def _send(self) -> None:
+        if self._sock is None:
+            if time.monotonic() >= self._retry_at:
+                self._connect()
+            if self._sock is None:
+                self._drop_pending()
+                return
+        if not self._connected and not self._poll_connect():
+            return  # still connecting (rows stay queued) or given up (rows dropped)
+        try:
+            while self._pending:
+                sent = self._sock.send(self._pending)
+                del self._pending[:sent]
+        except BlockingIOError:
+            pass  # the reader is behind; keep the rest queued
+        except OSError as exc:
+            self._fail(exc)
+
+    def _drop_pending(self) -> None:
+        self.dropped += self._pending.count(b"\n")
+        self._pending.clear()
+
+    def close(self) -> None:
+        super().close()
+        if self._sock is not None and not self._connected:
+            # off the hot loop: wait out the rest of the connect timeout
+            self._poll_connect(max(0.0, self._connect_deadline - time.monotonic()))
+        if self._sock is not None:
+            if self._pending:
+                self._sock.setblocking(True)
+                self._sock.settimeout(1.0)
+                try:
+                    self._sock.sendall(self._pending)
+                except OSError:
+                    pass
+            self._sock.close()
+            self._sock = None
+            self._connected = False
+
+class LogSink(MetricsSink):
+    """One `key=value ...` INFO line per row; rows are only formatted when the level is enabled."""
+
+    def __init__(self, logger: logging.Logger, fields: Optional[Sequence[str]] = None) -> None:
+        super().__init__(batch_size=1)
+        self.logger = logger
+        self.fields = fields
+
+    def _write(self, rows: List[Dict[str, Any]]) -> None:
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        for row in rows:
+            keys = self.fields or row.keys()
+            self.logger.info(" ".join(f"{k}={_fmt(row.get(k))}" for k in keys))
+
+def _fmt(value: Any) -> str:
+    return f"{value:.3f}" if isinstance(value, float) else str(value)
+
+class MetricsReporter:
+    """Emits one row per `every` engine steps to every sink."""
+
+    def __init__(self, sinks: Sequence[MetricsSink], every: int = 1) -> None:
+        self.sinks = list(sinks)
+        self.every = max(1, every)
+
+    def report(self, engine: Any, force: bool = False) -> Optional[Dict[str, Any]]:
+        """Call after engine.step(); return the emitted row, if this step is reported."""
+        if not self.sinks or (not force and engine.step_count % self.every):
+            return None
+        row = metrics_row(engine)
+        for sink in self.sinks:
+            sink.emit(row)
+        return row
+
+    def flush(self) -> None:
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            sink.close()
+
+def metrics_row(engine: Any) -> Dict[str, Any]:
+    """summary_row() plus the detail fields present in a "full" summary."""
+    row = summary_row(engine)
+    row["step"] = engine.step_count
+    summary = engine.get_last_summary()
+    for key in ("topk", "chosen_ops"):
+        if key in summary:
+            row[key] = summary[key]
+    return row
+
+def open_sink(spec: str, batch_size: int = 256) -> MetricsSink:
+    """
+    Sink for spec: tcp://host:port or unix:///path → SocketSink, *.csv →
+    CSVSink (fixed SUMMARY_FIELDS header), *.npz or *.columns.json →
+    ColumnarSink, anything else → JSONLSink.
+    """
+    if spec.startswith(("tcp://", "unix://")):
+        return SocketSink(spec)
+    if spec.endswith(".csv"):
+        return CSVSink(spec, fields=list(SUMMARY_FIELDS) + ["reward_n", "reward_sum", "nodes", "edges"],
+                       batch_size=batch_size)
+    if spec.endswith((".npz", ".columns.json")):
+        return ColumnarSink(spec)
+    return JSONLSink(spec, batch_size)
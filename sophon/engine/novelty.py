@@ -0,0 +1,256 @@
+"""sophon.engine.novelty
+
+Novelty tracking (seen applications / propositions) for the SOPHON engine.
+Motif: Module (engine/novelty)
+Ports: [interface: SetTracker, HashTracker, BloomTracker, make_tracker, tracker_from_state]
+Invariants: [no false negatives, bounded memory, stable across processes]
+
+All trackers answer `key in tracker` and `tracker.add(key)` for hashable keys
+such as (op_name, inputs) tuples or node ids:
+
+- SetTracker: a plain Python set of the keys (exact, ~150 B per application).
+- HashTracker: 64-bit fingerprints in an open-addressing array('Q') table
+  (~12-24 B per key; false positives only on a 64-bit collision).
+- BloomTracker: a scalable Bloom filter (stages of doubling capacity with
+  geometrically tightening error rates, overall rate <= error_rate) that
+  stops growing at max_bytes and from then on trades accuracy for memory.
+
+Fingerprints come from BLAKE2b over repr(key), not hash(), so tracker state
+survives a checkpoint into another process.
+"""
+
+import base64
+import hashlib
+import math
+from array import array
+from typing import Any, Dict, Hashable, List, Optional
+
+def _fingerprint(key: Hashable) -> bytes:
+    return hashlib.blake2b(repr(key).encode(), digest_size=16).digest()
+
+def _tuplify(value: Any) -> Any:
+    return tuple(_tuplify(v) for v in value) if isinstance(value, list) else value
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+class SetTracker:
+    """Exact tracker holding the keys themselves."""
+    kind = "set"
+
+    def __init__(self) -> None:
+        self._items: set = set()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def add(self, key: Hashable) -> bool:
+        """Add key; return True if it was not seen before."""
+        if key in self._items:
+            return False
+        self._items.add(key)
+        return True
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def state(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "items": sorted(self._items, key=repr)}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "SetTracker":
+        tracker = cls()
+        tracker._items = {_tuplify(item) for item in state["items"]}
+        return tracker
+
+class HashTracker:
+    """Exact-in-practice tracker of 64-bit key fingerprints (linear probing, load <= 0.7)."""
+    kind = "exact"
+
+    def __init__(self, capacity: int = 1024) -> None:
+        size = 1 << max(4, math.ceil(math.log2(capacity / 0.7)))
+        self._slots = array('Q', bytes(8 * size))  # 0 marks an empty slot
+        self._mask = size - 1
+        self._count = 0
+
+    @staticmethod
+    def _hash(key: Hashable) -> int:
+        return int.from_bytes(_fingerprint(key)[:8], "little") or 1
+
+    def _find(self, fp: int) -> int:
+        """Slot holding fp, or the empty slot where it would go."""
+        slots, mask = self._slots, self._mask
+        i = fp & mask
+        while True:
+            value = slots[i]
+            if value == fp or value == 0:
+                return i
+            i = (i + 1) & mask
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._slots[self._find(self._hash(key))] != 0
+
+    def add(self, key: Hashable) -> bool:
+        """Add key; return True if it was not seen before."""
+        fp = self._hash(key)
+        i = self._find(fp)
+        if self._slots[i]:
+            return False
+        self._slots[i] = fp
+        self._count += 1
+        if self._count > 0.7 * len(self._slots):
+            self._grow()
+        return True
+
+    def _grow(self) -> None:
+        old = self._slots
+        self._slots = array('Q', bytes(16 * len(old)))
+        self._mask = len(self._slots) - 1
+        for fp in old:
+            if fp:
+                self._slots[self._find(fp)] = fp
+
+    def __len__(self) -> int:
+        return self._count
+
+    def nbytes(self) -> int:
+        return len(self._slots) * 8
+
+    def state(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "count": self._count, "slots": _b64(self._slots.tobytes())}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "HashTracker":
+        tracker = cls()
+        tracker._slots = array('Q', base64.b64decode(state["slots"]))
+        tracker._mask = len(tracker._slots) - 1
+        tracker._count = state["count"]
+        return tracker
+
+class _BloomStage:
+    """One fixed-size Bloom filter sized for `capacity` keys at error rate p."""
+    __slots__ = ('capacity', 'error_rate', 'k', 'm', 'bits', 'count')
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.m = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.k = max(1, round(self.m / capacity * math.log(2)))
+        self.bits = bytearray((self.m + 7) // 8)
+        self.count = 0
+
+    def __contains__(self, hashes: Any) -> bool:
+        # Kirsch-Mitzenmacher double hashing: probe i is (h1 + i * h2) mod m
+        bits, m = self.bits, self.m
+        p, step = hashes[0] % m, hashes[1] % m
+        for _ in range(self.k):
+            if not bits[p >> 3] & (1 << (p & 7)):
+                return False
+            p += step
+            if p >= m:
+                p -= m
+        return True
+
+    def add(self, hashes: Any) -> None:
+        bits, m = self.bits, self.m
+        p, step = hashes[0] % m, hashes[1] % m
+        for _ in range(self.k):
+            bits[p >> 3] |= 1 << (p & 7)
+            p += step
+            if p >= m:
+                p -= m
+        self.count += 1
+
+class BloomTracker:
+    """
+    Scalable Bloom filter: approximate membership with no false negatives.
+    Stage i holds initial_capacity * 2**i keys at error_rate * (1 - r) * r**i
+    (r = 0.5), so the compound false-positive rate stays <= error_rate while
+    the filter grows. Once another stage would exceed max_bytes, new keys go
+    into the last stage and its false-positive rate rises past its target.
+    """
+    kind = "bloom"
+    _RATIO = 0.5
+
+    def __init__(self, error_rate: float = 1e-3, initial_capacity: int = 4096,
+                 max_bytes: Optional[int] = 16 << 20) -> None:
+        self.error_rate = error_rate
+        self.initial_capacity = initial_capacity
+        self.max_bytes = max_bytes
+        self._stages: List[_BloomStage] = []
+        self._count = 0
+        self._add_stage()
+
+    def _add_stage(self) -> bool:
+        i = len(self._stages)
+        stage = _BloomStage(self.initial_capacity << i, self.error_rate * (1 - self._RATIO) * self._RATIO ** i)
+        if self._stages and self.max_bytes is not None and self.nbytes() + len(stage.bits) > self.max_bytes:
+            return False
+        self._stages.append(stage)
+        return True
+
+    @staticmethod
+    def _hashes(key: Hashable) -> Any:
+        digest = _fingerprint(key)
+        return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+    def __contains__(self, key: Hashable) -> bool:
+        hashes = self._hashes(key)
+        return any(hashes in stage for stage in self._stages)
+
+    def add(self, key: Hashable) -> bool:
+        """Add key; return True if it was (probably) not seen before."""
+        hashes = self._hashes(key)
+        if any(hashes in stage for stage in self._stages):
+            return False
+        stage = self._stages[-1]
+        if stage.count >= stage.capacity and self._add_stage():
+            stage = self._stages[-1]
+        stage.add(hashes)
+        self._count += 1
+        return True
+
+    def __len__(self) -> int:
+        return self._count
+
+    def nbytes(self) -> int:
+        return sum(len(s.bits) for s in self._stages)
+
+    def estimated_error_rate(self) -> float:
+        """Current compound false-positive probability, from each stage's fill."""
+        miss = 1.0
+        for s in self._stages:
+            miss *= 1.0 - (1.0 - math.exp(-s.k * s.count / s.m)) ** s.k
+        return 1.0 - miss
+
+    def state(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind, "error_rate": self.error_rate, "initial_capacity": self.initial_capacity,
+            "max_bytes": self.max_bytes, "count": self._count,
+            "stages": [{"count": s.count, "bits": _b64(bytes(s.bits))} for s in self._stages],
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "BloomTracker":
+        tracker = cls(state["error_rate"], state["initial_capacity"], state["max_bytes"])
+        tracker._stages = []
+        for i, saved in enumerate(state["stages"]):
+            stage = _BloomStage(tracker.initial_capacity << i,
+                                tracker.error_rate * (1 - cls._RATIO) * cls._RATIO ** i)
+            stage.bits = bytearray(base64.b64decode(saved["bits"]))
+            stage.count = saved["count"]
+            tracker._stages.append(stage)
+        tracker._count = state["count"]
+        return tracker
+
+_TRACKERS = {cls.kind: cls for cls in (SetTracker, HashTracker, BloomTracker)}
+
+def make_tracker(kind: str = "set", **kwargs: Any) -> Any:
+    """Build a tracker by kind: "set", "exact" (HashTracker) or "bloom" (BloomTracker)."""
+    if kind not in _TRACKERS:
+        raise ValueError(f"unknown novelty tracker: {kind}")
+    return _TRACKERS[kind](**kwargs)
+
+def tracker_from_state(state: Dict[str, Any]) -> Any:
+    """Rebuild a tracker from its state() dict."""
+    return _TRACKERS[state["kind"]].from_state(state)
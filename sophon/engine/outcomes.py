@@ -0,0 +1,173 @@
+"""sophon.engine.outcomes
+
+Learned per-op outcome statistics for SOPHON scoring.
+Motif: Module (engine/outcomes)
+Ports: [interface: OutcomeStats, signature]
+Invariants: [O(1) update, flat storage, reproducible sampling]
+
+Applications are grouped by (op name, input signature), where the signature
+is the tuple of input node types (the op's pattern when it declares one).
+Each group owns one slot in parallel flat float arrays:
+
+    visits     applications seen
+    successes  applications whose invariants held
+    mean, m2   running reward mean and sum of squared deviations (Welford)
+
+From a slot the engine reads:
+
+    success_rate   posterior mean of Beta(1 + successes, 1 + failures)
+    success_bound  success_rate plus its confidence width, uncapped so
+                   that every op's optimism shrinks alike with visits
+    value          success_rate times a UCB on the reward mean (or a
+                   Thompson draw from its normal posterior), scaled by
+                   the largest reward seen; an op whose invariants keep
+                   failing has little value however much reward its
+                   partial outputs earned
+
+All three have NumPy batch forms over a slot array.
+"""
+
+import math
+from array import array
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency; only the *_batch methods need it
+    np = None
+
+def signature(op: Any, inputs: Tuple[Any, ...], graph: Any) -> Tuple[Any, ...]:
+    """Input node types of an application (op.pattern for pattern ops)."""
+    if op.pattern is not None:
+        return op.pattern
+    nodes = graph.nodes
+    return tuple(getattr(nodes.get(i), "type", None) if isinstance(i, int) else type(i).__name__ for i in inputs)
+
+class OutcomeStats:
+    """Outcome counts and reward moments per (op, signature) slot."""
+
+    def __init__(self, c: float = 0.5) -> None:
+        """c: width of the confidence bounds (0 = greedy on the means)."""
+        self.c = c
+        self.index: Dict[Hashable, int] = {}
+        self.keys: List[Hashable] = []
+        self.visits = array('d')
+        self.successes = array('d')
+        self.mean = array('d')
+        self.m2 = array('d')
+        self.total = 0
+        self.reward_max = 0.0
+        self._tables_key: Any = None
+        self._tables_cache: Any = None
+
+    def slot(self, key: Hashable) -> int:
+        """Slot for key, allocating a fresh one on first sight."""
+        i = self.index.get(key)
+        if i is None:
+            i = self.index[key] = len(self.keys)
+            self.keys.append(key)
+            for column in (self.visits, self.successes, self.mean, self.m2):
+                column.append(0.0)
+        return i
+
+    def update(self, i: int, ok: bool, reward: float) -> None:
+        """Record one application outcome in slot i."""
+        n = self.visits[i] + 1.0
+        self.visits[i] = n
+        if ok:
+            self.successes[i] += 1.0
+        delta = reward - self.mean[i]
+        self.mean[i] += delta / n
+        self.m2[i] += delta * (reward - self.mean[i])
+        self.total += 1
+        if reward > self.reward_max:
+            self.reward_max = reward
+
+    def _width(self, n: float) -> float:
+        return self.c * math.sqrt(math.log(self.total + 1.0) / (n + 1.0))
+
+    def success_rate(self, i: int) -> float:
+        return (self.successes[i] + 1.0) / (self.visits[i] + 2.0)
+
+    def success_bound(self, i: int) -> float:
+        return self.success_rate(i) + self._width(self.visits[i])
+
+    def value(self, i: int, rng: Optional[Any] = None) -> float:
+        """Success-weighted UCB (rng=None) or Thompson draw (rng given) of the reward mean, in [0, 1]."""
+        n = self.visits[i]
+        if n == 0.0:
+            return 1.0 if rng is None else rng.random()
+        if rng is None:
+            estimate = self.mean[i] + self._width(n)
+        else:
+            var = self.m2[i] / (n - 1.0) if n > 1.0 else 1.0
+            estimate = rng.gauss(self.mean[i], math.sqrt(var / n))
+        return self.success_rate(i) * min(1.0, max(0.0, estimate / max(self.reward_max, 1e-9)))
+
+    # Batch forms: slots are few (one per op and signature), so each estimate
+    # is tabulated once per slot, cached until the statistics change, and
+    # gathered with a single fancy index.
+
+    def _tables(self) -> Tuple[Any, Any, Any]:
+        key = (self.total, len(self.keys))
+        if self._tables_key != key:
+            # Same expressions as the scalar methods, so results match exactly
+            log_t = math.log(self.total + 1.0)
+            scale = max(self.reward_max, 1e-9)
+            rates, bounds, values = [], [], []
+            for n, s, mean in zip(self.visits, self.successes, self.mean):
+                rate = (s + 1.0) / (n + 2.0)
+                width = self.c * math.sqrt(log_t / (n + 1.0))
+                rates.append(rate)
+                bounds.append(rate + width)
+                values.append(1.0 if n == 0.0 else rate * min(1.0, max(0.0, (mean + width) / scale)))
+            self._tables_cache = (np.array(rates), np.array(bounds), np.array(values))
+            self._tables_key = key
+        return self._tables_cache
+
+    def success_rate_batch(self, slots: Any) -> Any:
+        return self._tables()[0][slots]
+
+    def success_bound_batch(self, slots: Any) -> Any:
+        return self._tables()[1][slots]
+
+    def value_batch(self, slots: Any, rng: Optional[Any] = None) -> Any:
+        """value() over a slot array; Thompson draws come from rng in slot order, like the scalar path."""
+        if rng is None:
+            return self._tables()[2][slots]
+        scale = max(self.reward_max, 1e-9)
+        params = []
+        for i in range(len(self.keys)):
+            n = self.visits[i]
+            var = self.m2[i] / (n - 1.0) if n > 1.0 else 1.0
+            params.append((n, self.mean[i], math.sqrt(var / n) if n else 0.0, self.success_rate(i)))
+        gauss, uniform = rng.gauss, rng.random
+        out = []
+        for i in slots.tolist():
+            n, mean, sd, rate = params[i]
+            out.append(uniform() if n == 0.0 else rate * min(1.0, max(0.0, gauss(mean, sd) / scale)))
+        return np.array(out)
+
+    def state(self) -> Dict[str, Any]:
+        """JSON-serialisable contents (keys as [op name, [type names]])."""
+        return {
+            "c": self.c, "total": self.total, "reward_max": self.reward_max,
+            "keys": [[name, [getattr(t, "name", t) for t in sig]] for name, sig in self.keys],
+            "visits": list(self.visits), "successes": list(self.successes),
+            "mean": list(self.mean), "m2": list(self.m2),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], decode_type: Any = None) -> "OutcomeStats":
+        """Rebuild from state(); decode_type maps stored type names back to signature entries."""
+        stats = cls(state["c"])
+        decode = decode_type or (lambda name: name)
+        for name, sig in state["keys"]:
+            stats.slot((name, tuple(decode(t) for t in sig)))
+        stats.visits = array('d', state["visits"])
+        stats.successes = array('d', state["successes"])
+        stats.mean = array('d', state["mean"])
+        stats.m2 = array('d', state["m2"])
+        stats.total = state["total"]
+        stats.reward_max = state["reward_max"]
+        return stats
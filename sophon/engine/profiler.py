@@ -0,0 +1,122 @@
+"""sophon.engine.profiler
+
+Per-phase and per-op instrumentation of Engine.step().
+Motif: Module (engine/profiler)
+Ports: [interface: StepProfiler, PHASES]
+Invariants: [monotonic clock, zero cost when disabled]
+
+The engine holds `profiler = None` unless built with profile=True, and every
+instrumentation point is behind a single `is not None` test, so an
+unprofiled step does no timing work at all.
+
+A profiled step is split into laps on one monotonic nanosecond clock:
+
+    index        candidate-index sync with the graph journal
+    enumerate    building per-op input streams and interleaving them
+    score        rank_candidates
+    select       exploration pick and greedy/knapsack fill
+    apply        op application, invariants, rewards, fork commits
+    consolidate  energy/mass consolidation and release
+
+Per op it counts precondition time (spent pulling from the op's input
+stream), tuples yielded, candidates and chosen slots, apply time,
+invariant-check time, and kept/discarded/failed applications.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+PHASES = ("index", "enumerate", "score", "select", "apply", "consolidate")
+OP_FIELDS = ("precond_ns", "yielded", "candidates", "chosen", "apply_ns", "invariant_ns",
+             "kept", "discarded", "failed")
+
+class StepProfiler:
+    """Accumulates timings (ns) and counters per phase and per op, per step and in total."""
+
+    def __init__(self, clock: Callable[[], int] = time.perf_counter_ns) -> None:
+        self.clock = clock
+        self.steps = 0
+        self.phase_ns: Dict[str, int] = dict.fromkeys(PHASES, 0)
+        self.ops: Dict[str, Dict[str, int]] = {}
+        self._step_phase: Dict[str, int] = {}
+        self._step_ops: Dict[str, Dict[str, int]] = {}
+        self._start = self._last = 0
+        self._lock = threading.Lock()  # apply workers record op timings concurrently
+
+    def begin_step(self) -> None:
+        self._step_phase = {}
+        self._step_ops = {}
+        self._start = self._last = self.clock()
+
+    def lap(self, phase: str) -> None:
+        """Charge the time since the previous lap to phase."""
+        now = self.clock()
+        self._step_phase[phase] = self._step_phase.get(phase, 0) + now - self._last
+        self._last = now
+
+    def _stats(self, op_name: str) -> Dict[str, int]:
+        stats = self._step_ops.get(op_name)
+        if stats is None:
+            stats = self._step_ops[op_name] = dict.fromkeys(OP_FIELDS, 0)
+        return stats
+
+    def count(self, op_name: str, field: str, value: int = 1) -> None:
+        """Add value to one of op_name's OP_FIELDS for this step (thread-safe)."""
+        with self._lock:
+            self._stats(op_name)[field] += value
+
+    def timed(self, op_name: str, stream: Iterator[Tuple[Any, ...]]) -> Iterator[Tuple[Any, ...]]:
+        """
+        Wrap an input stream, charging the time spent in next() to op_name's
+        precond_ns. Streams are consumed on the stepping thread, so this
+        updates the step's counters without taking the lock.
+        """
+        clock = self.clock
+        stats = self._stats(op_name)
+        while True:
+            t0 = clock()
+            try:
+                item = next(stream)
+            except StopIteration:
+                return
+            finally:
+                stats["precond_ns"] += clock() - t0
+            stats["yielded"] += 1
+            yield item
+
+    def end_step(self) -> Dict[str, Any]:
+        """Fold this step into the totals and return its report (seconds and counts)."""
+        total_ns = self.clock() - self._start
+        self.steps += 1
+        for phase, ns in self._step_phase.items():
+            self.phase_ns[phase] = self.phase_ns.get(phase, 0) + ns
+        for name, stats in self._step_ops.items():
+            totals = self.ops.get(name)
+            if totals is None:
+                totals = self.ops[name] = dict.fromkeys(OP_FIELDS, 0)
+            for field, value in stats.items():
+                totals[field] += value
+        return {
+            "total_s": total_ns * 1e-9,
+            "phases": {phase: ns * 1e-9 for phase, ns in self._step_phase.items()},
+            "ops": {name: dict(stats) for name, stats in self._step_ops.items()},
+        }
+
+    def report(self, top: int = 15) -> str:
+        """Cumulative text report: phase breakdown, then the `top` ops by total time."""
+        steps = max(self.steps, 1)
+        total = sum(self.phase_ns.values()) or 1
+        lines = [f"Profile over {self.steps} steps ({total * 1e-6 / steps:.3f} ms/step)",
+                 f"{'phase':<12} {'ms/step':>10} {'share':>7}"]
+        for phase, ns in self.phase_ns.items():
+            lines.append(f"{phase:<12} {ns * 1e-6 / steps:>10.3f} {100.0 * ns / total:>6.1f}%")
+        lines.append(f"{'op':<24} {'precond ms':>11} {'apply ms':>9} {'invar ms':>9} "
+                     f"{'cands':>7} {'chosen':>7} {'kept':>6} {'disc':>5} {'fail':>5}")
+        ranked = sorted(self.ops.items(),
+                        key=lambda kv: -(kv[1]["precond_ns"] + kv[1]["apply_ns"] + kv[1]["invariant_ns"]))
+        for name, s in ranked[:top]:
+            lines.append(f"{name:<24} {s['precond_ns'] * 1e-6:>11.2f} {s['apply_ns'] * 1e-6:>9.2f} "
+                         f"{s['invariant_ns'] * 1e-6:>9.2f} {s['candidates']:>7} {s['chosen']:>7} "
+                         f"{s['kept']:>6} {s['discarded']:>5} {s['failed']:>5}")
+        return "\n".join(lines)
@@ -0,0 +1,152 @@
+"""sophon.engine.selection
+
+Candidate ranking and budgeted selection for the SOPHON engine.
+Motif: Module (engine/selection)
+Ports: [interface: BestFirstOrder, RankedCandidates, greedy_fill, knapsack_fill]
+Invariants: [stable ordering, budget feasibility]
+
+Selection rarely looks past the first few ranks, so the best-first order is
+built lazily: a partial top-k (argpartition with NumPy, heapq.nlargest
+otherwise) serves the common case in O(n) / O(n log k), and only a walk that
+runs past that prefix pays for the full stable sort. Both orders agree with
+sorting by score descending, ties kept in candidate order.
+"""
+
+import heapq
+import math
+from typing import Any, Iterable, List, Sequence, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+class BestFirstOrder(Sequence):
+    """Lazy best-first permutation of score indices; item r is the index of rank r."""
+
+    def __init__(self, scores: Any, prefix: int) -> None:
+        self._scores = scores
+        self._n = len(scores)
+        self._full = False
+        self._order = self._top(max(1, prefix))
+
+    def _top(self, k: int) -> Any:
+        scores = self._scores
+        if k >= self._n:
+            self._full = True
+            if np is not None and isinstance(scores, np.ndarray):
+                return np.argsort(-scores, kind='stable')
+            return sorted(range(self._n), key=scores.__getitem__, reverse=True)
+        if np is not None and isinstance(scores, np.ndarray):
+            kth = -np.partition(-scores, k - 1)[k - 1]
+            # Every index scoring >= the k-th best, ties included, so the stable
+            # sort below matches the prefix of a full stable sort exactly
+            idx = np.flatnonzero(scores >= kth)
+            return idx[np.argsort(-scores[idx], kind='stable')][:k]
+        return heapq.nlargest(k, range(self._n), key=scores.__getitem__)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, rank: Any) -> Any:
+        if isinstance(rank, slice):
+            return [self[i] for i in range(*rank.indices(self._n))]
+        if rank < 0:
+            rank += self._n
+        if rank >= len(self._order) and not self._full:
+            self._order = self._top(self._n)
+        return self._order[rank]
+
+class RankedCandidates(Sequence):
+    """
+    Read-only view of scored candidates in rank order. Item r is the tuple
+    (score, cost, op, inputs, ep) of the r-th best candidate, built on access
+    so only the ranks selection actually visits are materialised.
+    """
+
+    def __init__(self, candidates: List[Tuple[Any, Tuple[Any, ...]]], scores: Any, costs: Any, eps: Any,
+                 order: Sequence[int]) -> None:
+        self._candidates = candidates
+        self._scores = scores
+        self._costs = costs
+        self._eps = eps
+        self._order = order
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __getitem__(self, rank: Any) -> Any:
+        if isinstance(rank, slice):
+            return [self[i] for i in range(*rank.indices(len(self)))]
+        i = self._order[rank]
+        op, inputs = self._candidates[i]
+        return float(self._scores[i]), float(self._costs[i]), op, inputs, float(self._eps[i])
+
+def greedy_fill(ranked: Sequence[Tuple[Any, ...]], available: float, spent: float, slots: int,
+                skip: Iterable[int] = ()) -> List[int]:
+    """
+    Walk ranks best-first and take every candidate whose cost still fits,
+    until `slots` are taken. Returns the chosen ranks.
+    """
+    skipped: Set[int] = set(skip)
+    picks: List[int] = []
+    if slots <= 0:
+        return picks
+    for rank in range(len(ranked)):
+        if rank in skipped:
+            continue
+        cost = ranked[rank][1]
+        if spent + cost <= available:
+            picks.append(rank)
+            spent += cost
+            if len(picks) >= slots:
+                break
+    return picks
+
+def knapsack_fill(ranked: Sequence[Tuple[Any, ...]], available: float, spent: float, slots: int,
+                  skip: Iterable[int] = (), pool: int = 32, resolution: float = 0.1) -> List[int]:
+    """
+    Choose at most `slots` of the best `pool` ranks maximising total score
+    with total cost <= available - spent (bounded 0/1 knapsack, costs rounded
+    up to `resolution` so the result never exceeds the budget). Candidates
+    with non-positive score are never worth including. Returns chosen ranks,
+    best-first.
+    """
+    skipped: Set[int] = set(skip)
+    capacity = int(math.floor((available - spent) / resolution + 1e-9))
+    if slots <= 0 or capacity < 0:
+        return []
+    items: List[Tuple[int, float, int]] = []
+    for rank in range(min(pool, len(ranked))):
+        if rank in skipped:
+            continue
+        score, cost = ranked[rank][0], ranked[rank][1]
+        weight = int(math.ceil(cost / resolution - 1e-9))
+        if score > 0.0 and weight <= capacity:
+            items.append((rank, score, weight))
+    if not items:
+        return []
+    # If the best `slots` items fit together, the budget does not bind
+    top = sorted(items, key=lambda it: it[1], reverse=True)[:slots]
+    if sum(it[2] for it in top) <= capacity:
+        return sorted(it[0] for it in top)
+    # No feasible set can use more than the `slots` heaviest weights
+    capacity = min(capacity, sum(sorted((it[2] for it in items), reverse=True)[:slots]))
+    # best[j][c]: (value, ranks) using at most j items within weight c
+    best: List[List[Tuple[float, Tuple[int, ...]]]] = [[(0.0, ())] * (capacity + 1) for _ in range(slots + 1)]
+    for rank, score, weight in items:
+        for j in range(slots, 0, -1):
+            prev_row, row = best[j - 1], best[j]
+            for c in range(capacity, weight - 1, -1):
+                value = prev_row[c - weight][0] + score
+                if value > row[c][0]:
+                    row[c] = (value, prev_row[c - weight][1] + (rank,))
+    return sorted(best[slots][capacity][1])
+
+def explore_pool(ranked: Sequence[Tuple[Any, ...]], top_n: int, available: float) -> List[int]:
+    """Ranks among the top_n whose cost fits the budget (epsilon-greedy pool)."""
+    return [r for r in range(min(top_n, len(ranked))) if ranked[r][1] <= available]
+
+def best_first(scores: Any, prefix: int) -> BestFirstOrder:
+    """Return the lazy best-first order of scores, with the first `prefix` ranks precomputed."""
+    return BestFirstOrder(scores, prefix)
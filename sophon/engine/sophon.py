@@ -8,12 +8,24 @@ Invariants: [system coherence, extensibility]
 
 import logging, random
 from collections import deque
-from typing import Any, List, Tuple, Dict, Optional, Set, Deque
+from typing import Any, List, Tuple, Dict, Iterator, Optional, Deque
 from sophon.affect.eoe import Valuator
-from sophon.ops.registry import Registry, Op
+from sophon.engine.checkpoint import load_checkpoint, save_checkpoint
+from sophon.engine.matcher import CandidateIndex
+from sophon.engine.novelty import make_tracker
+from sophon.engine.outcomes import OutcomeStats, signature
+from sophon.engine.profiler import StepProfiler
+from sophon.engine.rng import make_rng
+from sophon.engine.selection import RankedCandidates, best_first, explore_pool, greedy_fill, knapsack_fill
+from sophon.ops.registry import Registry, Op, interleave
 from sophon.core.hypergraph import HyperGraph
 from sophon.core.types import NodeType
 
+try:
+    import numpy as np
+except ImportError:  # optional dependency; scoring falls back to the scalar loop
+    np = None
+
 class Engine:
     """Main SOPHON engine with Oak policy loop."""
 
@@ -29,7 +41,22 @@ class Engine:
         force_greedy_if_empty: bool = True,
         epsilon: float = 0.2,
         top_n_explore: int = 10,
-        recent_window: int = 5
+        recent_window: int = 5,
+        incremental: bool = True,
+        batch_scoring: bool = True,
+        selection: str = "greedy",
+        knapsack_pool: int = 32,
+        rng: Optional[random.Random] = None,
+        seed: Optional[int] = None,
+        speculative: bool = False,
+        speculative_threshold: float = 0.0,
+        novelty: str = "set",
+        novelty_options: Optional[Dict[str, Any]] = None,
+        profile: bool = False,
+        summary_level: str = "full",
+        outcome_model: Optional[str] = None,
+        outcome_c: float = 0.5,
+        prune_seen: bool = False
     ) -> None:
         self.graph = graph
         self.registry = registry
@@ -45,18 +72,153 @@ class Engine:
         self.top_n_explore = top_n_explore
         self.recent_ops: Deque[str] = deque(maxlen=recent_window)
         self.op_counts: Dict[str, int] = {}
-        self.seen_applications: Set[Tuple[str, Tuple[Any, ...]]] = set()
-        self.seen_props: Set[int] = set()
+        # Seen (op.name, canonical inputs) applications and proposition ids: "set" keeps
+        # the keys, "exact" 64-bit fingerprints, "bloom" a bounded Bloom filter
+        self.novelty = novelty
+        self.seen_applications = make_tracker(novelty, **(novelty_options or {}))
+        self.seen_props = make_tracker(novelty, **(novelty_options or {}))
+        # Skip candidates whose (canonical) application was already kept, so
+        # the candidate budget goes to untried inputs. With the "bloom"
+        # tracker a false positive prunes an untried candidate.
+        self.prune_seen = prune_seen
         self.unique_props_total: int = 0
         self._last_summary: Dict[str, Any] = {}
+        # Incremental candidate matching for ops that declare a node pattern
+        self.incremental = incremental
+        self._matcher: Optional[CandidateIndex] = None
+        # Score candidates with NumPy array ops when numpy is available
+        self.batch_scoring = batch_scoring
+        # "greedy": walk ranks best-first; "knapsack": maximise total score within the budget
+        if selection not in ("greedy", "knapsack"):
+            raise ValueError(f"unknown selection mode: {selection}")
+        self.selection = selection
+        self.knapsack_pool = knapsack_pool
+        # Every draw (scoring noise, exploration, release, seeding, input
+        # sampling) comes from this stream, never the global random module
+        self.rng = rng if rng is not None else make_rng(seed)
+        # Apply chosen ops on graph forks; keep (commit) only those whose
+        # invariants hold and whose reward reaches speculative_threshold
+        self.speculative = speculative
+        self.speculative_threshold = speculative_threshold
+        # Per-phase/per-op timers and counters, reported in the step summary;
+        # None (the default) skips all instrumentation
+        self.profiler: Optional[StepProfiler] = StepProfiler() if profile else None
+        # get_last_summary() detail: "full" (adds chosen_ops, topk, top_inputs),
+        # "basic" (scalars and rewards, no per-step list copies) or "none"
+        if summary_level not in ("full", "basic", "none"):
+            raise ValueError(f"unknown summary level: {summary_level}")
+        self.summary_level = summary_level
+        # Learned per-(op, input signature) outcome statistics; "ucb" or
+        # "thompson" replace the constant prediction and random uncertainty
+        if outcome_model not in (None, "ucb", "thompson"):
+            raise ValueError(f"unknown outcome model: {outcome_model}")
+        self.outcome_model = outcome_model
+        self.outcomes: Optional[OutcomeStats] = OutcomeStats(outcome_c) if outcome_model else None
+        self._slot_cache: Tuple[Any, Any] = (None, None)
+        self._pattern_slots: Dict[Op, int] = {}
 
     def predict(self, op: Op, inputs: Tuple[Any, ...]) -> float:
-        """Predict outcome (ep). Simple heuristic for now."""
-        return 0.5  # Optimistic baseline
+        """Predict outcome (ep): the learned success rate, else an even 0.5."""
+        if self.outcomes is None:
+            return 0.5  # Optimistic baseline
+        return self.outcomes.success_rate(self._outcome_slot(op, inputs))
+
+    def optimism(self, op: Op, inputs: Tuple[Any, ...]) -> float:
+        """Perceived outcome assumed when scoring: the success-rate UCB, else 1.0."""
+        if self.outcomes is None:
+            return 1.0
+        return self.outcomes.success_bound(self._outcome_slot(op, inputs))
 
     def uncertainty(self, op: Op, inputs: Tuple[Any, ...]) -> float:
-        """Estimate uncertainty/novelty."""
-        return random.random()
+        """Estimate uncertainty/novelty: the learned value bound or sample, else uniform noise."""
+        if self.outcomes is None:
+            return self.rng.random()
+        rng = self.rng if self.outcome_model == "thompson" else None
+        return self.outcomes.value(self._outcome_slot(op, inputs), rng)
+
+    def predict_batch(self, candidates: List[Tuple[Op, Tuple[Any, ...]]]) -> Any:
+        """Vectorised predict() over candidates; override together with predict()."""
+        if self.outcomes is None:
+            return np.full(len(candidates), 0.5)
+        return self.outcomes.success_rate_batch(self._outcome_slots(candidates))
+
+    def optimism_batch(self, candidates: List[Tuple[Op, Tuple[Any, ...]]]) -> Any:
+        """Vectorised optimism() (a scalar when every candidate shares it)."""
+        if self.outcomes is None:
+            return 1.0
+        return self.outcomes.success_bound_batch(self._outcome_slots(candidates))
+
+    def uncertainty_batch(self, candidates: List[Tuple[Op, Tuple[Any, ...]]]) -> Any:
+        """Vectorised uncertainty(); draws from the same stream, in the same order, as the scalar path."""
+        if self.outcomes is None:
+            return np.array([self.rng.random() for _ in candidates])
+        rng = self.rng if self.outcome_model == "thompson" else None
+        return self.outcomes.value_batch(self._outcome_slots(candidates), rng)
+
+    def _outcome_slot(self, op: Op, inputs: Tuple[Any, ...]) -> int:
+        return self.outcomes.slot((op.name, signature(op, inputs, self.graph)))
+
+    def _outcome_slots(self, candidates: List[Tuple[Op, Tuple[Any, ...]]]) -> Any:
+        """Slot array for candidates, shared by the batch estimates of one scoring pass."""
+        cached, slots = self._slot_cache
+        if cached is not candidates:
+            # A pattern op's signature is its pattern, so its slot never changes
+            fixed = self._pattern_slots
+            slot_list = []
+            for op, inputs in candidates:
+                i = fixed.get(op)
+                if i is None:
+                    i = self._outcome_slot(op, inputs)
+                    if op.pattern is not None:
+                        fixed[op] = i
+                slot_list.append(i)
+            slots = np.array(slot_list, dtype=np.intp)
+            self._slot_cache = (candidates, slots)
+        return slots
+
+    def score_candidates(self, candidates: List[Tuple[Op, Tuple[Any, ...]]]) -> Tuple[Any, Any, Any]:
+        """
+        Return parallel (scores, costs, eps) for candidates, as NumPy arrays when
+        batch scoring is on and numpy is available, else as lists.
+        """
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        if self.batch_scoring and np is not None and not debug:
+            ep = self.predict_batch(candidates)
+            _, v, a = self.valuator.eoe_batch(ep, self.optimism_batch(candidates))
+            u = self.uncertainty_batch(candidates)
+            w = self.valuator.priority_batch(v, a, u, 0.0)  # Closure (computed after apply)
+            costs = np.fromiter((op.cost for op, _ in candidates), dtype=np.float64, count=len(candidates))
+            return w, costs, ep
+        scores: List[float] = []
+        costs_l: List[float] = []
+        eps: List[float] = []
+        for op, inputs in candidates:
+            ep = self.predict(op, inputs)
+            _, v, a = self.valuator.eoe(ep, P=self.optimism(op, inputs))
+            u = self.uncertainty(op, inputs)
+            c = 0.0  # Closure (computed after apply)
+            w = self.valuator.priority(v, a, u, c)
+            if debug:
+                self.logger.debug(f"SCORE op={op.name} inputs={inputs} score={w:.3f} cost={op.cost} energy={self.E:.3f}")
+            scores.append(w)
+            costs_l.append(op.cost)
+            eps.append(ep)
+        return scores, costs_l, eps
+
+    def rank_candidates(self, candidates: List[Tuple[Op, Tuple[Any, ...]]], prefix: int = 32) -> RankedCandidates:
+        """
+        Score candidates and order them best-first (stable for equal scores).
+        Only the first `prefix` ranks are sorted up front; deeper ranks are
+        sorted on first access.
+        """
+        scores, costs, eps = self.score_candidates(candidates)
+        return RankedCandidates(candidates, scores, costs, eps, best_first(scores, prefix))
+
+    def _candidate_index(self) -> CandidateIndex:
+        """Return the matcher for the current graph, rebuilding it if the graph was replaced."""
+        if self._matcher is None or self._matcher.graph is not self.graph:
+            self._matcher = CandidateIndex(self.graph)
+        return self._matcher
 
     def closure_gain(self, outputs: Any) -> float:
         """Estimate how much this closes loops/proofs."""
@@ -64,6 +226,97 @@ class Engine:
             return 0.5
         return 0.0
 
+    def _attempt(self, op: Op, input_tuple: Tuple[Any, ...], target: HyperGraph) -> Tuple[Any, bool, List[int], List[int]]:
+        """Apply op to target; return (outputs, invariants_ok, new_node_ids, new_edge_ids)."""
+        pre_version = target.version
+        prof = self.profiler
+        if prof is None:
+            outputs = op.apply(target, *input_tuple)
+            ok = op.invariants(target, outputs) if outputs else False
+        else:
+            t0 = prof.clock()
+            outputs = op.apply(target, *input_tuple)
+            t1 = prof.clock()
+            ok = op.invariants(target, outputs) if outputs else False
+            prof.count(op.name, "apply_ns", t1 - t0)
+            prof.count(op.name, "invariant_ns", prof.clock() - t1)
+        new_ids, new_edge_ids = target.changes_since(pre_version)
+        return outputs, ok, new_ids, new_edge_ids
+
+    def application_reward(
+        self,
+        op: Op,
+        input_tuple: Tuple[Any, ...],
+        ep: float,
+        outputs: Any,
+        ok: bool,
+        graph: HyperGraph,
+        new_ids: List[int],
+        new_edge_ids: List[int]
+    ) -> float:
+        """Reward for one applied (op, inputs) given its outputs and graph delta; does not change engine state."""
+        p = 1.0 if ok else 0.0
+        _, v, a = self.valuator.eoe(ep, p)
+        c = self.closure_gain(outputs)
+        base = max(0.0, 0.6 * v + 0.4 * a + c)
+
+        delta_nodes = len(new_ids)
+        delta_edges = len(new_edge_ids)
+
+        # Enhanced reward calculation with more diversity incentives
+        # (new_ids were just created, so they cannot be in seen_props yet)
+        new_prop_bonus = 0.0
+        for nid in new_ids:
+            node = graph.nodes.get(nid)
+            if node and getattr(node, "type", None) == NodeType.PROPOSITION:
+                new_prop_bonus += 0.3
+
+        # Strong diversity bonus for using different operations
+        diversity_bonus = 0.0
+        if len(self.recent_ops) > 0:
+            if self.recent_ops[-1] != op.name:
+                diversity_bonus += 0.25  # Significant bonus for operation diversity
+            if len(self.recent_ops) >= 3 and op.name not in list(self.recent_ops)[-3:]:
+                diversity_bonus += 0.15  # Extra bonus for novel operations
+
+        # Unique application bonus (never tried this exact input before)
+        unique_apply_bonus = 0.2 if (op.name, op.canonical(input_tuple)) not in self.seen_applications else 0.0
+
+        # Progressive repeat penalty (gets worse with more repetitions)
+        repeat_count = self.op_counts.get(op.name, 0)
+        repeat_penalty = min(repeat_count * 0.15, 0.8)  # More severe penalty
+
+        # Complexity bonus for more sophisticated operations
+        complexity_bonus = 0.0
+        if "II" in op.name or "III" in op.name:  # Higher book operations
+            complexity_bonus += 0.2
+        if outputs and isinstance(outputs, dict):
+            if 'square' in outputs or 'rectangle' in outputs:
+                complexity_bonus += 0.15
+            if 'new_points' in outputs and len(outputs.get('new_points', [])) > 1:
+                complexity_bonus += 0.1
+
+        # Novel structure bonus
+        structure_bonus = 0.0
+        if delta_nodes >= 2:  # Created multiple new nodes
+            structure_bonus += 0.1
+        if delta_edges >= 1:  # Created new connections
+            structure_bonus += 0.05
+
+        return max(0.0, base + 0.02 * delta_nodes + 0.02 * delta_edges +
+                   new_prop_bonus + diversity_bonus + unique_apply_bonus +
+                   complexity_bonus + structure_bonus - repeat_penalty)
+
+    def record_application(self, op: Op, input_tuple: Tuple[Any, ...], new_ids: List[int]) -> None:
+        """Update proposition, application and op history after an application is kept."""
+        for nid in new_ids:
+            node = self.graph.nodes.get(nid)
+            if node and getattr(node, "type", None) == NodeType.PROPOSITION and self.seen_props.add(nid):
+                self.unique_props_total += 1
+        self.seen_applications.add((op.name, op.canonical(input_tuple)))
+        self.op_counts[op.name] = self.op_counts.get(op.name, 0) + 1
+        self.recent_ops.append(op.name)
+
     def step(
         self,
         max_candidates: int = 64,
@@ -71,80 +324,105 @@ class Engine:
         release_prob: float = 0.1
     ) -> None:
         """Execute one Oak policy step."""
+        prof = self.profiler
+        if prof is not None:
+            prof.begin_step()
 
-        # 1. Enumerate all valid (op, inputs) pairs
-        candidates: List[Tuple[Op, Tuple[Any, ...]]] = []
+        # 1. Enumerate valid (op, inputs) pairs, lazily and round-robin across ops
         ops_list = self.registry.ops()
         if self.logger.isEnabledFor(logging.DEBUG):
             names = [op.name for op in ops_list]
             self.logger.debug(f"Checking {len(ops_list)} ops for valid inputs...")
             self.logger.debug(f"ops_list = {names}")
+        matcher = self._candidate_index() if self.incremental else None
+        if prof is not None:
+            prof.lap("index")
+        streams: List[Tuple[Op, Iterator[Tuple[Any, ...]]]] = []
         for op in ops_list:
             try:
-                valid_inputs = op.precond(self.graph)
-                for inputs in valid_inputs:
-                    candidates.append((op, inputs))
-                    if len(candidates) >= max_candidates:
-                        break
+                if prof is not None:
+                    t0 = prof.clock()
+                if matcher is not None and matcher.supports(op):
+                    stream = iter(matcher.inputs(op, self.rng))
+                else:
+                    stream = op.iter_precond(self.graph, self.rng)
+                if prof is not None:
+                    prof.count(op.name, "precond_ns", prof.clock() - t0)
+                    stream = prof.timed(op.name, stream)
+                streams.append((op, stream))
             except Exception:
                 pass
-            if len(candidates) >= max_candidates:
-                break
+        pruned = 0
+        skip = None
+        retired: Dict[Op, List[int]] = {}
+        if self.prune_seen:
+            seen = self.seen_applications
+
+            def skip(op: Op, inputs: Tuple[Any, ...]) -> bool:
+                nonlocal pruned
+                if (op.name, inputs) not in seen:
+                    return False
+                pruned += 1
+                if matcher is not None and len(op.pattern or ()) == 1:
+                    retired.setdefault(op, []).append(inputs[0])
+                return True
+        candidates = interleave(streams, max_candidates, skip)
+        # Applied single-node inputs leave the op's alpha memory, so later
+        # steps do not walk past them again
+        for op, node_ids in retired.items():
+            matcher.retire(op, node_ids)
+        if prof is not None:
+            for op, _inputs in candidates:
+                prof.count(op.name, "candidates")
+            prof.lap("enumerate")
 
         if self.logger.isEnabledFor(logging.DEBUG):
             self.logger.debug(f"Found {len(candidates)} valid (op, inputs) pairs")
         if not candidates:
+            if prof is not None:
+                prof.end_step()
             return
 
         # 2. Score candidates
-        scored: List[Tuple[float, float, Op, Tuple[Any, ...], float]] = []
-        for op, inputs in candidates:
-            ep = self.predict(op, inputs)
-            _, v, a = self.valuator.eoe(ep, P=1.0)  # Optimistic
-            u = self.uncertainty(op, inputs)
-            c = 0.0  # Closure (computed after apply)
-            w = self.valuator.priority(v, a, u, c)
-            if self.logger.isEnabledFor(logging.DEBUG):
-                self.logger.debug(f"SCORE op={op.name} inputs={inputs} score={w:.3f} cost={op.cost} energy={self.E:.3f}")
-            scored.append((w, op.cost, op, inputs, ep))
+        scored = self.rank_candidates(candidates, prefix=2 * max(self.top_n_explore, k_commit, 3))
+        if prof is not None:
+            prof.lap("score")
 
         # 3. Select top-k within energy budget
-        scored.sort(reverse=True, key=lambda x: x[0])
         top_op_name: Optional[str] = None
         top_score: Optional[float] = None
         top_inputs: Optional[Tuple[Any, ...]] = None
-        topk: List[Tuple[str, float]] = []
         if scored:
             top_score = scored[0][0]
             top_op_name = scored[0][2].name
             top_inputs = scored[0][3]
-            topk = [(s[2].name, s[0]) for s in scored[:3]]
         chosen: List[Tuple[Op, Tuple[Any, ...], float]] = []
         available_budget = max(self.E, self.min_energy_floor)
         budget = 0.0
         fallback_used = False
         explore_used = False
-        picked_key: Optional[Tuple[str, Tuple[Any, ...]]] = None
+        explored_rank: Optional[int] = None
         # Epsilon-greedy selection for the first pick from top-N
-        if self.epsilon > 0.0 and random.random() < self.epsilon and scored:
-            eligible_top = [item for item in scored[:self.top_n_explore] if item[1] <= available_budget]
+        if self.epsilon > 0.0 and self.rng.random() < self.epsilon and scored:
+            eligible_top = explore_pool(scored, self.top_n_explore, available_budget)
             if eligible_top:
-                w_sel, cost_sel, op_sel, inputs_sel, ep_sel = random.choice(eligible_top)
+                explored_rank = self.rng.choice(eligible_top)
+                w_sel, cost_sel, op_sel, inputs_sel, ep_sel = scored[explored_rank]
                 chosen.append((op_sel, inputs_sel, ep_sel))
                 budget += cost_sel
                 explore_used = True
-                picked_key = (op_sel.name, inputs_sel)
-        for w, cost, op, input_tuple, ep in scored:
-            if picked_key is not None and op.name == picked_key[0] and input_tuple == picked_key[1]:
-                picked_key = None
-                continue
+        skip = () if explored_rank is None else (explored_rank,)
+        slots = k_commit - len(chosen)
+        if self.selection == "knapsack":
+            picks = knapsack_fill(scored, available_budget, budget, slots, skip, pool=self.knapsack_pool)
+        else:
+            picks = greedy_fill(scored, available_budget, budget, slots, skip)
+        for rank in picks:
+            w, cost, op, input_tuple, ep = scored[rank]
             if self.logger.isEnabledFor(logging.DEBUG):
                 self.logger.debug(f"CHOOSE w={w:.3f} cost={cost} budget={budget:.3f} E={self.E:.3f}")
-            if budget + cost <= available_budget:
-                chosen.append((op, input_tuple, ep))
-                budget += cost
-            if len(chosen) >= k_commit:
-                break
+            chosen.append((op, input_tuple, ep))
+            budget += cost
 
         if not chosen and scored and self.force_greedy_if_empty:
             best_w, best_cost, best_op, best_inputs, best_ep = scored[0]
@@ -158,110 +436,79 @@ class Engine:
 
         if self.logger.isEnabledFor(logging.DEBUG):
             self.logger.debug(f"Chose {len(chosen)} ops to apply")
+        if prof is not None:
+            for op, _inputs, _ep in chosen:
+                prof.count(op.name, "chosen")
+            prof.lap("select")
 
         # 4. Apply chosen ops and compute actual rewards
         rewards: List[float] = []
         novelty_nodes_step = 0
         novelty_edges_step = 0
+        discarded = 0
         for op, input_tuple, ep in chosen:
+            r: Optional[float] = None
             try:
-                pre_node_ids = set(self.graph.nodes.keys())
-                pre_nodes_len = len(self.graph.nodes)
-                pre_edges_len = len(self.graph.edges)
-
-                outputs = op.apply(self.graph, *input_tuple)
-                ok = op.invariants(self.graph, outputs) if outputs else False
-                p = 1.0 if ok else 0.0
-
-                _, v, a = self.valuator.eoe(ep, p)
-                c = self.closure_gain(outputs)
-                base = max(0.0, 0.6 * v + 0.4 * a + c)
-
-                post_nodes_len = len(self.graph.nodes)
-                post_edges_len = len(self.graph.edges)
-                delta_nodes = max(0, post_nodes_len - pre_nodes_len)
-                delta_edges = max(0, post_edges_len - pre_edges_len)
-                novelty_nodes_step += delta_nodes
-                novelty_edges_step += delta_edges
-
-                # Enhanced reward calculation with more diversity incentives
-                new_prop_bonus = 0.0
-                new_ids = set(self.graph.nodes.keys()) - pre_node_ids
-                for nid in new_ids:
-                    node = self.graph.nodes.get(nid)
-                    if node and getattr(node, "type", None) == NodeType.PROPOSITION and nid not in self.seen_props:
-                        self.seen_props.add(nid)
-                        self.unique_props_total += 1
-                        new_prop_bonus += 0.3
-
-                # Strong diversity bonus for using different operations
-                diversity_bonus = 0.0
-                if len(self.recent_ops) > 0:
-                    if self.recent_ops[-1] != op.name:
-                        diversity_bonus += 0.25  # Significant bonus for operation diversity
-                    if len(self.recent_ops) >= 3 and op.name not in list(self.recent_ops)[-3:]:
-                        diversity_bonus += 0.15  # Extra bonus for novel operations
-
-                # Unique application bonus (never tried this exact input before)
-                unique_apply_bonus = 0.2 if (op.name, input_tuple) not in self.seen_applications else 0.0
-                if unique_apply_bonus > 0:
-                    self.seen_applications.add((op.name, input_tuple))
-
-                # Progressive repeat penalty (gets worse with more repetitions)
-                repeat_count = self.op_counts.get(op.name, 0)
-                repeat_penalty = min(repeat_count * 0.15, 0.8)  # More severe penalty
-
-                # Complexity bonus for more sophisticated operations
-                complexity_bonus = 0.0
-                if "II" in op.name or "III" in op.name:  # Higher book operations
-                    complexity_bonus += 0.2
-                if outputs and isinstance(outputs, dict):
-                    if 'square' in outputs or 'rectangle' in outputs:
-                        complexity_bonus += 0.15
-                    if 'new_points' in outputs and len(outputs.get('new_points', [])) > 1:
-                        complexity_bonus += 0.1
-
-                # Novel structure bonus
-                structure_bonus = 0.0
-                if delta_nodes >= 2:  # Created multiple new nodes
-                    structure_bonus += 0.1
-                if delta_edges >= 1:  # Created new connections
-                    structure_bonus += 0.05
-
-                r = max(0.0, base + 0.02 * delta_nodes + 0.02 * delta_edges + 
-                       new_prop_bonus + diversity_bonus + unique_apply_bonus + 
-                       complexity_bonus + structure_bonus - repeat_penalty)
+                # Speculative mode applies each op to a copy-on-write fork and
+                # only commits it if the application is worth keeping
+                target = self.graph.fork() if self.speculative else self.graph
+                outputs, ok, new_ids, new_edge_ids = self._attempt(op, input_tuple, target)
+                r = self.application_reward(op, input_tuple, ep, outputs, ok, target, new_ids, new_edge_ids)
+                if self.outcomes is not None:
+                    self.outcomes.update(self._outcome_slot(op, input_tuple), ok, r)
+
+                if self.speculative:
+                    if not ok or r < self.speculative_threshold:
+                        target.discard()
+                        discarded += 1
+                        if prof is not None:
+                            prof.count(op.name, "discarded")
+                        continue
+                    node_map = target.commit()
+                    new_ids = [node_map[nid] for nid in new_ids]
+
+                novelty_nodes_step += len(new_ids)
+                novelty_edges_step += len(new_edge_ids)
+                self.record_application(op, input_tuple, new_ids)
                 rewards.append(r)
-
-                # Update op history
-                self.op_counts[op.name] = self.op_counts.get(op.name, 0) + 1
-                self.recent_ops.append(op.name)
+                if prof is not None:
+                    prof.count(op.name, "kept")
             except Exception:
                 rewards.append(0.0)
+                if self.outcomes is not None and r is None:
+                    self.outcomes.update(self._outcome_slot(op, input_tuple), False, 0.0)
+                if prof is not None:
+                    prof.count(op.name, "failed")
+        if prof is not None:
+            prof.lap("apply")
 
         # 5. Consolidate (e → m)
         self.E, self.m = self.valuator.consolidate(self.E, self.m, rewards)
 
         # 6. Occasionally release (m → e)
-        if random.random() < release_prob:
+        if self.rng.random() < release_prob:
             self.E, self.m = self.valuator.release(self.E, self.m, dm=0.1)
+        if prof is not None:
+            prof.lap("consolidate")
 
         # Save summary for external reporting
-        chosen_ops = [(op.name, input_tuple) for (op, input_tuple, _ep) in chosen]
-        self._last_summary = {
+        step_profile = prof.end_step() if prof is not None else None
+        if self.summary_level == "none":
+            self.step_count += 1
+            return
+        summary: Dict[str, Any] = {
             "step": self.step_count + 1,
             "ops_count": len(ops_list),
             "candidates": len(candidates),
+            "pruned": pruned,
             "chosen": len(chosen),
-            "chosen_ops": chosen_ops,
             "budget_spent": budget,
             "available_budget": available_budget,
             "fallback_used": fallback_used,
             "explore_used": explore_used,
+            "discarded": discarded,
             "top_op": top_op_name,
             "top_score": top_score,
-            "top_inputs": top_inputs,
-            "topk": topk,
             "rewards": rewards,
             "novelty_nodes_step": novelty_nodes_step,
             "novelty_edges_step": novelty_edges_step,
@@ -269,29 +516,56 @@ class Engine:
             "energy": self.E,
             "mass": self.m,
         }
+        if self.summary_level == "full":
+            summary["chosen_ops"] = [(op.name, input_tuple) for (op, input_tuple, _ep) in chosen]
+            summary["top_inputs"] = top_inputs
+            summary["topk"] = [(s[2].name, s[0]) for s in scored[:3]]
+        if step_profile is not None:
+            summary["profile"] = step_profile
+        self._last_summary = summary
         self.step_count += 1
 
     def get_last_summary(self) -> Dict[str, Any]:
         """Return last step summary for reporting."""
         return self._last_summary
 
+    def checkpoint(self, path: str) -> str:
+        """Save the graph and all learning/RNG state under directory path (see engine.checkpoint)."""
+        return save_checkpoint(self, path)
+
+    def resume(self, path: str) -> None:
+        """Restore graph and state from a checkpoint; later steps match the uninterrupted run."""
+        load_checkpoint(self, path)
+
+    def checkpoint_state(self) -> Dict[str, Any]:
+        """Extra JSON-serialisable state to store in checkpoints (extend the dict in subclasses)."""
+        if self.outcomes is None:
+            return {}
+        return {"outcomes": self.outcomes.state()}
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        """Restore what checkpoint_state() returned."""
+        if "outcomes" in state:
+            self._pattern_slots = {}
+            self.outcomes = OutcomeStats.from_state(
+                state["outcomes"], lambda name: NodeType[name] if name in NodeType.__members__ else name)
+
     def seed_graph(self, num_points: int = 3, num_lines: int = 2) -> None:
         """Create initial geometric objects to bootstrap."""
-        import random
-
+        rng = self.rng
         # Create some random points
         points = []
         for i in range(num_points):
-            x = random.uniform(-5, 5)
-            y = random.uniform(-5, 5)
+            x = rng.uniform(-5, 5)
+            y = rng.uniform(-5, 5)
             pid = self.graph.add_node(NodeType.POINT, {'x': x, 'y': y, 'name': f'P{i}'})
             points.append(pid)
 
         # Create some lines connecting points
         for i in range(num_lines):
             if len(points) >= 2:
-                p1 = random.choice(points)
-                p2 = random.choice([p for p in points if p != p1])
+                p1 = rng.choice(points)
+                p2 = rng.choice([p for p in points if p != p1])
                 self.graph.add_node(NodeType.LINE, {'p1': p1, 'p2': p2})
 
         self.logger.info(f"Seeded graph with {num_points} points and {num_lines} lines")
@@ -0,0 +1,209 @@
+"""sophon.engine.sweep
+
+Runs many independent SOPHON engines (seeds × settings) across a process pool.
+Motif: Module (engine/sweep)
+Ports: [interface: RunConfig, build_engine, run_one, sweep, write_columns]
+Invariants: [seed reproducibility, serial/parallel equivalence]
+
+Each run is described by a RunConfig and executed start-to-finish in one
+worker process; the engine owns a random.Random seeded from the config and
+the global random module is never touched, so a run produces the same rows
+whether it executes serially, in a pool, next to other engines in the same
+process, or under `sophon.cli.run --seed`. Workers stream per-step summary rows back in chunks
+through a queue, and the parent merges them into one columnar table ordered
+by (run, step).
+"""
+
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from multiprocessing import Manager
+from queue import Empty
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sophon.core.hypergraph import HyperGraph
+from sophon.engine.sophon import Engine
+from sophon.ops.registry import Registry
+from sophon.ops.euclid.book_I import REGISTRY as BOOK_I_REGISTRY
+from sophon.ops.euclid.book_II import REGISTRY as BOOK_II_REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Per-step scalar fields taken from Engine.get_last_summary()
+SUMMARY_FIELDS = (
+    "step", "candidates", "chosen", "budget_spent", "available_budget", "fallback_used",
+    "explore_used", "top_op", "top_score", "novelty_nodes_step", "novelty_edges_step",
+    "unique_props_total", "energy", "mass",
+)
+
+@dataclass
+class RunConfig:
+    """Settings for one engine run; mirrors the sophon.cli.run defaults."""
+    seed: Optional[int]
+    steps: int = 1000
+    E: float = 15.0
+    epsilon: float = 0.3
+    min_energy_floor: float = 1.0
+    force_greedy_if_empty: bool = True
+    top_n_explore: int = 15
+    recent_window: int = 10
+    num_points: int = 5
+    num_lines: int = 3
+    novelty: str = "set"
+    novelty_bytes: Optional[int] = None  # Bloom filter memory budget (novelty="bloom" only)
+    profile: bool = False
+    summary_level: str = "basic"  # rows only need the scalar summary
+    outcome_model: Optional[str] = None  # "ucb" / "thompson": learned predict()/uncertainty()
+    outcome_c: float = 0.5
+    prune_seen: bool = False  # skip candidates whose application was already kept
+    hash_cons: bool = False  # intern structurally identical nodes and edges
+    point_tolerance: Optional[float] = None  # merge points closer than this
+
+def build_registry() -> Registry:
+    """Registry with every book the CLI runs (Books I and II)."""
+    registry = Registry()
+    for op in BOOK_I_REGISTRY.ops():
+        registry.add(op)
+    for op in BOOK_II_REGISTRY.ops():
+        registry.add(op)
+    return registry
+
+def build_engine(config: RunConfig) -> Engine:
+    """Build an engine with its own RNG seeded from config.seed, then seed its graph."""
+    engine = Engine(
+        HyperGraph(hash_cons=config.hash_cons, point_tolerance=config.point_tolerance),
+        build_registry(),
+        E=config.E,
+        m=0.0,
+        min_energy_floor=config.min_energy_floor,
+        force_greedy_if_empty=config.force_greedy_if_empty,
+        epsilon=config.epsilon,
+        top_n_explore=config.top_n_explore,
+        recent_window=config.recent_window,
+        seed=config.seed,
+        novelty=config.novelty,
+        # only the Bloom tracker has a memory budget; the exact trackers ignore novelty_bytes
+        novelty_options={"max_bytes": config.novelty_bytes} if config.novelty == "bloom" and config.novelty_bytes else None,
+        profile=config.profile,
+        summary_level=config.summary_level,
+        outcome_model=config.outcome_model,
+        outcome_c=config.outcome_c,
+        prune_seen=config.prune_seen,
+    )
+    engine.seed_graph(num_points=config.num_points, num_lines=config.num_lines)
+    return engine
+
+def summary_row(engine: Engine) -> Dict[str, Any]:
+    """Flatten the engine's last summary into one row of scalars."""
+    summary = engine.get_last_summary()
+    row = {key: summary.get(key) for key in SUMMARY_FIELDS}
+    rewards = summary.get("rewards", [])
+    row["reward_n"] = len(rewards)
+    row["reward_sum"] = float(sum(rewards))
+    row["nodes"] = len(engine.graph.nodes)
+    row["edges"] = len(engine.graph.edges)
+    return row
+
+def run_one(config: RunConfig, run_index: int = 0, queue: Any = None, chunk: int = 100) -> List[Dict[str, Any]]:
+    """
+    Run one engine to completion and return its per-step rows. With a queue,
+    rows are also streamed as (run_index, rows) every `chunk` steps and then
+    (run_index, None) when the run ends.
+    """
+    engine = build_engine(config)
+    rows: List[Dict[str, Any]] = []
+    pending: List[Dict[str, Any]] = []
+    for step in range(config.steps):
+        engine.step()
+        row = summary_row(engine)
+        row["run"] = run_index
+        row["step"] = step + 1
+        rows.append(row)
+        if queue is not None:
+            pending.append(row)
+            if len(pending) >= chunk:
+                queue.put((run_index, pending))
+                pending = []
+    if queue is not None:
+        if pending:
+            queue.put((run_index, pending))
+        queue.put((run_index, None))
+    return rows
+
+def _run_worker(config: RunConfig, run_index: int, queue: Any, chunk: int) -> int:
+    run_one(config, run_index, queue, chunk)
+    return run_index
+
+def to_columns(rows: Sequence[Dict[str, Any]], configs: Sequence[RunConfig]) -> Dict[str, List[Any]]:
+    """Merge rows into columns ordered by (run, step), adding each run's config fields."""
+    ordered = sorted(rows, key=lambda r: (r["run"], r["step"]))
+    keys = ["run"] + list(asdict(configs[0]).keys()) if configs else ["run"]
+    keys += [k for k in (ordered[0].keys() if ordered else ()) if k not in keys]
+    config_dicts = [asdict(c) for c in configs]
+    columns: Dict[str, List[Any]] = {k: [] for k in keys}
+    for row in ordered:
+        cfg = config_dicts[row["run"]]
+        for k in keys:
+            columns[k].append(row[k] if k in row else cfg.get(k))
+    return columns
+
+def sweep(
+    configs: Sequence[RunConfig],
+    workers: Optional[int] = None,
+    chunk: int = 100,
+    on_rows: Optional[Callable[[int, List[Dict[str, Any]]], None]] = None,
+) -> Dict[str, List[Any]]:
+    """
+    Run every config, one engine per worker process (default: all cores), and
+    return the merged columnar results. on_rows(run_index, rows) is called in
+    the parent as chunks stream in. workers=1 runs serially in-process.
+    """
+    rows: List[Dict[str, Any]] = []
+    if workers == 1 or len(configs) <= 1:
+        for i, config in enumerate(configs):
+            run_rows = run_one(config, i)
+            if on_rows is not None:
+                on_rows(i, run_rows)
+            rows.extend(run_rows)
+        return to_columns(rows, configs)
+    workers = workers or os.cpu_count() or 1
+    with Manager() as manager, ProcessPoolExecutor(max_workers=min(workers, len(configs))) as pool:
+        queue = manager.Queue()
+        futures = [pool.submit(_run_worker, config, i, queue, chunk) for i, config in enumerate(configs)]
+        remaining = len(configs)
+        while remaining:
+            try:
+                run_index, chunk_rows = queue.get(timeout=0.5)
+            except Empty:
+                # Surface worker crashes instead of waiting forever
+                for future in futures:
+                    if future.done() and future.exception() is not None:
+                        raise future.exception()
+                continue
+            if chunk_rows is None:
+                remaining -= 1
+                logger.info("Run %d finished (%d left)", run_index, remaining)
+                continue
+            if on_rows is not None:
+                on_rows(run_index, chunk_rows)
+            rows.extend(chunk_rows)
+        for future in futures:
+            future.result()
+    return to_columns(rows, configs)
+
+def write_columns(columns: Dict[str, List[Any]], path: str) -> None:
+    """Write columnar results: .npz (needs numpy) or JSON {column: [values]}."""
+    if path.endswith(".npz"):
+        import numpy as np
+        arrays = {}
+        for key, values in columns.items():
+            if any(isinstance(v, str) for v in values):
+                arrays[key] = np.array(["" if v is None else v for v in values])
+            else:
+                arrays[key] = np.array([np.nan if v is None else v for v in values])
+        np.savez_compressed(path, **arrays)
+        return
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(columns, fh)
@@ -9,7 +9,9 @@ Invariants: [axiomatic correctness, composability]
 from typing import Any, List, Tuple
 from sophon.ops.registry import Op, Registry
 from sophon.core.hypergraph import HyperGraph
-from sophon.core.types import NodeType, EdgeType
+from sophon.core.types import HNode, NodeType, EdgeType
+from sophon.ops import primitives
+from sophon.ops.primitives import COS_60, SIN_60
 import math
 import logging
 
@@ -18,27 +20,28 @@ logger = logging.getLogger(__name__)
 class BookIProp1Op(Op):
     name = "BookI.Prop1"
     cost = 1.0
+    pattern = (NodeType.LINE,)
 
     def precond(self, graph: HyperGraph) -> List[Tuple[int]]:
         """Return list of valid (line_id,) tuples for this op."""
-        valid_inputs = []
-        lines, _ = graph.by_type(NodeType.LINE)
-        for line in lines:
-            logger.debug("PRECOND Checking LINE node %s attr=%s", line.id, line.attr)
-            if 'p1' in line.attr and 'p2' in line.attr:
-                p1 = graph.nodes.get(line.attr['p1'])
-                p2 = graph.nodes.get(line.attr['p2'])
-                logger.debug("p1=%s, p2=%s", p1, p2)
-                if (p1 and p2 and
-                    'x' in p1.attr and 'y' in p1.attr and
-                    'x' in p2.attr and 'y' in p2.attr):
-                    logger.debug("Valid input: (%s,)", line.id)
-                    valid_inputs.append((line.id,))
-                else:
-                    logger.debug("Invalid: missing coords")
-            else:
-                logger.debug("Invalid: missing p1/p2")
-        return valid_inputs
+        return self.match_all(graph)
+
+    def accepts(self, graph: HyperGraph, line: HNode) -> bool:
+        """A LINE is usable if both endpoints are known points with coordinates."""
+        logger.debug("PRECOND Checking LINE node %s attr=%s", line.id, line.attr)
+        if 'p1' in line.attr and 'p2' in line.attr:
+            p1 = graph.nodes.get(line.attr['p1'])
+            p2 = graph.nodes.get(line.attr['p2'])
+            logger.debug("p1=%s, p2=%s", p1, p2)
+            if (p1 and p2 and
+                'x' in p1.attr and 'y' in p1.attr and
+                'x' in p2.attr and 'y' in p2.attr):
+                logger.debug("Valid input: (%s,)", line.id)
+                return True
+            logger.debug("Invalid: missing coords")
+        else:
+            logger.debug("Invalid: missing p1/p2")
+        return False
 
     def apply(self, graph: HyperGraph, line_id: int) -> dict:
         # Construct equilateral triangle on given segment
@@ -51,9 +54,8 @@ class BookIProp1Op(Op):
         # Construct third point using rotation (60 degrees)
         dx = x2 - x1
         dy = y2 - y1
-        angle = math.pi / 3
-        x3 = x1 + dx * math.cos(angle) - dy * math.sin(angle)
-        y3 = y1 + dx * math.sin(angle) + dy * math.cos(angle)
+        x3 = x1 + dx * COS_60 - dy * SIN_60
+        y3 = y1 + dx * SIN_60 + dy * COS_60
 
         # Add point C
         p3_id = graph.add_node(NodeType.POINT, {'x': x3, 'y': y3, 'name': 'C'})
@@ -68,7 +70,8 @@ class BookIProp1Op(Op):
         # Add proposition
         prop_id = graph.add_node(NodeType.PROPOSITION, {
             'text': f'Triangle ABC is equilateral',
-            'status': 'derived'
+            'status': 'derived',
+            'support': [line_id, ac_id, bc_id]
         })
 
         return {'triangle_point': p3_id, 'proposition': prop_id, 'ac': ac_id, 'bc': bc_id, 'ab': line_id}
@@ -91,23 +94,45 @@ class BookIProp1Op(Op):
         except Exception:
             return False
 
+    def invariants_batch(self, graph: HyperGraph, outputs_list: List[Any]) -> List[bool]:
+        # The same side checks as invariants(), over all triangles in one distances() pass
+        np = primitives.np
+        if np is None:
+            return super().invariants_batch(graph, outputs_list)
+        nan = float('nan')
+        found = []
+        coords = []
+        for outputs in outputs_list:
+            try:
+                ab = graph.nodes[outputs['ab']].attr
+                p1, p2 = graph.nodes[ab['p1']].attr, graph.nodes[ab['p2']].attr
+                p3 = graph.nodes[outputs['triangle_point']].attr
+                coords.append((p1['x'], p1['y'], p2['x'], p2['y'], p3['x'], p3['y']))
+                found.append(True)
+            except Exception:
+                coords.append((nan,) * 6)
+                found.append(False)
+        xy = np.array(coords, dtype=np.float64).reshape(-1, 3, 2)
+        d1 = primitives.distances(xy[:, 0], xy[:, 1])
+        d2 = primitives.distances(xy[:, 0], xy[:, 2])
+        d3 = primitives.distances(xy[:, 1], xy[:, 2])
+        tol = 1e-6
+        equal = (np.abs(d1 - d2) < tol) & (np.abs(d2 - d3) < tol) & (np.abs(d1 - d3) < tol)
+        return [f and bool(e) for f, e in zip(found, equal)]
+
 class BookIProp2Op(Op):
     name = "BookI.Prop2"
     cost = 1.1
+    pattern = (NodeType.POINT, NodeType.POINT)
+    max_inputs = 15  # Limit combinations (drawn uniformly, see Op.sample_inputs)
+    symmetric = ((0, 1),)  # a segment has no direction
 
     def precond(self, graph: HyperGraph) -> List[Tuple[int, int]]:
         """Return list of valid (point1_id, point2_id) tuples for connecting with a line."""
-        valid_inputs = []
-        points, _ = graph.by_type(NodeType.POINT)
-        point_list = list(points)
-        
-        for i, p1 in enumerate(point_list):
-            for j, p2 in enumerate(point_list[i+1:], i+1):
-                if ('x' in p1.attr and 'y' in p1.attr and
-                    'x' in p2.attr and 'y' in p2.attr):
-                    valid_inputs.append((p1.id, p2.id))
-        
-        return valid_inputs[:15]  # Limit combinations
+        return self.match_all(graph)
+
+    def accepts(self, graph: HyperGraph, point: HNode) -> bool:
+        return 'x' in point.attr and 'y' in point.attr
 
     def apply(self, graph: HyperGraph, p1_id: int, p2_id: int) -> dict:
         # Connect two points with a line segment
@@ -119,7 +144,8 @@ class BookIProp2Op(Op):
         # Add proposition
         prop_id = graph.add_node(NodeType.PROPOSITION, {
             'text': f'Line segment constructed between two points',
-            'status': 'derived'
+            'status': 'derived',
+            'support': [line_id]
         })
         
         return {'line': line_id, 'proposition': prop_id}
@@ -136,15 +162,14 @@ class BookIProp2Op(Op):
 class BookIProp3Op(Op):
     name = "BookI.Prop3"
     cost = 0.8
+    pattern = (NodeType.POINT,)
 
     def precond(self, graph: HyperGraph) -> List[Tuple[int]]:
         """Return list of valid (point_id,) tuples for creating circles."""
-        valid_inputs = []
-        points, _ = graph.by_type(NodeType.POINT)
-        for point in points:
-            if 'x' in point.attr and 'y' in point.attr:
-                valid_inputs.append((point.id,))
-        return valid_inputs
+        return self.match_all(graph)
+
+    def accepts(self, graph: HyperGraph, point: HNode) -> bool:
+        return 'x' in point.attr and 'y' in point.attr
 
     def apply(self, graph: HyperGraph, center_id: int) -> dict:
         # Create a circle centered at the given point
@@ -161,7 +186,8 @@ class BookIProp3Op(Op):
         # Add proposition
         prop_id = graph.add_node(NodeType.PROPOSITION, {
             'text': f'Circle constructed with given center',
-            'status': 'derived'
+            'status': 'derived',
+            'support': [circle_id]
         })
         
         return {'circle': circle_id, 'proposition': prop_id}
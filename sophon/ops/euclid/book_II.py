@@ -9,7 +9,7 @@ Invariants: [axiomatic correctness, composability]
 from typing import Any, List, Tuple
 from sophon.ops.registry import Op, Registry
 from sophon.core.hypergraph import HyperGraph
-from sophon.core.types import NodeType, EdgeType
+from sophon.core.types import HNode, NodeType, EdgeType
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,15 +17,14 @@ logger = logging.getLogger(__name__)
 class BookIIProp1Op(Op):
     name = "BookII.Prop1"
     cost = 1.2  # Slightly more expensive than Book I
+    pattern = (NodeType.LINE,)
 
     def precond(self, graph: HyperGraph) -> List[Tuple[int]]:
         """Return list of valid (line_id,) tuples for this op."""
-        valid_inputs = []
-        lines, _ = graph.by_type(NodeType.LINE)
-        for line in lines:
-            if 'p1' in line.attr and 'p2' in line.attr:
-                valid_inputs.append((line.id,))
-        return valid_inputs
+        return self.match_all(graph)
+
+    def accepts(self, graph: HyperGraph, line: HNode) -> bool:
+        return 'p1' in line.attr and 'p2' in line.attr
 
     def apply(self, graph: HyperGraph, line_id: int) -> dict:
         # Construct a square on a given line segment
@@ -54,7 +53,8 @@ class BookIIProp1Op(Op):
         square_id = graph.add_node(NodeType.POLYGON, {
             'sides': 4, 
             'type': 'square',
-            'constructed_by': self.name
+            'constructed_by': self.name,
+            'based_on': [line_id]
         })
 
         # Add construction edges
@@ -63,7 +63,8 @@ class BookIIProp1Op(Op):
         # Add proposition
         prop_id = graph.add_node(NodeType.PROPOSITION, {
             'text': f'Square constructed on line segment',
-            'status': 'derived'
+            'status': 'derived',
+            'support': [square_id]
         })
 
         return {'square': square_id, 'proposition': prop_id, 'new_points': [p3_id, p4_id]}
@@ -81,20 +82,16 @@ class BookIIProp1Op(Op):
 class BookIIProp2Op(Op):
     name = "BookII.Prop2"
     cost = 1.5
+    pattern = (NodeType.LINE, NodeType.LINE)
+    max_inputs = 20  # Limit combinations (drawn uniformly, see Op.sample_inputs)
+    symmetric = ((0, 1),)  # adjacent sides, in either order
 
     def precond(self, graph: HyperGraph) -> List[Tuple[int, int]]:
         """Return valid (line1_id, line2_id) tuples for constructing rectangles."""
-        valid_inputs = []
-        lines, _ = graph.by_type(NodeType.LINE)
-        line_list = list(lines)
-        
-        for i, line1 in enumerate(line_list):
-            for j, line2 in enumerate(line_list[i+1:], i+1):
-                if ('p1' in line1.attr and 'p2' in line1.attr and
-                    'p1' in line2.attr and 'p2' in line2.attr):
-                    valid_inputs.append((line1.id, line2.id))
-        
-        return valid_inputs[:20]  # Limit combinations
+        return self.match_all(graph)
+
+    def accepts(self, graph: HyperGraph, line: HNode) -> bool:
+        return 'p1' in line.attr and 'p2' in line.attr
 
     def apply(self, graph: HyperGraph, line1_id: int, line2_id: int) -> dict:
         # Construct rectangle using two line segments as adjacent sides
@@ -113,7 +110,8 @@ class BookIIProp2Op(Op):
         # Add proposition
         prop_id = graph.add_node(NodeType.PROPOSITION, {
             'text': f'Rectangle constructed from two line segments',
-            'status': 'derived'
+            'status': 'derived',
+            'support': [rect_id]
         })
 
         return {'rectangle': rect_id, 'proposition': prop_id}
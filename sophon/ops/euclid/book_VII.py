@@ -34,10 +34,7 @@ class BookVIIProp1Op(Op):
     def invariants(self, graph: HyperGraph, *args: Any, **kwargs: Any) -> bool:
         # Example: check that a VALUATION edge exists between the two concepts
         id1, id2 = args[0], args[1]
-        for edge in graph.edges.values():
-            if edge.type == EdgeType.VALUATION and set(edge.nodes) == {id1, id2}:
-                return True
-        return False
+        return graph.has_edge(EdgeType.VALUATION, (id1, id2))
 
 REGISTRY = Registry()
 REGISTRY.add(BookVIIProp1Op())
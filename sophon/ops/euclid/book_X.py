@@ -33,8 +33,8 @@ class BookXProp1Op(Op):
     def invariants(self, graph: HyperGraph, *args: Any, **kwargs: Any) -> bool:
         # Example: check that a VALUATION edge exists for the concept
         id1 = args[0]
-        for edge in graph.edges.values():
-            if edge.type == EdgeType.VALUATION and edge.nodes == (id1,) and edge.attr.get("relation") == "irrational":
+        for edge in graph.find_edges(EdgeType.VALUATION, (id1,)):
+            if edge.nodes == (id1,) and edge.attr.get("relation") == "irrational":
                 return True
         return False
 
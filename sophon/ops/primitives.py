@@ -2,11 +2,37 @@
 
 Provides geometric helper functions and primitives for SOPHON.
 Motif: Module (ops/primitives)
-Ports: [interface: geometric helpers]
+Ports: [interface: geometric helpers, array kernels]
 Invariants: [reusability, geometric correctness]
+
+The tuple helpers (midpoint, perpendicular_bisector, distance) serve single
+points. The array kernels below take points as NumPy arrays whose last axis
+is (x, y): one point of shape (2,) or N points of shape (N, 2), broadcasting
+against each other like any NumPy expression, so the same call serves one
+op application or a bulk pass over many inputs in C loops.
+
+Lines are given by two points on them, circles by centre and radius.
+Intersections with no solution come back as NaN coordinates; a tangent
+meeting returns the same point twice. Kernels need numpy (optional
+dependency); the tuple helpers do not.
+
+In-tree use is bulk only: Op.invariants_batch re-checks many applications
+at once, and BookIProp1Op's override runs on distances(). Per-op apply and
+invariants in the engine's step loop stay scalar, since a one-point kernel
+call costs more than the scalar arithmetic it replaces.
 """
 
-from typing import Tuple
+import math
+from typing import Any, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency; only the array kernels need it
+    np = None
+
+# Rotation by 60 degrees (equilateral constructions), computed once
+COS_60 = math.cos(math.pi / 3)
+SIN_60 = math.sin(math.pi / 3)
 
 def midpoint(p1: Tuple[float, float], p2: Tuple[float, float]) -> Tuple[float, float]:
     """Return the midpoint between two points."""
@@ -22,3 +48,106 @@ def perpendicular_bisector(p1: Tuple[float, float], p2: Tuple[float, float]) ->
 def distance(p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
     """Return the Euclidean distance between two points."""
     return ((p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2) ** 0.5
+
+def _points(a: Any) -> Any:
+    if np is None:
+        raise ImportError("array geometry kernels require numpy")
+    return np.asarray(a, dtype=np.float64)
+
+def _stack(x: Any, y: Any) -> Any:
+    return np.stack((x, y), axis=-1)
+
+def distances(a: Any, b: Any) -> Any:
+    """Distance between corresponding points of a and b (broadcast), shape (...,)."""
+    a, b = _points(a), _points(b)
+    return np.hypot(b[..., 0] - a[..., 0], b[..., 1] - a[..., 1])
+
+def pairwise_distances(a: Any, b: Any = None) -> Any:
+    """(N, M) matrix of distances from each point of a (N, 2) to each of b (M, 2; default a)."""
+    a = _points(a)
+    b = a if b is None else _points(b)
+    return np.hypot(a[:, None, 0] - b[None, :, 0], a[:, None, 1] - b[None, :, 1])
+
+def midpoints(a: Any, b: Any) -> Any:
+    """Midpoints of segments a-b, shape (..., 2)."""
+    a, b = _points(a), _points(b)
+    return (a + b) / 2
+
+def perpendicular_bisectors(a: Any, b: Any) -> Tuple[Any, Any]:
+    """(midpoints, directions) of the perpendicular bisectors of segments a-b, like perpendicular_bisector."""
+    a, b = _points(a), _points(b)
+    d = b - a
+    return (a + b) / 2, _stack(-d[..., 1], d[..., 0])
+
+def rotate(points: Any, origin: Any, angle: Optional[float] = None, cos: Optional[float] = None,
+           sin: Optional[float] = None) -> Any:
+    """
+    Rotate points counter-clockwise about origin by angle (radians), or by a
+    precomputed (cos, sin) pair such as (COS_60, SIN_60). Evaluated as
+    origin + (dx*cos - dy*sin, dx*sin + dy*cos), term for term like the ops do.
+    """
+    if angle is not None:
+        cos, sin = math.cos(angle), math.sin(angle)
+    elif cos is None or sin is None:
+        raise ValueError("rotate needs angle, or both cos and sin")
+    points, origin = _points(points), _points(origin)
+    dx = points[..., 0] - origin[..., 0]
+    dy = points[..., 1] - origin[..., 1]
+    return _stack(origin[..., 0] + dx * cos - dy * sin, origin[..., 1] + dx * sin + dy * cos)
+
+def equilateral_apexes(a: Any, b: Any) -> Any:
+    """Third vertex of the equilateral triangle on each segment a-b (b rotated 60 degrees about a)."""
+    return rotate(b, a, cos=COS_60, sin=SIN_60)
+
+def line_intersections(a1: Any, a2: Any, b1: Any, b2: Any) -> Any:
+    """Intersection of line a1-a2 with line b1-b2, shape (..., 2); NaN where they are parallel."""
+    a1, a2, b1, b2 = _points(a1), _points(a2), _points(b1), _points(b2)
+    da, db, w = a2 - a1, b2 - b1, b1 - a1
+    denom = da[..., 0] * db[..., 1] - da[..., 1] * db[..., 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(denom != 0.0, (w[..., 0] * db[..., 1] - w[..., 1] * db[..., 0]) / denom, np.nan)
+    return a1 + t[..., None] * da
+
+def line_circle_intersections(a1: Any, a2: Any, center: Any, radius: Any) -> Any:
+    """
+    Intersections of line a1-a2 with a circle, shape (..., 2, 2): the two
+    points in order along a1 -> a2; NaN where the line misses the circle.
+    """
+    a1, a2, center = _points(a1), _points(a2), _points(center)
+    radius = np.asarray(radius, dtype=np.float64)
+    d = a2 - a1
+    f = a1 - center
+    a = d[..., 0] ** 2 + d[..., 1] ** 2
+    b = 2.0 * (f[..., 0] * d[..., 0] + f[..., 1] * d[..., 1])
+    c = f[..., 0] ** 2 + f[..., 1] ** 2 - radius ** 2
+    disc = b * b - 4.0 * a * c
+    with np.errstate(divide="ignore", invalid="ignore"):
+        root = np.sqrt(np.where(disc >= 0.0, disc, np.nan))
+        t = np.stack(((-b - root) / (2.0 * a), (-b + root) / (2.0 * a)), axis=-1)
+    return a1[..., None, :] + t[..., None] * d[..., None, :]
+
+def circle_intersections(c1: Any, r1: Any, c2: Any, r2: Any) -> Any:
+    """
+    Intersections of two circles, shape (..., 2, 2): left then right of the
+    direction c1 -> c2; NaN where the circles do not meet (or are concentric).
+    """
+    c1, c2 = _points(c1), _points(c2)
+    r1, r2 = np.asarray(r1, dtype=np.float64), np.asarray(r2, dtype=np.float64)
+    d = c2 - c1
+    dist = np.hypot(d[..., 0], d[..., 1])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = (dist ** 2 + r1 ** 2 - r2 ** 2) / (2.0 * dist)
+        h2 = r1 ** 2 - a ** 2
+        h = np.sqrt(np.where((h2 >= 0.0) & (dist > 0.0), h2, np.nan))
+        ux, uy = d[..., 0] / dist, d[..., 1] / dist
+    mx, my = c1[..., 0] + a * ux, c1[..., 1] + a * uy
+    left = _stack(mx - h * uy, my + h * ux)
+    right = _stack(mx + h * uy, my - h * ux)
+    return np.stack((left, right), axis=-2)
+
+def polygon_areas(vertices: Any) -> Any:
+    """Signed area (counter-clockwise positive) of polygons given as (..., M, 2) vertex arrays (shoelace)."""
+    v = _points(vertices)
+    x, y = v[..., 0], v[..., 1]
+    xn, yn = np.roll(x, -1, axis=-1), np.roll(y, -1, axis=-1)
+    return 0.5 * np.sum(x * yn - xn * y, axis=-1)
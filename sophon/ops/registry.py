@@ -6,13 +6,64 @@ Ports: [interface: Op, Registry]
 Invariants: [composability, extensibility]
 """
 
-from typing import Any, Dict, List, Tuple, Optional
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple, Optional
 from sophon.core.hypergraph import HyperGraph
+from sophon.core.types import HNode, NodeType
+from sophon.ops.sampling import sample_combinations, sample_product
+
+def lazy_combinations(pool: Sequence[Any], r: int) -> Iterator[Tuple[Any, ...]]:
+    """Like itertools.combinations, but indexes `pool` in place instead of copying it first."""
+    n = len(pool)
+    if r > n:
+        return
+    idx = list(range(r))
+    yield tuple(pool[i] for i in idx)
+    while True:
+        for i in reversed(range(r)):
+            if idx[i] != i + n - r:
+                break
+        else:
+            return
+        idx[i] += 1
+        for j in range(i + 1, r):
+            idx[j] = idx[j - 1] + 1
+        yield tuple(pool[i] for i in idx)
+
+def lazy_product(*pools: Sequence[Any]) -> Iterator[Tuple[Any, ...]]:
+    """Like itertools.product, but indexes the pools in place instead of copying them first."""
+    sizes = [len(p) for p in pools]
+    if not pools or 0 in sizes:
+        return
+    idx = [0] * len(pools)
+    while True:
+        yield tuple(p[i] for p, i in zip(pools, idx))
+        for k in reversed(range(len(pools))):
+            idx[k] += 1
+            if idx[k] < sizes[k]:
+                break
+            idx[k] = 0
+        else:
+            return
 
 class Op:
     """Abstract base class for composable operations (Ops) in SOPHON."""
     name: str
     cost: float
+    # Typed node pattern, one NodeType per input position. Ops that declare it
+    # can be matched incrementally (see sophon.engine.matcher); None means the
+    # op is only enumerable through precond().
+    pattern: Optional[Tuple[NodeType, ...]] = None
+    # Cap on input tuples produced per enumeration (None = unlimited)
+    max_inputs: Optional[int] = None
+    # With a cap on a multi-position pattern, draw the capped tuples uniformly
+    # at random (sophon.ops.sampling) instead of taking the first ones
+    sample_inputs: bool = True
+    # Groups of interchangeable input positions, e.g. ((0, 1),) when apply(a, b)
+    # and apply(b, a) build the same thing. Enumeration yields one canonical
+    # tuple (see canonical()) per equivalence class, and the engine keys
+    # applications on it.
+    symmetric: Tuple[Tuple[int, ...], ...] = ()
 
     def precond(self, graph: HyperGraph) -> List[Tuple[Any, ...]]:
         """
@@ -21,14 +72,145 @@ class Op:
         """
         raise NotImplementedError
 
+    def iter_precond(self, graph: HyperGraph, rng: Optional[Any] = None) -> Iterator[Tuple[Any, ...]]:
+        """
+        Lazily yield valid input tuples. Consumers may stop early, so ops should
+        generate tuples on demand rather than build lists. rng drives sampled
+        enumeration (default: the random module).
+        Default: pattern ops join lazily, other ops wrap precond(); both
+        yield canonical tuples only.
+        """
+        if self.pattern is not None:
+            return self.iter_match(graph, rng)
+        if self.symmetric:
+            return unique_canonical(self, self.precond(graph))
+        return iter(self.precond(graph))
+
     def apply(self, graph: HyperGraph, *args: Any, **kwargs: Any) -> Any:
         """Apply the operation to the graph."""
         raise NotImplementedError
 
+    def accepts(self, graph: HyperGraph, node: HNode) -> bool:
+        """Per-node test for a node whose type appears in `pattern`. Default: accept."""
+        return True
+
+    def combine(self, graph: HyperGraph, memories: Dict[NodeType, Sequence[int]],
+                rng: Optional[Any] = None) -> Iterable[Tuple[int, ...]]:
+        """
+        Build input tuples from the accepted node ids of each pattern type.
+        Repeated types are combined without repetition or reordering (i < j), mixed
+        types as a cartesian product. With max_inputs set, a multi-position pattern
+        draws that many distinct tuples uniformly (sample_inputs) or takes the
+        first ones in id order; otherwise all tuples are yielded in id order.
+
+        Memories hold ids in ascending order, so repeated-type tuples are
+        already canonical for `symmetric`; mixed-type tuples are canonicalised
+        and equivalents dropped.
+        """
+        pattern = self.pattern or ()
+        if len(set(pattern)) == 1:
+            if self.max_inputs is not None and self.sample_inputs and len(pattern) > 1:
+                return iter(sample_combinations(memories[pattern[0]], len(pattern), self.max_inputs, rng))
+            tuples: Iterable[Tuple[int, ...]] = lazy_combinations(memories[pattern[0]], len(pattern))
+        elif self.max_inputs is not None and self.sample_inputs and len(pattern) > 1:
+            tuples = sample_product([memories[t] for t in pattern], self.max_inputs, rng)
+        else:
+            tuples = lazy_product(*(memories[t] for t in pattern))
+        if self.symmetric and len(set(pattern)) > 1:
+            tuples = unique_canonical(self, tuples)
+        return tuples if self.max_inputs is None else islice(tuples, self.max_inputs)
+
+    def iter_match(self, graph: HyperGraph, rng: Optional[Any] = None) -> Iterator[Tuple[int, ...]]:
+        """Full (non-incremental) lazy enumeration of `pattern` over the graph."""
+        memories = {t: [n.id for n in graph.by_type(t)[0] if self.accepts(graph, n)]
+                    for t in set(self.pattern or ())}
+        yield from self.combine(graph, memories, rng)
+
+    def match_all(self, graph: HyperGraph, rng: Optional[Any] = None) -> List[Tuple[int, ...]]:
+        """Full (non-incremental) enumeration of `pattern` over the graph, as a list."""
+        return list(self.iter_match(graph, rng))
+
     def invariants(self, graph: HyperGraph, *args: Any, **kwargs: Any) -> bool:
         """Check symbolic/numeric invariants after application."""
         raise NotImplementedError
 
+    def invariants_batch(self, graph: HyperGraph, outputs_list: Sequence[Any]) -> List[bool]:
+        """
+        invariants() for many applications at once (e.g. re-checking a loaded
+        graph). Ops with array kernels (sophon.ops.primitives) override this.
+        """
+        return [self.invariants(graph, outputs) for outputs in outputs_list]
+
+    def canonical(self, inputs: Tuple[Any, ...]) -> Tuple[Any, ...]:
+        """
+        Representative of inputs' equivalence class: the values in each
+        `symmetric` group sorted into ascending order. Ops with other
+        equivalences (e.g. cyclic orderings) override this.
+        """
+        if not self.symmetric:
+            return inputs
+        out = list(inputs)
+        for group in self.symmetric:
+            if len(group) == 2:  # the usual case: one commutative pair
+                i, j = group
+                if _precedes(out[j], out[i]):
+                    out[i], out[j] = out[j], out[i]
+                continue
+            values = [out[i] for i in group]
+            try:
+                values.sort()
+            except TypeError:  # mixed input kinds: any fixed order will do
+                values.sort(key=repr)
+            for i, value in zip(group, values):
+                out[i] = value
+        return tuple(out)
+
+def _precedes(a: Any, b: Any) -> bool:
+    try:
+        return a < b
+    except TypeError:
+        return repr(a) < repr(b)
+
+def unique_canonical(op: Op, tuples: Iterable[Tuple[Any, ...]]) -> Iterator[Tuple[Any, ...]]:
+    """Lazily yield op.canonical() of each tuple, skipping ones equivalent to a tuple already yielded."""
+    seen = set()
+    for inputs in tuples:
+        inputs = op.canonical(inputs)
+        if inputs not in seen:
+            seen.add(inputs)
+            yield inputs
+
+def interleave(
+    streams: Sequence[Tuple[Op, Iterator[Tuple[Any, ...]]]],
+    limit: int,
+    skip: Optional[Callable[[Op, Tuple[Any, ...]], bool]] = None,
+) -> List[Tuple[Op, Tuple[Any, ...]]]:
+    """
+    Round-robin over per-op input streams, taking one tuple from each in turn
+    until `limit` pairs are collected or every stream is exhausted. Streams are
+    only advanced as far as needed; one that raises is dropped. A tuple for
+    which skip(op, inputs) is true is passed over and the same stream advanced
+    again, so skipped tuples do not use up the limit.
+    """
+    result: List[Tuple[Op, Tuple[Any, ...]]] = []
+    active = list(streams)
+    while active and len(result) < limit:
+        still_active = []
+        for op, stream in active:
+            try:
+                inputs = next(stream)
+                if skip is not None:
+                    while skip(op, inputs):
+                        inputs = next(stream)
+            except Exception:  # StopIteration or a failing precond
+                continue
+            result.append((op, inputs))
+            still_active.append((op, stream))
+            if len(result) >= limit:
+                break
+        active = still_active
+    return result
+
 class Registry:
     """Registry for available Ops."""
     def __init__(self):
@@ -45,13 +227,15 @@ class Registry:
         """
         Enumerate all (op, valid_input_tuple) pairs for all registered ops.
         If name is provided, filter by op name.
-        If graph is provided, use op.precond(graph) to enumerate valid inputs.
+        If graph is provided, use op.precond(graph) to enumerate valid inputs,
+        one canonical tuple per equivalence class (see Op.symmetric).
         """
         result: List[Tuple[Op, Tuple[Any, ...]]] = []
         ops = self._ops.values() if name is None else [op for op in self._ops.values() if op.name == name]
         if graph is not None:
             for op in ops:
-                for input_tuple in op.precond(graph):
+                tuples = unique_canonical(op, op.precond(graph)) if op.symmetric else op.precond(graph)
+                for input_tuple in tuples:
                     result.append((op, input_tuple))
             return result
         else:
@@ -0,0 +1,72 @@
+"""sophon.ops.sampling
+
+Provides uniform sampling of input tuples for combinatorial preconditions in SOPHON.
+Motif: Module (ops/sampling)
+Ports: [interface: sample_combinations, sample_product]
+Invariants: [uniformity, distinctness, O(k) cost]
+
+Instead of enumerating every pair/triple and keeping the first k (quadratic
+work, biased towards the oldest nodes), draw k distinct ranks uniformly from
+[0, total) with random.sample — O(k) for a range population — and unrank each
+one directly into its tuple. Pools are indexed in place, never copied.
+"""
+
+import math
+import random
+from typing import Any, List, Optional, Sequence, Tuple
+
+def unrank_combination(rank: int, n: int, r: int) -> Tuple[int, ...]:
+    """Return the `rank`-th r-combination of range(n) in colex order, as ascending indices."""
+    out: List[int] = []
+    for i in range(r, 0, -1):
+        # Largest c with comb(c, i) <= rank; c lies in [i - 1, n - 1]
+        lo, hi = i - 1, n - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if math.comb(mid, i) <= rank:
+                lo = mid
+            else:
+                hi = mid - 1
+        out.append(lo)
+        rank -= math.comb(lo, i)
+        n = lo
+    out.reverse()
+    return tuple(out)
+
+def sample_combinations(pool: Sequence[Any], r: int, k: int, rng: Optional[Any] = None) -> List[Tuple[Any, ...]]:
+    """
+    Draw min(k, C(n, r)) distinct r-combinations of pool uniformly at random.
+    Each tuple keeps pool order (i < j < ...), like itertools.combinations.
+    """
+    rng = rng or random
+    n = len(pool)
+    total = math.comb(n, r) if r <= n else 0
+    if total == 0 or k <= 0:
+        return []
+    if r == 2:
+        picks = []
+        for rank in rng.sample(range(total), min(k, total)):
+            # Closed-form colex unranking for pairs
+            j = (1 + math.isqrt(1 + 8 * rank)) // 2
+            i = rank - j * (j - 1) // 2
+            picks.append((pool[i], pool[j]))
+        return picks
+    return [tuple(pool[i] for i in unrank_combination(rank, n, r))
+            for rank in rng.sample(range(total), min(k, total))]
+
+def sample_product(pools: Sequence[Sequence[Any]], k: int, rng: Optional[Any] = None) -> List[Tuple[Any, ...]]:
+    """Draw min(k, prod(len(p))) distinct tuples of the cartesian product of pools uniformly at random."""
+    rng = rng or random
+    sizes = [len(p) for p in pools]
+    total = math.prod(sizes) if pools else 0
+    if total == 0 or k <= 0:
+        return []
+    picks = []
+    for rank in rng.sample(range(total), min(k, total)):
+        idx = []
+        for size in reversed(sizes):
+            rank, i = divmod(rank, size)
+            idx.append(i)
+        idx.reverse()
+        picks.append(tuple(p[i] for p, i in zip(pools, idx)))
+    return picks
@@ -0,0 +1,28 @@
+"""sophon.tests.test_affect
+
+Unit tests for the Equation of Emotion valuator in SOPHON.
+Motif: Module (tests/test_affect)
+Ports: [interface: affect unit tests]
+Invariants: [test coverage, correctness]
+"""
+
+import pytest
+from sophon.affect.eoe import Valuator
+
+def test_batch_matches_scalar():
+    np = pytest.importorskip("numpy")
+    val = Valuator()
+    EP = np.array([0.0, 0.25, 0.5, 1.0])
+    U = np.array([0.1, 0.9, 0.5, 0.0])
+    ER, V, A = val.eoe_batch(EP, 1.0)
+    W = val.priority_batch(V, A, U, 0.5)
+    for i, ep in enumerate(EP.tolist()):
+        er, v, a = val.eoe(ep, 1.0)
+        assert ER[i] == pytest.approx(er) and V[i] == pytest.approx(v) and A[i] == pytest.approx(a)
+        assert W[i] == pytest.approx(val.priority(v, a, U[i], 0.5))
+    assert val.consolidate(10.0, 0.0, np.array([1.0, 2.0])) == pytest.approx(val.consolidate(10.0, 0.0, [1.0, 2.0]))
+
+def test_release_bounded_by_mass():
+    val = Valuator(c2=2.0)
+    E, m = val.release(1.0, 0.05, dm=0.1)
+    assert m == 0.0 and E == pytest.approx(1.1)
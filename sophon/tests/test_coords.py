@@ -0,0 +1,49 @@
+"""sophon.tests.test_coords
+
+Unit tests for the columnar POINT coordinate store in SOPHON.
+Motif: Module (tests/test_coords)
+Ports: [interface: coordinate store unit tests]
+Invariants: [test coverage, correctness]
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from sophon.core.coords import PointStore
+from sophon.core.hypergraph import HyperGraph
+from sophon.core.types import NodeType
+from sophon.ops.euclid.book_I import BookIProp1Op
+
+def test_point_attr_reads_through_store():
+    graph = HyperGraph(coords=PointStore(capacity=2))
+    pid = graph.add_node(NodeType.POINT, {"x": 1.5, "y": -2.0, "name": "A"})
+    attr = graph.nodes[pid].attr
+    assert attr["x"] == 1.5 and attr["y"] == -2.0 and attr["name"] == "A"
+    assert dict(attr) == {"x": 1.5, "y": -2.0, "name": "A"}
+    attr["x"] = 3.0
+    assert graph.coords.xy([pid]).tolist() == [[3.0, -2.0]]
+    bare = graph.add_node(NodeType.POINT, {"on": pid})
+    assert "x" not in graph.nodes[bare].attr
+    with pytest.raises(KeyError):
+        graph.nodes[bare].attr["y"]
+
+def test_store_grows_and_queries():
+    store = PointStore(capacity=1)
+    graph = HyperGraph(coords=store)
+    ids = [graph.add_node(NodeType.POINT, {"x": float(i), "y": 0.0}) for i in range(100)]
+    graph.add_node(NodeType.LINE, {"p1": ids[0], "p2": ids[1]})
+    assert len(store) == 100
+    assert store.ids().tolist() == ids
+    assert sorted(store.within(0.0, 0.0, 2.0).tolist()) == ids[:3]
+    assert np.allclose(store.distances(0.0, 0.0, ids[:3]), [0.0, 1.0, 2.0])
+
+def test_ops_run_on_columnar_points():
+    graph = HyperGraph(coords=PointStore())
+    p1 = graph.add_node(NodeType.POINT, {"x": 0.0, "y": 0.0})
+    p2 = graph.add_node(NodeType.POINT, {"x": 1.0, "y": 0.0})
+    line = graph.add_node(NodeType.LINE, {"p1": p1, "p2": p2})
+    op = BookIProp1Op()
+    assert op.precond(graph) == [(line,)]
+    outputs = op.apply(graph, line)
+    assert op.invariants(graph, outputs)
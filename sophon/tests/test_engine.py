@@ -0,0 +1,335 @@
+"""sophon.tests.test_engine
+
+Unit tests for the SOPHON engine loop.
+Motif: Module (tests/test_engine)
+Ports: [interface: engine unit tests]
+Invariants: [test coverage, correctness]
+"""
+
+import random
+import pytest
+from sophon.core.hypergraph import HyperGraph
+from sophon.core.types import NodeType
+from sophon.engine.matcher import CandidateIndex
+from sophon.engine.sophon import Engine
+from sophon.ops.registry import Registry, interleave
+from sophon.ops.euclid.book_I import REGISTRY as BOOK_I_REGISTRY
+from sophon.ops.euclid.book_II import REGISTRY as BOOK_II_REGISTRY
+
+def make_engine(seed: int = 0, hash_cons: bool = False, **kwargs) -> Engine:
+    registry = Registry()
+    for op in BOOK_I_REGISTRY.ops() + BOOK_II_REGISTRY.ops():
+        registry.add(op)
+    engine = Engine(HyperGraph(hash_cons=hash_cons), registry, E=15.0, epsilon=0.3, top_n_explore=15, seed=seed, **kwargs)
+    engine.seed_graph(num_points=5, num_lines=3)
+    return engine
+
+def test_step_novelty_accounting_matches_graph():
+    engine = make_engine()
+    props_before = len(engine.graph.by_type(NodeType.PROPOSITION)[0])
+    nodes_before, edges_before = len(engine.graph.nodes), len(engine.graph.edges)
+    novelty_nodes = novelty_edges = 0
+    for _ in range(20):
+        engine.step()
+        summary = engine.get_last_summary()
+        novelty_nodes += summary["novelty_nodes_step"]
+        novelty_edges += summary["novelty_edges_step"]
+    assert novelty_nodes == len(engine.graph.nodes) - nodes_before
+    assert novelty_edges == len(engine.graph.edges) - edges_before
+    props_after = len(engine.graph.by_type(NodeType.PROPOSITION)[0])
+    assert engine.unique_props_total == props_after - props_before
+
+def test_candidate_index_matches_precond():
+    engine = make_engine(seed=3)
+    index = CandidateIndex(engine.graph)
+    for op in engine.registry.ops():
+        index.register(op)
+    for _ in range(30):
+        engine.step()
+        for op in engine.registry.ops():
+            expected = list(op.iter_precond(engine.graph, random.Random(7)))
+            assert list(index.inputs(op, random.Random(7))) == expected
+
+def test_incremental_engine_matches_full_enumeration():
+    inc = make_engine(seed=5, incremental=True)
+    full = make_engine(seed=5, incremental=False)
+    for _ in range(25):
+        inc.step()
+    for _ in range(25):
+        full.step()
+    assert len(inc.graph.nodes) == len(full.graph.nodes)
+    assert inc.unique_props_total == full.unique_props_total
+    assert inc.E == full.E and inc.m == full.m
+
+def test_interleave_is_fair_and_lazy():
+    ops = [BOOK_I_REGISTRY.ops()[0], BOOK_I_REGISTRY.ops()[1], BOOK_II_REGISTRY.ops()[0]]
+    pulled = []
+
+    def stream(tag, n):
+        for i in range(n):
+            pulled.append(tag)
+            yield (tag, i)
+
+    def broken():
+        raise ValueError("bad precond")
+        yield ()
+
+    result = interleave([(ops[0], stream("a", 100)), (ops[1], stream("b", 1)),
+                         (ops[2], broken()), (ops[0], stream("c", 100))], limit=5)
+    assert [inputs for _, inputs in result] == [("a", 0), ("b", 0), ("c", 0), ("a", 1), ("c", 1)]
+    assert pulled.count("a") == 2 and pulled.count("c") == 2
+
+def test_step_gives_every_op_candidate_slots():
+    engine = make_engine(seed=1)
+    for _ in range(40):
+        engine.step()
+    ops = engine.registry.ops()
+    streams = [(op, op.iter_precond(engine.graph)) for op in ops]
+    names = {op.name for op, _ in interleave(streams, limit=2 * len(ops))}
+    assert names == {op.name for op in ops}
+
+def test_batch_scoring_ranks_like_scalar():
+    pytest.importorskip("numpy")
+    engine = make_engine(seed=2)
+    for _ in range(10):
+        engine.step()
+    ops = engine.registry.ops()
+    candidates = interleave([(op, op.iter_precond(engine.graph, random.Random(0))) for op in ops], limit=40)
+    engine.batch_scoring = True
+    engine.rng.seed(9)
+    batch = engine.rank_candidates(candidates)
+    engine.batch_scoring = False
+    engine.rng.seed(9)
+    scalar = engine.rank_candidates(candidates)
+    assert len(batch) == len(scalar) == len(candidates)
+    for b, s in zip(batch, scalar):
+        assert b[0] == pytest.approx(s[0])
+        assert b[1:4] == s[1:4]
+
+def run_trace(engine: Engine, steps: int) -> list:
+    trace = []
+    for _ in range(steps):
+        engine.step()
+        summary = engine.get_last_summary()
+        trace.append((summary["chosen_ops"], summary["rewards"], engine.E, engine.m))
+    return trace
+
+def test_engines_are_reproducible_when_interleaved_and_threaded():
+    from concurrent.futures import ThreadPoolExecutor
+    reference = run_trace(make_engine(seed=8), 20)
+    # Interleave two engines step by step, with global random state churning
+    a, b = make_engine(seed=8), make_engine(seed=9)
+    trace_a = []
+    for _ in range(20):
+        random.random()
+        trace_a += run_trace(a, 1)
+        run_trace(b, 1)
+    assert trace_a == reference
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        traces = list(pool.map(lambda s: run_trace(make_engine(seed=s), 20), [8, 9, 8, 9]))
+    assert traces[0] == traces[2] == reference
+    assert traces[1] == traces[3] != reference
+
+def test_derive_seed_is_stable_and_splits_blocks():
+    from sophon.engine.rng import derive_seed, spawn_seeds
+    assert derive_seed(1, 2) == derive_seed(1, 2)
+    assert len({derive_seed(1, i) for i in range(100)}) == 100
+    assert derive_seed(1, 2, 3) != derive_seed(1, 2)
+    assert spawn_seeds(7, 3) == [derive_seed(7, i) for i in range(3)]
+    assert all(0 <= s < 2 ** 64 for s in spawn_seeds(7, 3))
+    # Derived seeds span the full unsigned range and split again (child of a child)
+    children = spawn_seeds(7, 8)
+    assert any(s >= 2 ** 63 for s in children)
+    grandchildren = [spawn_seeds(child, 2) for child in children]
+    assert all(derive_seed(g[0], 0) != g[1] for g in grandchildren)
+    assert derive_seed(-1, 3) == derive_seed(2 ** 64 - 1, 3)
+
+def test_knapsack_selection_respects_budget():
+    engine = make_engine(seed=4, selection="knapsack", min_energy_floor=2.0)
+    engine.E = 0.0
+    for _ in range(20):
+        engine.step()
+        summary = engine.get_last_summary()
+        if not summary["fallback_used"]:
+            assert summary["budget_spent"] <= summary["available_budget"] + 1e-9
+        assert summary["chosen"] <= 4
+    with pytest.raises(ValueError):
+        make_engine(selection="best")
+
+def test_speculative_apply_commits_only_valid_applications():
+    engine = make_engine(seed=6, speculative=True)
+    nodes_before, edges_before = len(engine.graph.nodes), len(engine.graph.edges)
+    novelty_nodes = novelty_edges = 0
+    for _ in range(20):
+        engine.step()
+        summary = engine.get_last_summary()
+        novelty_nodes += summary["novelty_nodes_step"]
+        novelty_edges += summary["novelty_edges_step"]
+        assert len(summary["rewards"]) + summary["discarded"] == summary["chosen"]
+    assert novelty_nodes == len(engine.graph.nodes) - nodes_before > 0
+    assert novelty_edges == len(engine.graph.edges) - edges_before
+    assert list(engine.graph.nodes) == list(range(1, len(engine.graph.nodes) + 1))
+    strict = make_engine(seed=6, speculative=True, speculative_threshold=1e9)
+    for _ in range(5):
+        strict.step()
+    assert len(strict.graph.nodes) == nodes_before
+
+def graph_snapshot(engine: Engine) -> list:
+    nodes = [(n.id, n.type, dict(n.attr)) for n in engine.graph.nodes.values()]
+    edges = [(e.id, e.type, e.nodes, dict(e.attr)) for e in engine.graph.edges.values()]
+    return nodes + edges
+
+def test_resume_continues_exactly_like_the_uninterrupted_run(tmp_path):
+    engine = make_engine(seed=14)
+    run_trace(engine, 20)
+    engine.checkpoint(str(tmp_path / "ck"))
+    run_trace(engine, 5)
+    engine.checkpoint(str(tmp_path / "ck"))  # replaces the previous snapshot
+    assert sorted(p.name for p in (tmp_path / "ck").iterdir()) == ["graph-000000000025.snap", "state.json"]
+    expected = run_trace(engine, 20)
+    resumed = make_engine(seed=99)
+    resumed.resume(str(tmp_path / "ck"))
+    assert resumed.step_count == 25
+    assert run_trace(resumed, 20) == expected
+    assert graph_snapshot(resumed) == graph_snapshot(engine)
+    assert resumed.seen_applications.state() == engine.seen_applications.state() and resumed.op_counts == engine.op_counts
+
+@pytest.mark.parametrize("novelty", ["exact", "bloom"])
+def test_compact_novelty_trackers_match_the_set_tracker(novelty, tmp_path):
+    reference = make_engine(seed=21)
+    engine = make_engine(seed=21, novelty=novelty)
+    assert run_trace(engine, 30) == run_trace(reference, 30)
+    assert engine.unique_props_total == reference.unique_props_total
+    engine.checkpoint(str(tmp_path / "ck"))
+    resumed = make_engine(seed=0, novelty=novelty)
+    resumed.resume(str(tmp_path / "ck"))
+    assert run_trace(resumed, 10) == run_trace(engine, 10)
+
+def test_profile_reports_phases_and_ops_without_changing_the_run():
+    plain = make_engine(seed=8)
+    profiled = make_engine(seed=8, profile=True)
+    assert run_trace(profiled, 25) == run_trace(plain, 25)
+    assert "profile" not in plain.get_last_summary()
+    summary = profiled.get_last_summary()
+    report = summary["profile"]
+    assert set(report["phases"]) == {"index", "enumerate", "score", "select", "apply", "consolidate"}
+    assert report["total_s"] >= sum(report["phases"].values()) > 0.0
+    ops = report["ops"]
+    assert sum(s["candidates"] for s in ops.values()) == summary["candidates"]
+    assert sum(s["chosen"] for s in ops.values()) == summary["chosen"]
+    assert sum(s["kept"] + s["discarded"] + s["failed"] for s in ops.values()) == summary["chosen"]
+    assert profiled.profiler.steps == 25 and "enumerate" in profiled.profiler.report()
+
+def test_summary_levels_trim_detail_without_changing_the_run():
+    full = make_engine(seed=12)
+    basic = make_engine(seed=12, summary_level="basic")
+    silent = make_engine(seed=12, summary_level="none")
+    for _ in range(15):
+        full.step()
+        basic.step()
+        silent.step()
+        detail = full.get_last_summary()
+        assert {"chosen_ops", "topk", "top_inputs"} <= set(detail)
+        assert basic.get_last_summary() == {k: v for k, v in detail.items()
+                                            if k not in ("chosen_ops", "topk", "top_inputs")}
+    assert silent.get_last_summary() == {} and silent.step_count == 15
+    assert graph_snapshot(silent) == graph_snapshot(full)
+    with pytest.raises(ValueError):
+        make_engine(summary_level="verbose")
+
+@pytest.mark.parametrize("model", ["ucb", "thompson"])
+def test_learned_outcome_scoring_batch_matches_scalar(model):
+    pytest.importorskip("numpy")
+    batch = make_engine(seed=16, outcome_model=model)
+    scalar = make_engine(seed=16, outcome_model=model, batch_scoring=False)
+    assert run_trace(batch, 25) == run_trace(scalar, 25)
+    assert batch.outcomes.state() == scalar.outcomes.state()
+    assert batch.outcomes.total == sum(batch.outcomes.visits) == sum(batch.op_counts.values())
+
+def test_learned_outcomes_steer_away_from_failing_ops(tmp_path):
+    from sophon.ops.euclid.book_I import BookIProp3Op
+
+    class FailingCircle(BookIProp3Op):
+        name = "Test.FailingCircle"
+
+        def invariants(self, graph, outputs):
+            return False
+
+    def picks(model):
+        registry = Registry()
+        for op in BOOK_I_REGISTRY.ops() + BOOK_II_REGISTRY.ops() + [FailingCircle()]:
+            registry.add(op)
+        engine = Engine(HyperGraph(), registry, E=15.0, epsilon=0.3, top_n_explore=15, seed=3,
+                        outcome_model=model)
+        engine.seed_graph(num_points=5, num_lines=3)
+        trace = run_trace(engine, 120)
+        return sum(name == FailingCircle.name for chosen, *_ in trace for name, _ in chosen), engine
+
+    baseline, _ = picks(None)
+    learned, engine = picks("ucb")
+    assert learned < baseline
+    assert engine.predict(FailingCircle(), (1,)) < 0.1
+    engine.checkpoint(str(tmp_path / "ck"))
+    resumed = Engine(HyperGraph(), engine.registry, E=15.0, epsilon=0.3, top_n_explore=15, outcome_model="ucb")
+    resumed.resume(str(tmp_path / "ck"))
+    assert resumed.outcomes.state() == engine.outcomes.state()
+    assert run_trace(resumed, 10) == run_trace(engine, 10)
+
+def test_symmetric_inputs_share_one_canonical_form():
+    from sophon.ops.euclid.book_I import BookIProp1Op, BookIProp2Op
+
+    segment, triangle = BookIProp2Op(), BookIProp1Op()
+    assert segment.canonical((7, 3)) == segment.canonical((3, 7)) == (3, 7)
+    assert triangle.canonical((7,)) == (7,)
+
+    class BothOrders(BookIProp2Op):
+        pattern = None
+
+        def precond(self, graph):
+            return [(1, 2), (2, 1), (3, 1), (1, 3)]
+
+    registry = Registry()
+    registry.add(BothOrders())
+    assert [inputs for _, inputs in registry.candidates(graph=HyperGraph())] == [(1, 2), (1, 3)]
+    assert list(BothOrders().iter_precond(HyperGraph())) == [(1, 2), (1, 3)]
+
+    # Symmetric positions of different types: the cartesian product holds both orders
+    class Mixed(BookIProp2Op):
+        pattern = (NodeType.POINT, NodeType.LINE, NodeType.POINT)
+        symmetric = ((0, 2),)
+        max_inputs = None
+
+    memories = {NodeType.POINT: [1, 2, 3], NodeType.LINE: [9]}
+    assert list(Mixed().combine(HyperGraph(), memories)) == [(1, 9, 1), (1, 9, 2), (1, 9, 3),
+                                                             (2, 9, 2), (2, 9, 3), (3, 9, 3)]
+
+def test_prune_seen_only_offers_untried_applications():
+    engine = make_engine(seed=4, prune_seen=True)
+    chosen, pruned = [], 0
+    for _ in range(60):
+        engine.step()
+        summary = engine.get_last_summary()
+        chosen += summary["chosen_ops"]
+        pruned += summary["pruned"]
+    assert pruned > 0
+    assert len(chosen) == len(set(chosen))
+    baseline = make_engine(seed=4)
+    for _ in range(60):
+        baseline.step()
+        assert baseline.get_last_summary()["pruned"] == 0
+
+def test_hash_cons_grows_the_graph_with_distinct_structure_only(tmp_path):
+    plain = make_engine(seed=6)
+    interned = make_engine(seed=6, hash_cons=True)
+    run_trace(plain, 60)
+    run_trace(interned, 60)
+    assert len(interned.graph.nodes) < len(plain.graph.nodes)
+    assert interned.graph.count(NodeType.PROPOSITION)[0] == interned.unique_props_total
+    lines = [frozenset((n.attr["p1"], n.attr["p2"])) for n in interned.graph.by_type(NodeType.LINE)[0]]
+    assert len(lines) == len(set(lines))
+    interned.checkpoint(str(tmp_path / "ck"))
+    resumed = make_engine(seed=0, hash_cons=True)
+    resumed.resume(str(tmp_path / "ck"))
+    assert resumed.graph.hash_cons
+    assert run_trace(resumed, 15) == run_trace(interned, 15)
+    assert graph_snapshot(resumed) == graph_snapshot(interned)
@@ -0,0 +1,169 @@
+"""sophon.tests.test_hypergraph
+
+Unit tests for the core hypergraph in SOPHON.
+Motif: Module (tests/test_hypergraph)
+Ports: [interface: hypergraph unit tests]
+Invariants: [test coverage, correctness]
+"""
+
+from sophon.core.hypergraph import HyperGraph
+from sophon.core.types import NodeType, EdgeType
+
+def test_by_type_partitions():
+    graph = HyperGraph()
+    p1 = graph.add_node(NodeType.POINT, {"x": 0.0, "y": 0.0})
+    p2 = graph.add_node(NodeType.POINT, {"x": 1.0, "y": 0.0})
+    line = graph.add_node(NodeType.LINE, {"p1": p1, "p2": p2})
+    edge = graph.add_edge(EdgeType.CONSTRUCTION, (p1, p2, line))
+    points, edges = graph.by_type(NodeType.POINT)
+    assert [n.id for n in points] == [p1, p2]
+    assert [e.id for e in edges] == [edge]
+    _, incidence = graph.by_type(edge_type=EdgeType.INCIDENCE)
+    assert list(incidence) == []
+    assert graph.count(NodeType.LINE, EdgeType.CONSTRUCTION) == (1, 1)
+
+def test_by_type_views_are_live():
+    graph = HyperGraph()
+    lines, _ = graph.by_type(NodeType.LINE)
+    assert len(lines) == 0
+    graph.add_node(NodeType.LINE, {"p1": 1, "p2": 2})
+    assert len(lines) == 1
+    assert not hasattr(lines, "append")
+
+def test_incidence_index():
+    graph = HyperGraph()
+    a = graph.add_node(NodeType.CONCEPT, {"value": 4})
+    b = graph.add_node(NodeType.CONCEPT, {"value": 6})
+    c = graph.add_node(NodeType.CONCEPT, {"value": 9})
+    e1 = graph.add_edge(EdgeType.VALUATION, (a, b), {"relation": "gcd"})
+    e2 = graph.add_edge(EdgeType.SUPPORTS, (b, c))
+    assert graph.neighbors(b) == {a, c}
+    assert graph.neighbors(a) == {b}
+    assert [e.id for e in graph.incident_edges(b)] == [e1, e2]
+    assert graph.degree(b) == 2 and graph.degree(c) == 1 and graph.degree(999) == 0
+    assert graph.has_edge(EdgeType.VALUATION, (b, a))
+    assert not graph.has_edge(EdgeType.SUPPORTS, (a, b))
+    assert [e.id for e in graph.find_edges(EdgeType.SUPPORTS, (c, b))] == [e2]
+
+def test_compact_attrs_share_key_tables():
+    graph = HyperGraph(compact_attrs=True)
+    p1 = graph.add_node(NodeType.POINT, {"x": 0.0, "y": 0.0})
+    p2 = graph.add_node(NodeType.POINT, {"x": 1.0, "y": 0.0})
+    l1 = graph.add_node(NodeType.LINE, {"p1": p1, "p2": p2})
+    l2 = graph.add_node(NodeType.LINE, {"p1": p2, "p2": p1})
+    a1, a2 = graph.nodes[l1].attr, graph.nodes[l2].attr
+    assert a1._table is a2._table
+    assert a1["p1"] == p1 and a2.get("p1") == p2 and a1.get("missing") is None
+    assert a1 == {"p1": p1, "p2": p2}
+    a1["status"] = "derived"
+    del a1["p1"]
+    assert dict(a1) == {"p2": p2, "status": "derived"}
+    assert not hasattr(graph.nodes[l1], "__dict__")
+    e = graph.add_edge(EdgeType.CONSTRUCTION, (p1, p2, l1), {"desc": "segment"})
+    assert graph.edges[e].attr["desc"] == "segment"
+
+def test_version_and_change_journal():
+    graph = HyperGraph()
+    assert graph.version == 0
+    a = graph.add_node(NodeType.POINT, {"x": 0.0, "y": 0.0})
+    v = graph.version
+    b = graph.add_node(NodeType.POINT, {"x": 1.0, "y": 0.0})
+    e = graph.add_edge(EdgeType.INCIDENCE, (a, b))
+    c = graph.add_node(NodeType.LINE, {"p1": a, "p2": b})
+    assert graph.version == v + 3
+    assert graph.changes_since(v) == ([b, c], [e])
+    assert graph.changes_since(graph.version) == ([], [])
+    assert graph.changes_since(0) == ([a, b, c], [e])
+
+def test_fork_is_isolated_until_commit():
+    graph = HyperGraph()
+    p1 = graph.add_node(NodeType.POINT, {"x": 0.0, "y": 0.0})
+    p2 = graph.add_node(NodeType.POINT, {"x": 1.0, "y": 0.0})
+    fork = graph.fork()
+    line = fork.add_node(NodeType.LINE, {"p1": p1, "p2": p2})
+    fork.add_edge(EdgeType.CONSTRUCTION, (p1, p2, line))
+    assert fork.nodes[p1] is graph.nodes[p1]
+    assert fork.count(NodeType.LINE, EdgeType.CONSTRUCTION) == (1, 1)
+    assert fork.neighbors(p1) == {p2, line} and fork.has_edge(EdgeType.CONSTRUCTION, (line, p2, p1))
+    assert fork.changes_since(0) == ([p1, p2, line], [1])
+    assert line not in graph.nodes and graph.count(NodeType.LINE) == (0, 0)
+    assert graph.neighbors(p1) == set()
+    assert fork.commit() == {line: line}
+    assert graph.nodes[line].attr == {"p1": p1, "p2": p2}
+    assert graph.neighbors(p1) == {p2, line}
+    assert graph.changes_since(2) == ([line], [1])
+
+def test_discard_and_sibling_commit_remaps_ids():
+    graph = HyperGraph()
+    a = graph.add_node(NodeType.POINT, {"x": 0.0, "y": 0.0})
+    b = graph.add_node(NodeType.POINT, {"x": 1.0, "y": 0.0})
+    first, second, dropped = graph.fork(), graph.fork(), graph.fork()
+    dropped.add_node(NodeType.CONCEPT, {"value": 1})
+    dropped.discard()
+    l1 = first.add_node(NodeType.LINE, {"p1": a, "p2": b})
+    c = second.add_node(NodeType.POINT, {"x": 2.0, "y": 0.0})
+    l2 = second.add_node(NodeType.LINE, {"p1": b, "p2": c})
+    second.add_edge(EdgeType.CONSTRUCTION, (b, c, l2))
+    assert l1 == c  # same id allocated in both forks
+    first.commit()
+    # Parent additions made after the fork stay invisible to it
+    assert len(second.nodes) == 4 and second.count(NodeType.LINE) == (1, 1)
+    node_map = second.commit()
+    assert node_map == {c: 4, l2: 5}
+    assert graph.nodes[5].attr == {"p1": b, "p2": 4}
+    assert graph.find_edges(EdgeType.CONSTRUCTION, (b, 4, 5))[0].id == 1
+    assert len(graph.nodes) == 5
+
+def test_hash_cons_returns_existing_ids_for_identical_structure():
+    from sophon.ops.euclid.book_I import BookIProp2Op
+
+    graph = HyperGraph(hash_cons=True)
+    a = graph.add_node(NodeType.POINT, {"x": 0.0, "y": 0.0, "name": "A"})
+    b = graph.add_node(NodeType.POINT, {"x": 1.0, "y": 0.0})
+    assert graph.add_node(NodeType.POINT, {"x": 0.0, "y": 0.0, "name": "A2"}) == a
+    line = graph.add_node(NodeType.LINE, {"p1": a, "p2": b})
+    assert graph.add_node(NodeType.LINE, {"p1": b, "p2": a}) == line
+    edge = graph.add_edge(EdgeType.CONSTRUCTION, (a, b, line))
+    assert graph.add_edge(EdgeType.CONSTRUCTION, (b, a, line)) == edge
+    assert graph.add_edge(EdgeType.CONSTRUCTION, (a, b, line), {"step": 2}) != edge
+    prop = graph.add_node(NodeType.PROPOSITION, {"text": "t", "support": [line]})
+    assert graph.add_node(NodeType.PROPOSITION, {"text": "t", "status": "derived", "support": [line]}) == prop
+    assert graph.add_node(NodeType.PROPOSITION, {"text": "t", "support": [a]}) != prop
+    # Nodes without a structural key are never merged
+    assert graph.add_node(NodeType.PROPOSITION, {"text": "t"}) != graph.add_node(NodeType.PROPOSITION, {"text": "t"})
+    assert graph.add_node(NodeType.CONCEPT, {"v": 1}) != graph.add_node(NodeType.CONCEPT, {"v": 1})
+
+    # Re-applying an op adds nothing
+    op = BookIProp2Op()
+    first = op.apply(graph, a, b)
+    size, version = (len(graph.nodes), len(graph.edges)), graph.version
+    assert op.apply(graph, b, a) == first and first["line"] == line
+    assert (len(graph.nodes), len(graph.edges)) == size and graph.version == version
+
+    plain = HyperGraph()
+    p = plain.add_node(NodeType.POINT, {"x": 0.0, "y": 0.0})
+    assert plain.add_node(NodeType.POINT, {"x": 0.0, "y": 0.0}) != p
+
+def test_hash_cons_forks_intern_against_parent_and_siblings():
+    graph = HyperGraph(hash_cons=True)
+    a = graph.add_node(NodeType.POINT, {"x": 0.0, "y": 0.0})
+    b = graph.add_node(NodeType.POINT, {"x": 1.0, "y": 0.0})
+    first, second = graph.fork(), graph.fork()
+    assert first.add_node(NodeType.POINT, {"x": 1.0, "y": 0.0}) == b
+    l1 = first.add_node(NodeType.LINE, {"p1": a, "p2": b})
+    assert first.add_node(NodeType.LINE, {"p1": b, "p2": a}) == l1
+    l2 = second.add_node(NodeType.LINE, {"p1": b, "p2": a})
+    second.add_edge(EdgeType.CONSTRUCTION, (a, b, l2))
+    first.commit()
+    # The sibling's identical line folds into the committed one
+    assert second.commit() == {l2: l1}
+    assert graph.count(NodeType.LINE) == (1, 1)
+    assert graph.find_edges(EdgeType.CONSTRUCTION, (a, b, l1))[0].nodes == (a, b, l1)
+
+    # A plain parent builds its intern table on first use by a hash-consing fork
+    plain = HyperGraph()
+    p = plain.add_node(NodeType.POINT, {"x": 0.0, "y": 0.0})
+    fork = plain.fork(hash_cons=True)
+    assert fork.add_node(NodeType.POINT, {"x": 0.0, "y": 0.0}) == p
+    plain.add_node(NodeType.POINT, {"x": 5.0, "y": 0.0})
+    assert fork.add_node(NodeType.POINT, {"x": 5.0, "y": 0.0}) in fork.nodes.local  # added after the fork
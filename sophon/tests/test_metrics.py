@@ -0,0 +1,103 @@
+"""sophon.tests.test_metrics
+
+Unit tests for SOPHON metrics sinks and reporting.
+Motif: Module (tests/test_metrics)
+Ports: [interface: metrics unit tests]
+Invariants: [test coverage, correctness]
+"""
+
+import csv
+import json
+import socket
+import time
+from sophon.engine.metrics import ColumnarSink, MetricsReporter, SocketSink, open_sink
+from sophon.engine.sweep import RunConfig, build_engine
+
+def run_reported(sinks, steps: int = 12, every: int = 3, **config):
+    engine = build_engine(RunConfig(seed=4, **config))
+    reporter = MetricsReporter(sinks, every=every)
+    rows = []
+    for _ in range(steps):
+        engine.step()
+        row = reporter.report(engine)
+        if row is not None:
+            rows.append(row)
+    reporter.close()
+    return rows
+
+def test_file_sinks_write_every_nth_step(tmp_path):
+    sinks = [open_sink(str(tmp_path / "m.jsonl")), open_sink(str(tmp_path / "m.csv")),
+             open_sink(str(tmp_path / "m.columns.json"))]
+    rows = run_reported(sinks, summary_level="full")
+    assert [r["step"] for r in rows] == [3, 6, 9, 12] and "chosen_ops" in rows[0]
+    lines = [json.loads(line) for line in (tmp_path / "m.jsonl").read_text().splitlines()]
+    assert [line["step"] for line in lines] == [3, 6, 9, 12]
+    assert lines[-1]["nodes"] == rows[-1]["nodes"]
+    with open(tmp_path / "m.csv", newline="") as fh:
+        table = list(csv.DictReader(fh))
+    assert [int(r["step"]) for r in table] == [3, 6, 9, 12] and "chosen_ops" not in table[0]
+    columns = json.loads((tmp_path / "m.columns.json").read_text())
+    assert columns["step"] == [3, 6, 9, 12] and "topk" not in columns
+
+def test_sinks_buffer_until_batch_size(tmp_path):
+    sink = open_sink(str(tmp_path / "m.jsonl"), batch_size=4)
+    for i in range(3):
+        sink.emit({"step": i})
+    assert (tmp_path / "m.jsonl").read_text() == ""
+    sink.emit({"step": 3})
+    assert len((tmp_path / "m.jsonl").read_text().splitlines()) == 4
+    sink.close()
+
+def test_columnar_sink_aligns_late_columns(tmp_path):
+    sink = ColumnarSink(str(tmp_path / "c.json"))
+    sink.emit({"a": 1})
+    sink.emit({"a": 2, "b": 3.0})
+    sink.close()
+    assert json.loads((tmp_path / "c.json").read_text()) == {"a": [1, 2], "b": [None, 3.0]}
+
+def test_socket_sink_streams_json_lines():
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        port = server.getsockname()[1]
+        sink = SocketSink(f"tcp://127.0.0.1:{port}", batch_size=2)
+        rows = run_reported([sink], steps=6, every=1)
+        conn, _ = server.accept()
+        with conn:
+            data = b""
+            while data.count(b"\n") < len(rows):
+                data += conn.recv(65536)
+    assert [json.loads(line)["step"] for line in data.splitlines()] == [1, 2, 3, 4, 5, 6]
+    assert sink.dropped == 0
+
+def test_socket_sink_drops_rows_without_a_listener():
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        port = server.getsockname()[1]
+    sink = SocketSink(f"tcp://127.0.0.1:{port}", batch_size=1)
+    for i in range(5):
+        sink.emit({"step": i})
+    sink.close()
+    assert sink.dropped == 5
+
+def test_socket_sink_connect_never_stalls_emit():
+    # A listener whose accept queue is full leaves new connects hanging, like a blackholed host
+    with socket.socket() as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen(0)
+        port = server.getsockname()[1]
+        fillers = []
+        for _ in range(4):
+            filler = socket.socket()
+            filler.setblocking(False)
+            filler.connect_ex(("127.0.0.1", port))
+            fillers.append(filler)
+        sink = SocketSink(f"tcp://127.0.0.1:{port}", batch_size=1, connect_timeout_s=0.3)
+        worst = 0.0
+        for i in range(8):
+            t0 = time.perf_counter()
+            sink.emit({"step": i})
+            worst = max(worst, time.perf_counter() - t0)
+            time.sleep(0.05)
+        t0 = time.perf_counter()
+        sink.close()
+        assert worst < 0.1 and time.perf_counter() - t0 < 1.0
+        for filler in fillers:
+            filler.close()
@@ -0,0 +1,53 @@
+"""sophon.tests.test_novelty
+
+Unit tests for SOPHON novelty trackers.
+Motif: Module (tests/test_novelty)
+Ports: [interface: novelty tracker unit tests]
+Invariants: [test coverage, correctness]
+"""
+
+import pytest
+from sophon.engine.novelty import BloomTracker, HashTracker, make_tracker, tracker_from_state
+
+def keys(start: int, n: int):
+    return [("I.1", (i, i + 1)) for i in range(start, start + n)]
+
+@pytest.mark.parametrize("kind", ["set", "exact", "bloom"])
+def test_tracker_membership_and_state_round_trip(kind):
+    tracker = make_tracker(kind)
+    added = sum(tracker.add(key) for key in keys(0, 5000))
+    assert not tracker.add(("I.1", (0, 1)))
+    assert len(tracker) == added and added >= (5000 if kind != "bloom" else 4980)
+    assert all(key in tracker for key in keys(0, 5000))  # never a false negative
+    restored = tracker_from_state(tracker.state())
+    assert restored.state() == tracker.state()
+    assert all(key in restored for key in keys(0, 5000))
+    assert tracker.add(7) and 7 in tracker
+
+def test_hash_tracker_grows_without_false_positives():
+    tracker = HashTracker(capacity=16)
+    for key in keys(0, 20000):
+        tracker.add(key)
+    assert tracker.nbytes() < 20000 * 24
+    assert not any(key in tracker for key in keys(20000, 20000))
+
+def test_bloom_false_positive_rate_stays_within_target():
+    tracker = BloomTracker(error_rate=0.01, initial_capacity=1000, max_bytes=None)
+    for key in keys(0, 20000):
+        tracker.add(key)
+    assert len(tracker._stages) > 1
+    # measured over 50k fresh keys; the sampling error at p = 0.01 is ~0.0005
+    false_positives = sum(key in tracker for key in keys(20000, 50000)) / 50000
+    assert false_positives <= 0.0115 and tracker.estimated_error_rate() <= 0.01
+
+def test_bloom_respects_memory_budget():
+    tracker = BloomTracker(error_rate=0.01, initial_capacity=1000, max_bytes=8192)
+    for key in keys(0, 20000):
+        tracker.add(key)
+    assert tracker.nbytes() <= 8192
+    assert all(key in tracker for key in keys(0, 20000))
+    assert tracker.estimated_error_rate() > 0.01
+
+def test_unknown_tracker_kind():
+    with pytest.raises(ValueError):
+        make_tracker("cuckoo")
@@ -0,0 +1,52 @@
+"""sophon.tests.test_outcomes
+
+Unit tests for SOPHON learned outcome statistics.
+Motif: Module (tests/test_outcomes)
+Ports: [interface: outcome statistics unit tests]
+Invariants: [test coverage, correctness]
+"""
+
+import random
+import statistics
+import pytest
+from sophon.core.types import NodeType
+from sophon.engine.outcomes import OutcomeStats
+
+def filled_stats() -> OutcomeStats:
+    stats = OutcomeStats(c=0.5)
+    good = stats.slot(("I.1", (NodeType.LINE,)))
+    bad = stats.slot(("I.3", (NodeType.POINT,)))
+    stats.slot(("II.2", (NodeType.LINE, NodeType.LINE)))  # never applied
+    for reward in (1.0, 2.0, 4.0):
+        stats.update(good, True, reward)
+    for _ in range(5):
+        stats.update(bad, False, 3.0)
+    return stats
+
+def test_update_tracks_counts_and_reward_moments():
+    stats = filled_stats()
+    assert stats.slot(("I.1", (NodeType.LINE,))) == 0 and len(stats.keys) == 3
+    assert stats.visits[0] == 3 and stats.successes[0] == 3 and stats.total == 8
+    assert stats.mean[0] == pytest.approx(statistics.mean([1.0, 2.0, 4.0]))
+    assert stats.m2[0] / 2 == pytest.approx(statistics.variance([1.0, 2.0, 4.0]))
+    assert stats.success_rate(0) == pytest.approx(4 / 5) and stats.success_rate(2) == 0.5
+    assert stats.success_bound(0) > stats.success_rate(0)
+    # the failing slot earned more reward per application, but fails its invariants
+    assert stats.value(1) < stats.value(0) < stats.value(2) == 1.0
+
+def test_batch_estimates_match_scalar():
+    np = pytest.importorskip("numpy")
+    stats = filled_stats()
+    slots = np.array([0, 1, 2, 1, 0, 2])
+    assert list(stats.success_rate_batch(slots)) == [stats.success_rate(i) for i in slots]
+    assert list(stats.success_bound_batch(slots)) == [stats.success_bound(i) for i in slots]
+    assert list(stats.value_batch(slots)) == [stats.value(i) for i in slots]
+    batch = stats.value_batch(slots, random.Random(3))
+    rng = random.Random(3)
+    assert list(batch) == [stats.value(i, rng) for i in slots]
+
+def test_state_round_trip():
+    stats = filled_stats()
+    restored = OutcomeStats.from_state(stats.state(), lambda name: NodeType[name])
+    assert restored.state() == stats.state()
+    assert restored.slot(("I.3", (NodeType.POINT,))) == 1
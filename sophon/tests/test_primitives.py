@@ -0,0 +1,99 @@
+"""sophon.tests.test_primitives
+
+Unit tests for the SOPHON array geometry kernels.
+Motif: Module (tests/test_primitives)
+Ports: [interface: geometry kernel unit tests]
+Invariants: [test coverage, correctness]
+"""
+
+import math
+import random
+import pytest
+from sophon.core.hypergraph import HyperGraph
+from sophon.core.types import NodeType
+from sophon.ops import primitives as P
+
+np = pytest.importorskip("numpy")
+
+def random_points(n: int, seed: int):
+    rng = random.Random(seed)
+    return np.array([(rng.uniform(-5, 5), rng.uniform(-5, 5)) for _ in range(n)])
+
+def test_kernels_match_scalar_helpers_per_point_and_in_bulk():
+    a, b = random_points(50, 1), random_points(50, 2)
+    assert np.allclose(P.distances(a, b), [P.distance(p, q) for p, q in zip(a, b)])
+    assert P.distances(a[0], b[0]) == pytest.approx(P.distance(a[0], b[0]))
+    mids, dirs = P.perpendicular_bisectors(a, b)
+    for i in range(len(a)):
+        mid, perp = P.perpendicular_bisector(tuple(a[i]), tuple(b[i]))
+        assert tuple(mids[i]) == mid and tuple(dirs[i]) == perp
+    assert np.array_equal(P.midpoints(a, b), mids)
+    pd = P.pairwise_distances(a, b[:7])
+    assert pd.shape == (50, 7) and pd[3, 5] == pytest.approx(P.distance(a[3], b[5]))
+    assert np.allclose(np.diag(P.pairwise_distances(a)), 0.0)
+    # quarter turn about the origin, by angle or by (cos, sin)
+    assert np.allclose(P.rotate([1.0, 0.0], [0.0, 0.0], angle=math.pi / 2), [0.0, 1.0])
+    assert np.allclose(P.rotate(a, b, cos=0.0, sin=1.0), P.rotate(a, b, angle=math.pi / 2))
+    with pytest.raises(ValueError):
+        P.rotate(a, b)
+    with pytest.raises(ValueError):
+        P.rotate(a, b, cos=0.0)
+
+def test_equilateral_apexes_match_book_I_construction_exactly():
+    from sophon.ops.euclid.book_I import BookIProp1Op
+
+    a, b = random_points(20, 3), random_points(20, 4)
+    apexes = P.equilateral_apexes(a, b)
+    graph = HyperGraph()
+    op = BookIProp1Op()
+    for i in range(len(a)):
+        p1 = graph.add_node(NodeType.POINT, {'x': float(a[i, 0]), 'y': float(a[i, 1])})
+        p2 = graph.add_node(NodeType.POINT, {'x': float(b[i, 0]), 'y': float(b[i, 1])})
+        line = graph.add_node(NodeType.LINE, {'p1': p1, 'p2': p2})
+        apex = graph.nodes[op.apply(graph, line)['triangle_point']].attr
+        assert (apex['x'], apex['y']) == tuple(apexes[i])  # bit for bit
+    sides = P.distances(a, b)
+    assert np.allclose(P.distances(a, apexes), sides) and np.allclose(P.distances(b, apexes), sides)
+
+def test_intersections_and_areas():
+    # Lines: the diagonals of the unit square meet at its centre; parallels give NaN
+    hit = P.line_intersections([[0, 0], [0, 0]], [[1, 1], [1, 0]], [[0, 1], [0, 1]], [[1, 0], [1, 1]])
+    assert np.allclose(hit[0], [0.5, 0.5]) and np.isnan(hit[1]).all()
+
+    # Line through a unit circle: entry then exit along the line; a miss is NaN; tangent repeats
+    pts = P.line_circle_intersections([[-2, 0], [-2, 5], [-2, 1]], [[2, 0], [2, 5], [2, 1]], [0, 0], 1.0)
+    assert pts.shape == (3, 2, 2)
+    assert np.allclose(pts[0], [[-1, 0], [1, 0]]) and np.isnan(pts[1]).all()
+    assert np.allclose(pts[2], [[0, 1], [0, 1]])
+
+    # Circles of radius |AB| about A and B meet at the two equilateral apexes (Book I.1)
+    a, b = random_points(30, 5), random_points(30, 6)
+    r = P.distances(a, b)
+    both = P.circle_intersections(a, r, b, r)
+    assert np.allclose(both[:, 0], P.equilateral_apexes(a, b))
+    assert np.allclose(P.distances(both[:, 1], a), r) and np.allclose(P.distances(both[:, 1], b), r)
+    apart = P.circle_intersections([0, 0], 1.0, [[5, 0], [0, 0]], 1.0)
+    assert np.isnan(apart).all()  # disjoint, and concentric
+
+    square = [[0, 0], [2, 0], [2, 2], [0, 2]]
+    assert P.polygon_areas(square) == pytest.approx(4.0)
+    assert P.polygon_areas(square[::-1]) == pytest.approx(-4.0)
+    triangles = np.stack([a, b, P.equilateral_apexes(a, b)], axis=1)
+    assert np.allclose(P.polygon_areas(triangles), math.sqrt(3) / 4 * r ** 2)
+
+def test_book_I_batch_invariants_agree_with_per_op_checks():
+    from sophon.ops.euclid.book_I import BookIProp1Op
+
+    a, b = random_points(30, 7), random_points(30, 8)
+    graph = HyperGraph()
+    op = BookIProp1Op()
+    outputs = []
+    for i in range(len(a)):
+        p1 = graph.add_node(NodeType.POINT, {'x': float(a[i, 0]), 'y': float(a[i, 1])})
+        p2 = graph.add_node(NodeType.POINT, {'x': float(b[i, 0]), 'y': float(b[i, 1])})
+        outputs.append(op.apply(graph, graph.add_node(NodeType.LINE, {'p1': p1, 'p2': p2})))
+    graph.nodes[outputs[4]['triangle_point']].attr['x'] += 0.5  # break one triangle
+    outputs += [None, {'ab': 10 ** 9}]  # failed or dangling applications
+    expected = [op.invariants(graph, o) for o in outputs]
+    assert op.invariants_batch(graph, outputs) == expected
+    assert expected.count(False) == 3 and not expected[4]
@@ -0,0 +1,40 @@
+"""sophon.tests.test_profiler
+
+Unit tests for the SOPHON step profiler.
+Motif: Module (tests/test_profiler)
+Ports: [interface: profiler unit tests]
+Invariants: [test coverage, correctness]
+"""
+
+import itertools
+import pytest
+from sophon.engine.profiler import StepProfiler
+
+def test_laps_and_timed_streams_accumulate_per_step_and_in_total():
+    ticks = itertools.count(0, 10)
+    prof = StepProfiler(clock=lambda: next(ticks))
+    for _ in range(2):
+        prof.begin_step()                                      # t=0
+        items = list(prof.timed("I.1", iter([(1,), (2,)])))    # 3 next() calls, 10 each
+        prof.lap("enumerate")
+        prof.count("I.1", "kept")
+        prof.lap("apply")
+        report = prof.end_step()
+        assert items == [(1,), (2,)]
+        assert report["ops"]["I.1"]["precond_ns"] == 30 and report["ops"]["I.1"]["yielded"] == 2
+        assert report["phases"]["apply"] == pytest.approx(10e-9)
+    assert prof.steps == 2 and prof.ops["I.1"]["kept"] == 2 and prof.ops["I.1"]["precond_ns"] == 60
+    assert "I.1" in prof.report()
+
+def test_timed_stream_propagates_precond_errors():
+    prof = StepProfiler()
+    prof.begin_step()
+
+    def failing():
+        yield (1,)
+        raise RuntimeError("bad precond")
+
+    stream = prof.timed("I.2", failing())
+    assert next(stream) == (1,)
+    with pytest.raises(RuntimeError):
+        next(stream)
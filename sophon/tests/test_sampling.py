@@ -0,0 +1,52 @@
+"""sophon.tests.test_sampling
+
+Unit tests for sampled enumeration of input tuples in SOPHON.
+Motif: Module (tests/test_sampling)
+Ports: [interface: sampling unit tests]
+Invariants: [test coverage, correctness]
+"""
+
+import random
+from collections import Counter
+from itertools import combinations, product
+from sophon.core.hypergraph import HyperGraph
+from sophon.core.types import NodeType
+from sophon.ops.euclid.book_I import BookIProp2Op
+from sophon.ops.sampling import sample_combinations, sample_product, unrank_combination
+
+def test_unrank_covers_all_combinations():
+    for n, r in [(5, 1), (6, 2), (7, 3), (6, 4)]:
+        total = len(list(combinations(range(n), r)))
+        ranked = {unrank_combination(rank, n, r) for rank in range(total)}
+        assert ranked == set(combinations(range(n), r))
+
+def test_sample_combinations_distinct_and_valid():
+    rng = random.Random(0)
+    pool = list(range(100, 140))
+    for r in (2, 3):
+        picks = sample_combinations(pool, r, 50, rng)
+        assert len(picks) == len(set(picks)) == 50
+        assert all(list(t) == sorted(t) and set(t) <= set(pool) for t in picks)
+    assert sorted(sample_combinations([1, 2, 3], 2, 10, rng)) == [(1, 2), (1, 3), (2, 3)]
+    assert sample_combinations([1], 2, 5, rng) == []
+
+def test_sample_combinations_uniform():
+    rng = random.Random(1)
+    counts = Counter(sample_combinations("abcde", 2, 1, rng)[0] for _ in range(10000))
+    assert len(counts) == 10
+    assert min(counts.values()) > 800 and max(counts.values()) < 1200
+
+def test_sample_product():
+    rng = random.Random(2)
+    picks = sample_product([[1, 2, 3], ["a", "b"]], 4, rng)
+    assert len(set(picks)) == 4 and set(picks) <= set(product([1, 2, 3], ["a", "b"]))
+    assert sorted(sample_product([[1], ["a", "b"]], 9, rng)) == [(1, "a"), (1, "b")]
+
+def test_pairwise_op_samples_beyond_oldest_points():
+    graph = HyperGraph()
+    for i in range(200):
+        graph.add_node(NodeType.POINT, {"x": float(i), "y": 0.0})
+    op = BookIProp2Op()
+    inputs = op.precond(graph)
+    assert len(inputs) == len(set(inputs)) == op.max_inputs
+    assert max(max(t) for t in inputs) > 6  # first-15 pairs would only use ids 1..6
@@ -0,0 +1,62 @@
+"""sophon.tests.test_selection
+
+Unit tests for candidate ranking and budgeted selection in SOPHON.
+Motif: Module (tests/test_selection)
+Ports: [interface: selection unit tests]
+Invariants: [test coverage, correctness]
+"""
+
+import random
+from itertools import combinations
+import pytest
+from sophon.engine.selection import BestFirstOrder, RankedCandidates, greedy_fill, knapsack_fill
+
+def full_order(scores):
+    return sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+
+def test_best_first_matches_stable_sort_with_ties():
+    rng = random.Random(0)
+    scores = [rng.choice([0.1, 0.5, 0.5, 0.9, 0.3]) for _ in range(200)]
+    for prefix in (1, 5, 50, 500):
+        order = BestFirstOrder(scores, prefix)
+        assert [order[r] for r in range(len(scores))] == full_order(scores)
+    np = pytest.importorskip("numpy")
+    arr = np.array(scores)
+    for prefix in (1, 5, 50):
+        order = BestFirstOrder(arr, prefix)
+        assert order[:prefix] == full_order(scores)[:prefix]
+        assert [int(order[r]) for r in range(len(scores))] == full_order(scores)
+
+def ranked_of(items):
+    """items: (score, cost) pairs in candidate order."""
+    scores = [s for s, _ in items]
+    costs = [c for _, c in items]
+    candidates = [("op", (i,)) for i in range(len(items))]
+    return RankedCandidates(candidates, scores, costs, [0.5] * len(items), BestFirstOrder(scores, 4))
+
+def test_greedy_fill_skips_what_does_not_fit():
+    ranked = ranked_of([(0.9, 1.5), (0.8, 1.0), (0.7, 1.0), (0.1, 0.8)])
+    assert greedy_fill(ranked, available=2.4, spent=0.0, slots=4) == [0, 3]
+    assert greedy_fill(ranked, available=2.0, spent=0.0, slots=4, skip=(0,)) == [1, 2]
+    assert greedy_fill(ranked, available=10.0, spent=0.0, slots=2) == [0, 1]
+
+def test_knapsack_fill_is_optimal():
+    rng = random.Random(3)
+    for _ in range(30):
+        items = [(rng.uniform(-0.2, 1.0), rng.choice([0.8, 1.0, 1.1, 1.2, 1.5])) for _ in range(10)]
+        ranked = ranked_of(items)
+        budget, slots = rng.choice([1.0, 2.0, 3.3, 4.0]), rng.choice([1, 2, 3, 4])
+        picks = knapsack_fill(ranked, budget, 0.0, slots)
+        assert len(picks) <= slots
+        assert sum(ranked[r][1] for r in picks) <= budget + 1e-9
+        best = 0.0
+        for k in range(1, slots + 1):
+            for combo in combinations(range(len(items)), k):
+                if sum(ranked[r][1] for r in combo) <= budget + 1e-9:
+                    best = max(best, sum(ranked[r][0] for r in combo))
+        assert sum(ranked[r][0] for r in picks) == pytest.approx(best)
+
+def test_knapsack_beats_greedy_on_uneven_costs():
+    ranked = ranked_of([(1.0, 1.5), (0.9, 1.0), (0.9, 1.0)])
+    assert greedy_fill(ranked, 2.0, 0.0, 4) == [0]
+    assert knapsack_fill(ranked, 2.0, 0.0, 4) == [1, 2]
@@ -0,0 +1,85 @@
+"""sophon.tests.test_snapshot
+
+Unit tests for memory-mapped graph snapshots in SOPHON.
+Motif: Module (tests/test_snapshot)
+Ports: [interface: snapshot unit tests]
+Invariants: [test coverage, id preservation]
+"""
+
+import pytest
+from sophon.core.hypergraph import HyperGraph
+from sophon.core.snapshot import open_snapshot, write_snapshot
+from sophon.core.types import EdgeType, NodeType
+from sophon.engine.sweep import RunConfig, build_engine
+
+def dump(graph: HyperGraph) -> list:
+    nodes = [(n.id, n.type, dict(n.attr)) for n in graph.nodes.values()]
+    edges = [(e.id, e.type, e.nodes, dict(e.attr)) for e in graph.edges.values()]
+    return [nodes, edges, list(graph._journal)]
+
+def test_snapshot_serves_the_same_graph(tmp_path):
+    engine = build_engine(RunConfig(seed=2))
+    for _ in range(60):
+        engine.step()
+    graph = engine.graph
+    graph.add_node(NodeType.CONCEPT, {"value": None, "ok": True, "big": 1 << 70, "tags": ["a", 1]})
+    path = str(tmp_path / "graph.snap")
+    write_snapshot(graph, path)
+    with open_snapshot(path) as snap:
+        assert dump(snap) == dump(graph)
+        for nid in graph.nodes:
+            assert snap.neighbors(nid) == graph.neighbors(nid)
+            assert snap.degree(nid) == graph.degree(nid)
+        for edge in graph.edges.values():
+            assert snap.find_edges(edge.type, edge.nodes) == graph.find_edges(edge.type, edge.nodes)
+        assert [n.id for n in snap.by_type(NodeType.LINE)[0]] == [n.id for n in graph.by_type(NodeType.LINE)[0]]
+        assert snap.count(NodeType.POINT, EdgeType.CONSTRUCTION) == graph.count(NodeType.POINT, EdgeType.CONSTRUCTION)
+        assert 0 not in snap.nodes and snap.nodes.get(10 ** 9) is None
+        with pytest.raises(TypeError):
+            snap.add_node(NodeType.CONCEPT)
+
+def test_fork_of_snapshot_keeps_growing(tmp_path):
+    engine = build_engine(RunConfig(seed=4))
+    for _ in range(30):
+        engine.step()
+    path = str(tmp_path / "graph.snap")
+    write_snapshot(engine.graph, path)
+    snap = open_snapshot(path)
+    resumed = build_engine(RunConfig(seed=4))
+    resumed.graph = snap.fork()
+    for _ in range(10):
+        engine.step()
+        resumed.step()
+    assert len(resumed.graph.nodes) > len(snap.nodes)
+    write_snapshot(resumed.graph, str(tmp_path / "next.snap"))
+    with open_snapshot(str(tmp_path / "next.snap")) as again:
+        assert dump(again)[:2] == dump(resumed.graph)[:2]
+        assert again.changes_since(0) == resumed.graph.changes_since(0)
+        assert again.version == resumed.graph.version
+
+def test_hash_consing_fork_looks_keys_up_without_decoding_the_snapshot(tmp_path):
+    from sophon.core.hypergraph import intern_key
+    from sophon.core.snapshot import key_digest
+
+    engine = build_engine(RunConfig(seed=2, hash_cons=True))
+    for _ in range(40):
+        engine.step()
+    graph = engine.graph
+    path, plain = str(tmp_path / "graph.snap"), str(tmp_path / "plain.snap")
+    write_snapshot(graph, path)
+    write_snapshot(graph, plain, intern_table=False)
+    keyed = [n for n in graph.nodes.values() if intern_key(n.type, n.attr) is not None]
+    with open_snapshot(path) as snap:
+        fork = snap.fork(hash_cons=True)
+        for node in keyed[::7]:
+            assert fork.add_node(node.type, dict(node.attr)) == node.id
+        assert len(snap._node_cache) <= len(keyed[::7]) + 2  # only the matched rows were decoded
+        fresh = fork.add_node(NodeType.POINT, {"x": 123.25, "y": -7.5})
+        assert fresh == snap._next_node_id
+        assert fork.add_node(NodeType.POINT, {"x": 123.25, "y": -7.5}) == fresh
+    with open_snapshot(plain) as snap:  # no table: built by decoding on first use
+        assert snap.fork(hash_cons=True).add_node(keyed[3].type, dict(keyed[3].attr)) == keyed[3].id
+        assert len(snap._node_cache) == len(snap.nodes)
+    # Equal keys digest equally whatever the numeric types
+    assert key_digest((NodeType.CIRCLE, 3, 1.0)) == key_digest((NodeType.CIRCLE, 3.0, True))
+    assert key_digest((NodeType.PROPOSITION, "a", (1, 2))) != key_digest((NodeType.PROPOSITION, "a", (1, 3)))
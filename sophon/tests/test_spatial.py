@@ -0,0 +1,103 @@
+"""sophon.tests.test_spatial
+
+Unit tests for the SOPHON spatial hash and point merging.
+Motif: Module (tests/test_spatial)
+Ports: [interface: spatial index unit tests]
+Invariants: [test coverage, correctness]
+"""
+
+import math
+import random
+import pytest
+from sophon.core.hypergraph import HyperGraph
+from sophon.core.spatial import SpatialHash
+from sophon.core.types import NodeType
+
+def random_points(n: int, seed: int = 1):
+    rng = random.Random(seed)
+    points = [(i, rng.uniform(-5, 5), rng.uniform(-5, 5)) for i in range(1, n + 1)]
+    points += [(n + 1 + i, 1.0, 1.0) for i in range(40)]  # a coincident cluster
+    return points
+
+def test_queries_match_brute_force():
+    points = random_points(3000)
+    index = SpatialHash(cell=4.0)
+    for nid, x, y in points:
+        index.insert(nid, x, y)
+    assert len(index) == len(points) and index.cell < 4.0  # rehashed as it filled
+    rng = random.Random(2)
+    for _ in range(200):
+        x, y = rng.uniform(-7, 7), rng.uniform(-7, 7)
+        r = rng.choice([0.01, 0.3, 2.0, 20.0])
+        assert index.within(x, y, r) == sorted(i for i, a, b in points if math.hypot(a - x, b - y) <= r)
+        k = rng.choice([1, 3, 50])
+        expected = sorted((math.hypot(a - x, b - y), i) for i, a, b in points)[:k]
+        assert [nid for _, nid in index.nearest(x, y, k)] == [nid for _, nid in expected]
+    assert index.find(1.0, 1.0) == 3001  # lowest id of the cluster
+    assert index.find(1.0 + 1e-12, 1.0, tol=1e-9) == 3001
+    assert index.find(1.0 + 1e-6, 1.0, tol=1e-9) is None
+    assert SpatialHash().nearest(0.0, 0.0) == []
+    bulk = SpatialHash(cell=4.0)
+    bulk.extend([p[0] for p in points], [p[1] for p in points], [p[2] for p in points])
+    assert len(bulk) == len(points) and bulk.within(0.5, 0.5, 1.5) == index.within(0.5, 0.5, 1.5)
+    assert bulk.nearest(1.0, 1.0, 45) == index.nearest(1.0, 1.0, 45)
+    with pytest.raises(ValueError):
+        SpatialHash(cell=0.0)
+
+def test_graph_merges_points_within_tolerance():
+    from sophon.ops.euclid.book_I import BookIProp1Op
+
+    graph = HyperGraph(point_tolerance=1e-9)
+    a = graph.add_node(NodeType.POINT, {"x": 0.0, "y": 0.0})
+    b = graph.add_node(NodeType.POINT, {"x": 1.0, "y": 0.0})
+    assert graph.add_node(NodeType.POINT, {"x": 1.0 + 1e-12, "y": -1e-12, "name": "B'"}) == b
+    near_b = graph.add_node(NodeType.POINT, {"x": 1.0 + 1e-6, "y": 0.0})
+    assert near_b != b
+    line = graph.add_node(NodeType.LINE, {"p1": a, "p2": b})
+    # Re-applying a construction lands on the same apex point
+    before = graph.count(NodeType.POINT)[0]
+    op = BookIProp1Op()
+    op.apply(graph, line)
+    op.apply(graph, line)
+    assert graph.count(NodeType.POINT)[0] == before + 1
+    assert graph.points_within(0.0, 0.0, 0.5) == [a]
+    assert graph.points_within(1.0, 0.0, 0.5) == [b, near_b]
+    assert [nid for _, nid in graph.nearest_points(1.0, -0.1, k=2)] == [b, near_b]
+
+    # Queries work without a tolerance too; the index is built on first use
+    plain = HyperGraph()
+    ids = [plain.add_node(NodeType.POINT, {"x": float(i), "y": 0.0}) for i in range(10)]
+    assert plain.points is None and plain.points_within(4.0, 0.0, 1.0) == ids[3:6]
+    later = plain.add_node(NodeType.POINT, {"x": 4.2, "y": 0.0})
+    assert plain.nearest_points(4.3, 0.0)[0][1] == later
+
+def test_forks_merge_points_against_parent_and_own_additions():
+    graph = HyperGraph(point_tolerance=1e-6)
+    a = graph.add_node(NodeType.POINT, {"x": 0.0, "y": 0.0})
+    fork = graph.fork()
+    assert fork.add_node(NodeType.POINT, {"x": 1e-9, "y": 0.0}) == a
+    c = fork.add_node(NodeType.POINT, {"x": 2.0, "y": 0.0})
+    assert fork.add_node(NodeType.POINT, {"x": 2.0, "y": 1e-9}) == c
+    graph.add_node(NodeType.POINT, {"x": 3.0, "y": 0.0})  # after the fork: invisible to it
+    assert fork.points_within(2.5, 0.0, 1.0) == [c]
+    assert [nid for _, nid in fork.nearest_points(3.0, 0.0, k=2)] == [c, a]
+    node_map = fork.commit()
+    assert graph.count(NodeType.POINT)[0] == 3
+    assert graph.points_within(2.0, 0.0, 1e-3) == [node_map[c]]
+
+def test_snapshot_fork_merges_points_without_decoding_the_snapshot(tmp_path):
+    from sophon.core.snapshot import open_snapshot, write_snapshot
+
+    graph = HyperGraph()
+    ids = [graph.add_node(NodeType.POINT, {"x": x, "y": y}) for _, x, y in random_points(500)]
+    exact = graph.add_node(NodeType.POINT, {"x": 7, "y": 7})  # int coords: kept in the attrs, not the column
+    path = str(tmp_path / "graph.snap")
+    write_snapshot(graph, path)
+    with open_snapshot(path) as snap:
+        fork = snap.fork(point_tolerance=1e-9)
+        p = graph.nodes[ids[10]].attr
+        assert fork.add_node(NodeType.POINT, {"x": p["x"] + 1e-12, "y": p["y"]}) == ids[10]
+        assert fork.add_node(NodeType.POINT, {"x": 7.0, "y": 7.0}) == exact
+        assert len(snap._node_cache) <= 3  # the int-coord point and the merge candidates
+        assert snap.points_within(1.0, 1.0, 1e-6) == graph.points_within(1.0, 1.0, 1e-6)
+        assert snap.nearest_points(0.0, 0.0, 5) == graph.nearest_points(0.0, 0.0, 5)
@@ -0,0 +1,75 @@
+"""sophon.tests.test_storage
+
+Unit tests for the JSONL/SQLite graph stores in SOPHON.
+Motif: Module (tests/test_storage)
+Ports: [interface: storage unit tests]
+Invariants: [test coverage, id preservation]
+"""
+
+import pytest
+from sophon.core.hypergraph import HyperGraph
+from sophon.core.storage import JSONLStore, SQLiteStore, load_graph, open_store
+from sophon.core.types import EdgeType, NodeType
+from sophon.engine.sweep import RunConfig, build_engine
+
+def dump(graph: HyperGraph) -> list:
+    nodes = [(n.id, n.type, dict(n.attr)) for n in graph.nodes.values()]
+    edges = [(e.id, e.type, e.nodes, dict(e.attr)) for e in graph.edges.values()]
+    return [nodes, edges, list(graph._journal)]
+
+@pytest.mark.parametrize("name", ["graph.jsonl", "graph.db"])
+def test_store_syncs_per_step_and_round_trips(tmp_path, name):
+    path = str(tmp_path / name)
+    engine = build_engine(RunConfig(seed=3))
+    with open_store(path, batch_size=64) as store:
+        for _ in range(40):
+            engine.step()
+            store.sync(engine.graph)
+        assert store.sync(engine.graph) == 0
+    loaded = load_graph(path)
+    assert dump(loaded) == dump(engine.graph)
+    assert loaded.neighbors(1) == engine.graph.neighbors(1)
+    assert loaded.add_node(NodeType.CONCEPT) == engine.graph.add_node(NodeType.CONCEPT)
+
+@pytest.mark.parametrize("store_cls, name", [(JSONLStore, "g.jsonl"), (SQLiteStore, "g.db")])
+def test_store_appends_after_reload(tmp_path, store_cls, name):
+    path = str(tmp_path / name)
+    graph = HyperGraph()
+    a = graph.add_node(NodeType.CONCEPT, {"value": 4})
+    with store_cls(path) as store:
+        store.sync(graph)
+    reloaded = store_cls.load(path)
+    b = reloaded.add_node(NodeType.CONCEPT, {"value": 6})
+    reloaded.add_edge(EdgeType.VALUATION, (a, b), {"relation": "gcd"})
+    with store_cls(path, since=1) as store:
+        assert store.sync(reloaded) == 2
+    again = store_cls.load(path)
+    assert dump(again) == dump(reloaded)
+    assert again.find_edges(EdgeType.VALUATION, (b, a))[0].attr == {"relation": "gcd"}
+
+@pytest.mark.parametrize("name", ["graph.jsonl", "graph.db"])
+def test_cli_resume_with_save_matches_an_uninterrupted_run(tmp_path, monkeypatch, name):
+    import sys
+    from sophon.cli import run
+
+    def cli(*args):
+        monkeypatch.setattr(sys, "argv", ["sophon", "--seed", "5", "--quiet", *args])
+        run.main()
+
+    full, saved, ck = str(tmp_path / ("full-" + name)), str(tmp_path / name), str(tmp_path / "ck")
+    cli("--steps", "80", "--save", full)
+    # The interrupted run kept saving for 10 steps after its last checkpoint (step 50)
+    cli("--steps", "60", "--save", saved, "--checkpoint", ck, "--checkpoint-every", "25")
+    cli("--steps", "80", "--save", saved, "--resume", ck)
+    expected = dump(load_graph(full))
+    assert dump(load_graph(saved)) == expected
+    reloaded = load_graph(saved)
+    assert reloaded.version == len(reloaded.nodes) + len(reloaded.edges)
+    if name.endswith(".jsonl"):
+        # Records still buffered when the run died are written again from the checkpoint
+        with open(saved, encoding="utf-8") as fh:
+            lines = fh.readlines()
+        with open(saved, "w", encoding="utf-8") as fh:
+            fh.writelines(lines[:100] + [lines[100][:7]])  # ends in a torn line
+        cli("--steps", "80", "--save", saved, "--resume", ck)
+        assert dump(load_graph(saved)) == expected
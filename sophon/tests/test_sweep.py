@@ -0,0 +1,35 @@
+"""sophon.tests.test_sweep
+
+Unit tests for the multi-seed sweep runner in SOPHON.
+Motif: Module (tests/test_sweep)
+Ports: [interface: sweep unit tests]
+Invariants: [test coverage, reproducibility]
+"""
+
+import json
+from sophon.engine.sweep import RunConfig, run_one, sweep, write_columns
+
+def test_parallel_sweep_matches_serial_runs(tmp_path):
+    configs = [RunConfig(seed=s, steps=15, epsilon=eps) for s in (0, 1) for eps in (0.1, 0.3)]
+    streamed = []
+    parallel = sweep(configs, workers=2, chunk=4, on_rows=lambda i, rows: streamed.extend(rows))
+    serial = sweep(configs, workers=1)
+    assert parallel == serial
+    assert len(streamed) == len(parallel["run"]) == 4 * 15
+    assert parallel["step"][:15] == list(range(1, 16))
+    assert parallel["epsilon"][15] == 0.3
+    rows = run_one(configs[2])
+    assert [r["energy"] for r in rows] == parallel["energy"][30:45]
+    out = tmp_path / "results.json"
+    write_columns(parallel, str(out))
+    assert json.loads(out.read_text())["seed"] == parallel["seed"]
+
+def test_novelty_bytes_only_reaches_the_bloom_tracker():
+    from sophon.engine.sweep import build_engine
+
+    for kind in ("set", "exact"):
+        engine = build_engine(RunConfig(seed=0, novelty=kind, novelty_bytes=100000))
+        engine.step()
+        assert not hasattr(engine.seen_applications, "max_bytes")
+    engine = build_engine(RunConfig(seed=0, novelty="bloom", novelty_bytes=100000))
+    assert engine.seen_applications.max_bytes == 100000